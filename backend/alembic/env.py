@@ -13,6 +13,9 @@ from app.models.booking import Base
 from app.models.flight import Flight
 from app.models.booking_event import BookingEvent
 from app.models.booking import Booking
+from app.models.booking_tracking import BookingTracking
+from app.models.idempotency_key import IdempotencyKey
+from app.models.booking_archive import BookingArchive, BookingEventArchive
 
 config = context.config
 
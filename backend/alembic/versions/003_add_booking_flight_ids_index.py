@@ -0,0 +1,28 @@
+"""Add GIN index on bookings.flight_ids
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bulk flight transitions select bookings by flight_ids @> ARRAY[flight_id]
+    op.create_index(
+        'idx_bookings_flight_ids',
+        'bookings',
+        ['flight_ids'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_bookings_flight_ids', table_name='bookings')
@@ -0,0 +1,26 @@
+"""Add booking_ref_seq for ref_id allocation
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Each nextval reserves a block of 100 numbers; 60466175 = 36^5 - 1
+    op.execute(
+        "CREATE SEQUENCE booking_ref_seq "
+        "INCREMENT BY 100 MINVALUE 0 MAXVALUE 60466175 START WITH 0"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE booking_ref_seq")
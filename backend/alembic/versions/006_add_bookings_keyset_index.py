@@ -0,0 +1,28 @@
+"""Add (created_at, id) index for keyset pagination
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Scanned backwards for ORDER BY created_at DESC, id DESC with a
+    # (created_at, id) < (:created_at, :id) cursor predicate
+    op.create_index(
+        'idx_bookings_created_at_id',
+        'bookings',
+        ['created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_bookings_created_at_id', table_name='bookings')
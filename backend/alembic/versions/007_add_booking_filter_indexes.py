@@ -0,0 +1,53 @@
+"""Add composite and partial indexes for filtered booking listings
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Each filter's equality columns lead, followed by the (created_at, id)
+    # keyset order, so a filtered page is a single index range scan.
+    # origin-only filters use the leading column of the route index;
+    # flight_id uses the GIN index from 003, created_* ranges the index from 006.
+    op.create_index(
+        'idx_bookings_status_created_at',
+        'bookings',
+        ['status', 'created_at', 'id']
+    )
+    op.create_index(
+        'idx_bookings_route_created_at',
+        'bookings',
+        ['origin', 'destination', 'created_at', 'id']
+    )
+    op.create_index(
+        'idx_bookings_destination_created_at',
+        'bookings',
+        ['destination', 'created_at', 'id']
+    )
+    
+    # Terminal bookings (DELIVERED/CANCELLED) dominate the table; in-flight ones
+    # by origin are the hot dashboard query and fit in a much smaller index
+    op.create_index(
+        'idx_bookings_active_origin_created_at',
+        'bookings',
+        ['origin', 'created_at', 'id'],
+        postgresql_where=sa.text("status IN ('BOOKED', 'DEPARTED', 'ARRIVED')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_bookings_active_origin_created_at', table_name='bookings')
+    op.drop_index('idx_bookings_destination_created_at', table_name='bookings')
+    op.drop_index('idx_bookings_route_created_at', table_name='bookings')
+    op.drop_index('idx_bookings_status_created_at', table_name='bookings')
@@ -0,0 +1,63 @@
+"""Add booking_tracking read model
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Pre-rendered tracking documents, refreshed in the same transaction as each write
+    op.create_table(
+        'booking_tracking',
+        sa.Column('ref_id', sa.String(length=20), nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('document', postgresql.JSONB(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ref_id'),
+        sa.UniqueConstraint('booking_id')
+    )
+    
+    # Backfill existing bookings
+    op.execute("""
+        INSERT INTO booking_tracking (ref_id, booking_id, status, document)
+        SELECT
+            b.ref_id,
+            b.id,
+            b.status,
+            jsonb_build_object(
+                'booking', json_build_object(
+                    'id', b.id, 'ref_id', b.ref_id, 'origin', b.origin,
+                    'destination', b.destination, 'pieces', b.pieces,
+                    'weight_kg', b.weight_kg, 'status', b.status,
+                    'flight_ids', b.flight_ids, 'created_at', b.created_at,
+                    'updated_at', b.updated_at
+                ),
+                'timeline', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'id', e.id, 'event_type', e.event_type, 'location', e.location,
+                        'flight_id', e.flight_id, 'flight_number', e.flight_number,
+                        'notes', e.notes, 'created_at', e.created_at
+                    ) ORDER BY e.created_at, e.id)
+                    FROM booking_events e
+                    WHERE e.booking_id = b.id
+                ), '[]'::json)
+            )
+        FROM bookings b
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('booking_tracking')
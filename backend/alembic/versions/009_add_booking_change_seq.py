@@ -0,0 +1,35 @@
+"""Add bookings.change_seq for the change feed
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows all get this migration's transaction id, so a consumer
+    # starting from the beginning receives them as one initial batch
+    op.add_column(
+        'bookings',
+        sa.Column(
+            'change_seq',
+            sa.BigInteger(),
+            nullable=False,
+            server_default=sa.text('(pg_current_xact_id()::text::bigint)')
+        )
+    )
+    op.create_index('idx_bookings_change_seq_id', 'bookings', ['change_seq', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_bookings_change_seq_id', table_name='bookings')
+    op.drop_column('bookings', 'change_seq')
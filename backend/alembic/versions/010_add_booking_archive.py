@@ -0,0 +1,61 @@
+"""Add archive tables for closed bookings
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cold copies of bookings/booking_events; rows keep their original ids
+    op.create_table(
+        'bookings_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('ref_id', sa.String(length=20), nullable=False),
+        sa.Column('origin', sa.String(length=10), nullable=False),
+        sa.Column('destination', sa.String(length=10), nullable=False),
+        sa.Column('pieces', sa.Integer(), nullable=False),
+        sa.Column('weight_kg', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('flight_ids', postgresql.ARRAY(sa.Integer()), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('change_seq', sa.BigInteger(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ref_id')
+    )
+    
+    op.create_table(
+        'booking_events_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=20), nullable=False),
+        sa.Column('location', sa.String(length=10), nullable=True),
+        sa.Column('flight_id', sa.Integer(), nullable=True),
+        sa.Column('flight_number', sa.String(length=20), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'idx_booking_events_archive_booking_id',
+        'booking_events_archive',
+        ['booking_id', 'created_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_booking_events_archive_booking_id', table_name='booking_events_archive')
+    op.drop_table('booking_events_archive')
+    op.drop_table('bookings_archive')
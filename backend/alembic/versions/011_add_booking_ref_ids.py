@@ -0,0 +1,34 @@
+"""Register ref_ids across hot and archived bookings
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # bookings.ref_id is only unique within the hot table; this registry keeps
+    # archived ref_ids from being handed out again
+    op.create_table(
+        'booking_ref_ids',
+        sa.Column('ref_id', sa.String(length=20), nullable=False),
+        sa.PrimaryKeyConstraint('ref_id')
+    )
+    
+    op.execute(
+        "INSERT INTO booking_ref_ids (ref_id) "
+        "SELECT ref_id FROM bookings UNION SELECT ref_id FROM bookings_archive"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('booking_ref_ids')
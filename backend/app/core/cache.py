@@ -1,29 +1,37 @@
 import json
+import time
+import zlib
 import redis.asyncio as aioredis
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List, Union
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.redis_client import redis_factory, redis_breaker
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.metrics import cache_compression_ratio, cache_compression_duration_seconds
 
 logger = get_logger(__name__)
 
+# Header prepended to compressed payloads. JSON text can never start with a
+# NUL byte, so values written before compression was enabled stay readable.
+COMPRESSION_MAGIC = b"\x00ACZ1"
+
 
 class CacheService:
     """Redis cache service"""
     
-    def __init__(self):
+    def __init__(self, breaker: Optional[CircuitBreaker] = None):
         self.redis: Optional[aioredis.Redis] = None
+        self.breaker = breaker or redis_breaker
         self.default_ttl = settings.CACHE_TTL
+        self.compression_enabled = settings.CACHE_COMPRESSION_ENABLED
+        self.compression_min_bytes = settings.CACHE_COMPRESSION_MIN_BYTES
+        self.compression_level = settings.CACHE_COMPRESSION_LEVEL
+        self.ttl_tiers = settings.cache_ttl_tiers
     
     async def connect(self):
-        """Connect to Redis"""
+        """Connect to Redis using the shared connection pool"""
         try:
-            self.redis = await aioredis.from_url(
-                settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True,
-                max_connections=50
-            )
-            await self.redis.ping()
+            self.redis = await redis_factory.get_client()
             logger.info("Redis connection established")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
@@ -32,18 +40,72 @@ class CacheService:
     async def close(self):
         """Close Redis connection"""
         if self.redis:
-            await self.redis.close()
+            await redis_factory.release()
+            self.redis = None
             logger.info("Redis connection closed")
     
+    def ttl_for(self, family: str, days_ahead: int, default: Optional[int] = None) -> int:
+        """
+        Pick a TTL for a key family based on how far ahead the cached data is
+        Tiers are checked in order; the first with max_days >= days_ahead wins
+        """
+        for max_days, ttl in self.ttl_tiers.get(family, []):
+            if max_days is None or days_ahead <= max_days:
+                return ttl
+        return default or self.default_ttl
+    
+    def _encode(self, value: Any) -> bytes:
+        """Serialize value to JSON, compressing it when above the size threshold"""
+        payload = json.dumps(value, default=str).encode("utf-8")
+        
+        if not self.compression_enabled or len(payload) < self.compression_min_bytes:
+            return payload
+        
+        start_time = time.perf_counter()
+        compressed = zlib.compress(payload, self.compression_level)
+        cache_compression_duration_seconds.labels(operation='compress').observe(
+            time.perf_counter() - start_time
+        )
+        
+        # Not worth it for incompressible payloads
+        if len(compressed) + len(COMPRESSION_MAGIC) >= len(payload):
+            return payload
+        
+        cache_compression_ratio.observe(len(payload) / len(compressed))
+        return COMPRESSION_MAGIC + compressed
+    
+    def _decode(self, raw: Union[bytes, str]) -> Any:
+        """Deserialize a cached value, transparently decompressing it"""
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        
+        if raw.startswith(COMPRESSION_MAGIC):
+            start_time = time.perf_counter()
+            raw = zlib.decompress(raw[len(COMPRESSION_MAGIC):])
+            cache_compression_duration_seconds.labels(operation='decompress').observe(
+                time.perf_counter() - start_time
+            )
+        
+        return json.loads(raw)
+    
+    async def call(self, command: str, *args, **kwargs) -> Any:
+        """
+        Run a raw Redis command through the circuit breaker
+        Raises CircuitOpenError without touching the network while Redis is down
+        """
+        return await self.breaker.call(getattr(self.redis, command), *args, **kwargs)
+    
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         try:
-            value = await self.redis.get(key)
+            value = await self.call("get", key)
             if value:
                 logger.debug(f"Cache hit: {key}")
-                return json.loads(value)
+                return self._decode(value)
             logger.debug(f"Cache miss: {key}")
             return None
+        except CircuitOpenError:
+            return None
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
             return None
@@ -52,10 +114,12 @@ class CacheService:
         """Set value in cache"""
         try:
             ttl = ttl or self.default_ttl
-            serialized = json.dumps(value, default=str)
-            await self.redis.setex(key, ttl, serialized)
+            serialized = self._encode(value)
+            await self.call("setex", key, ttl, serialized)
             logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
             return True
+        except CircuitOpenError:
+            return False
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
@@ -63,37 +127,117 @@ class CacheService:
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         try:
-            await self.redis.delete(key)
+            await self.call("delete", key)
             logger.debug(f"Cache delete: {key}")
             return True
+        except CircuitOpenError:
+            return False
         except Exception as e:
             logger.error(f"Cache delete error for key {key}: {e}")
             return False
     
+    async def delete_many(self, keys: List[str]) -> bool:
+        """Delete several keys with a single DEL"""
+        if not keys:
+            return True
+        
+        try:
+            await self.call("delete", *keys)
+            logger.debug(f"Cache delete many: {len(keys)} keys")
+            return True
+        except CircuitOpenError:
+            return False
+        except Exception as e:
+            logger.error(f"Cache delete many error for {len(keys)} keys: {e}")
+            return False
+    
     async def delete_pattern(self, pattern: str) -> int:
         """Delete all keys matching pattern"""
+        if not self.breaker.allow_request():
+            return 0
+        
         try:
             keys = []
             async for key in self.redis.scan_iter(match=pattern):
                 keys.append(key)
             
-            if keys:
-                deleted = await self.redis.delete(*keys)
+            deleted = await self.redis.delete(*keys) if keys else 0
+            self.breaker.record_success()
+            
+            if deleted:
                 logger.debug(f"Cache delete pattern {pattern}: {deleted} keys")
-                return deleted
-            return 0
+            return deleted
         except Exception as e:
+            self.breaker.record_failure()
             logger.error(f"Cache delete pattern error for {pattern}: {e}")
             return 0
     
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values with one MGET; misses (and errors) come back as None"""
+        if not keys:
+            return []
+        
+        try:
+            values = await self.call("mget", keys)
+            logger.debug(f"Cache get many: {sum(v is not None for v in values)}/{len(keys)} hits")
+            return [self._decode(value) if value else None for value in values]
+        except CircuitOpenError:
+            return [None] * len(keys)
+        except Exception as e:
+            logger.error(f"Cache get many error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values in one pipelined round trip"""
+        if not items:
+            return True
+        
+        try:
+            ttl = ttl or self.default_ttl
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, self._encode(value))
+            await self.breaker.call(pipe.execute)
+            logger.debug(f"Cache set many: {len(items)} keys (TTL: {ttl}s)")
+            return True
+        except CircuitOpenError:
+            return False
+        except Exception as e:
+            logger.error(f"Cache set many error for {len(items)} keys: {e}")
+            return False
+    
+    async def increment_score(self, key: str, member: str, amount: float = 1) -> bool:
+        """Increment a member's score in a sorted set"""
+        try:
+            await self.call("zincrby", key, amount, member)
+            return True
+        except CircuitOpenError:
+            return False
+        except Exception as e:
+            logger.error(f"Cache increment score error for {key}: {e}")
+            return False
+    
+    async def top_scored(self, key: str, limit: int) -> List[str]:
+        """Get the highest scoring members of a sorted set"""
+        try:
+            members = await self.call("zrevrange", key, 0, limit - 1)
+            return [m.decode("utf-8") if isinstance(m, bytes) else m for m in members]
+        except CircuitOpenError:
+            return []
+        except Exception as e:
+            logger.error(f"Cache top scored error for {key}: {e}")
+            return []
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists"""
         try:
-            return await self.redis.exists(key) > 0
+            return await self.call("exists", key) > 0
+        except CircuitOpenError:
+            return False
         except Exception as e:
             logger.error(f"Cache exists error for key {key}: {e}")
             return False
 
 
 # Global cache instance
-cache = CacheService()
\ No newline at end of file
+cache = CacheService()
@@ -0,0 +1,98 @@
+import time
+from typing import Optional
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import circuit_breaker_state, circuit_breaker_short_circuits_total
+
+logger = get_logger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited by an open circuit breaker"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+    - CLOSED: calls pass through; trips to OPEN after failure_threshold consecutive failures
+    - OPEN: calls are rejected immediately until recovery_timeout has elapsed
+    - HALF_OPEN: a single probe call is let through; success closes, failure re-opens
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.REDIS_CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or settings.REDIS_CIRCUIT_RECOVERY_TIMEOUT
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self._set_state(self.CLOSED)
+    
+    def _set_state(self, state: str):
+        self.state = state
+        circuit_breaker_state.labels(name=self.name).set(self._STATE_VALUES[state])
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may proceed"""
+        if self.state == self.CLOSED:
+            return True
+        
+        now = time.monotonic()
+        
+        if self.state == self.OPEN and now - self.opened_at >= self.recovery_timeout:
+            self._set_state(self.HALF_OPEN)
+            self.probe_started_at = now
+            logger.info(f"Circuit {self.name} half-open, probing for recovery")
+            return True
+        
+        # Let another probe through if the previous one never reported back
+        if self.state == self.HALF_OPEN and now - self.probe_started_at >= self.recovery_timeout:
+            self.probe_started_at = now
+            return True
+        
+        circuit_breaker_short_circuits_total.labels(name=self.name).inc()
+        return False
+    
+    def record_success(self):
+        """Record a successful call"""
+        self.failures = 0
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+            logger.info(f"Circuit {self.name} closed, backend recovered")
+    
+    def record_failure(self):
+        """Record a failed call, tripping the breaker when the threshold is reached"""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+            logger.warning(
+                f"Circuit {self.name} opened after {self.failures} consecutive failures"
+            )
+    
+    async def call(self, func, *args, **kwargs):
+        """Run an awaitable call through the breaker"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        
+        self.record_success()
+        return result
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional, Tuple
 import json
 
 
@@ -16,6 +16,13 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://redis:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 100
+    REDIS_POOL_TIMEOUT: float = 1.0
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 1.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    REDIS_CIRCUIT_RECOVERY_TIMEOUT: float = 5.0
     
     # API
     API_V1_PREFIX: str = "/api/v1"
@@ -29,9 +36,50 @@ class Settings(BaseSettings):
     # Cache Configuration
     CACHE_TTL: int = 300
     ROUTE_CACHE_TTL: int = 3600
+    CACHE_COMPRESSION_ENABLED: bool = True
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024
+    CACHE_COMPRESSION_LEVEL: int = 3
+    # Per key family: [[max_days_ahead, ttl_seconds], ...], null = no upper bound
+    CACHE_TTL_TIERS: str = '{"route": [[1, 300], [7, 3600], [30, 21600], [null, 259200]]}'
+    
+    # Cache Warm-up
+    CACHE_WARMUP_ENABLED: bool = True
+    CACHE_WARMUP_BOOKING_LIMIT: int = 5000
+    CACHE_WARMUP_BATCH_SIZE: int = 200
+    CACHE_WARMUP_BATCH_DELAY: float = 0.05
+    CACHE_WARMUP_TOP_LANES: int = 20
+    CACHE_WARMUP_DAYS: int = 3
+    
+    # Archival of closed bookings
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_BATCH_DELAY: float = 0.1
+    
+    # Bulk Operations
+    BULK_BOOKING_MAX_ROWS: int = 1000
+    BOOKING_LOOKUP_MAX_IDS: int = 100
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Idempotency Keys
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL: int = 86400
+    IDEMPOTENCY_LOCK_TIMEOUT: int = 30
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 10.0
+    IDEMPOTENCY_POLL_INTERVAL: float = 0.05
+    
+    # Server-Sent Events
+    SSE_HEARTBEAT_INTERVAL: float = 15.0
+    SSE_QUEUE_SIZE: int = 100
+    
+    # Group commit for booking transitions (off: each request commits its own)
+    EVENT_GROUP_COMMIT_ENABLED: bool = False
+    EVENT_GROUP_COMMIT_MAX_BATCH: int = 100
+    EVENT_GROUP_COMMIT_MAX_DELAY: float = 0.005
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production-min-32-chars-long"
+    # Keys the ref_id permutation (falls back to SECRET_KEY); keep it stable once set
+    REF_ID_SECRET: str = ""
     
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
@@ -44,6 +92,16 @@ class Settings(BaseSettings):
         except (json.JSONDecodeError, TypeError, ValueError):
             return ["http://localhost:3000"]
     
+    @property
+    def cache_ttl_tiers(self) -> Dict[str, List[Tuple[Optional[int], int]]]:
+        try:
+            return {
+                family: [(max_days, int(ttl)) for max_days, ttl in tiers]
+                for family, tiers in json.loads(self.CACHE_TTL_TIERS).items()
+            }
+        except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+            return {}
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
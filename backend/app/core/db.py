@@ -47,7 +47,7 @@ async def init_db():
     """Initialize database"""
     async with engine.begin() as conn:
         # Import all models to register them
-        from app.models import booking, flight, booking_event
+        from app.models import booking, flight, booking_event, booking_tracking, idempotency_key, booking_archive
         # Create all tables (in production, use Alembic migrations)
         # await conn.run_sync(Base.metadata.create_all)
         logger.info("Database initialized")
@@ -0,0 +1,183 @@
+import json
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from sqlalchemy import select, delete, update, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import CacheService, cache
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.models.idempotency_key import IdempotencyKey
+
+logger = get_logger(__name__)
+
+
+class IdempotencyUnavailable(Exception):
+    """The idempotency_keys table could not be used to track a key"""
+    pass
+
+
+@dataclass
+class IdempotencyRecord:
+    """State of an Idempotency-Key: in flight until status_code is set"""
+    fingerprint: str
+    status_code: Optional[int] = None
+    content_type: Optional[str] = None
+    body: Optional[str] = None
+    
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+
+
+class IdempotencyStore:
+    """
+    Tracks Idempotency-Key claims and stored responses
+    - The idempotency_keys table is the single authority for claims, so a key
+      is never owned by two stores at once
+    - Completed responses are immutable and cached in Redis for fast replays;
+      a Redis miss or outage falls through to the table
+    - In-flight claims expire after the lock timeout so a crashed request
+      does not block its key forever
+    """
+    
+    def __init__(
+        self,
+        cache_service: Optional[CacheService] = None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal
+    ):
+        self.cache = cache_service or cache
+        self.session_factory = session_factory
+        self.ttl = settings.IDEMPOTENCY_TTL
+        self.lock_timeout = settings.IDEMPOTENCY_LOCK_TIMEOUT
+    
+    @staticmethod
+    def redis_key(key: str) -> str:
+        return f"idempotency:{key}"
+    
+    async def claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        """
+        Claim a key for execution
+        Returns None when the caller now owns the key, otherwise the existing record
+        """
+        cached = await self._cached(key)
+        if cached is not None:
+            return cached
+        return await self._db_claim(key, fingerprint)
+    
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """Get the current record for a key"""
+        cached = await self._cached(key)
+        if cached is not None:
+            return cached
+        return await self._db_get(key)
+    
+    async def complete(self, key: str, record: IdempotencyRecord) -> None:
+        """Store the response for a claimed key"""
+        await self._db_complete(key, record)
+        try:
+            await self.cache.call(
+                "set", self.redis_key(key), json.dumps(asdict(record)), ex=self.ttl
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache idempotent response: {e}")
+    
+    async def release(self, key: str) -> None:
+        """Drop a claim without storing a response, so the request can be retried"""
+        await self._db_release(key)
+    
+    async def _cached(self, key: str) -> Optional[IdempotencyRecord]:
+        """Completed record from Redis, or None on a miss or outage"""
+        try:
+            raw = await self.cache.call("get", self.redis_key(key))
+        except Exception as e:
+            logger.warning(f"Idempotency lookup via Redis failed, using database: {e}")
+            return None
+        if raw is None:
+            return None
+        return IdempotencyRecord(**json.loads(raw))
+    
+    async def _db_claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        now = datetime.now(timezone.utc)
+        values = {
+            "key": key,
+            "fingerprint": fingerprint,
+            "status_code": None,
+            "content_type": None,
+            "response_body": None,
+            "locked_until": now + timedelta(seconds=self.lock_timeout),
+            "expires_at": now + timedelta(seconds=self.ttl),
+        }
+        
+        # Take over expired records and abandoned in-flight claims in the same statement
+        stmt = insert(IdempotencyKey).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={name: value for name, value in values.items() if name != "key"},
+            where=or_(
+                IdempotencyKey.expires_at < now,
+                (IdempotencyKey.status_code.is_(None)) & (IdempotencyKey.locked_until < now)
+            )
+        ).returning(IdempotencyKey.key)
+        
+        try:
+            async with self.session_factory() as session:
+                claimed = (await session.execute(stmt)).scalar_one_or_none()
+                await session.commit()
+        except Exception as e:
+            raise IdempotencyUnavailable(str(e)) from e
+        
+        if claimed is not None:
+            return None
+        return await self._db_get(key) or IdempotencyRecord(fingerprint=fingerprint)
+    
+    async def _db_get(self, key: str) -> Optional[IdempotencyRecord]:
+        try:
+            async with self.session_factory() as session:
+                row = (await session.execute(
+                    select(IdempotencyKey).where(
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.expires_at >= datetime.now(timezone.utc)
+                    )
+                )).scalar_one_or_none()
+        except Exception as e:
+            raise IdempotencyUnavailable(str(e)) from e
+        
+        if row is None:
+            return None
+        return IdempotencyRecord(
+            fingerprint=row.fingerprint,
+            status_code=row.status_code,
+            content_type=row.content_type,
+            body=row.response_body
+        )
+    
+    async def _db_complete(self, key: str, record: IdempotencyRecord) -> None:
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.key == key)
+                    .values(
+                        status_code=record.status_code,
+                        content_type=record.content_type,
+                        response_body=record.body,
+                        expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            raise IdempotencyUnavailable(str(e)) from e
+    
+    async def _db_release(self, key: str) -> None:
+        try:
+            async with self.session_factory() as session:
+                await session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+                await session.commit()
+        except Exception as e:
+            raise IdempotencyUnavailable(str(e)) from e
+
+
+idempotency_store = IdempotencyStore()
@@ -1,23 +1,56 @@
 import asyncio
 import time
 import uuid
+import weakref
 from typing import Optional
 import redis.asyncio as aioredis
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.redis_client import redis_factory, redis_breaker
+from app.core.circuit_breaker import CircuitBreaker
 
 logger = get_logger(__name__)
 
+# Process-local locks used while the Redis circuit is open. They only
+# serialize callers within this worker; entries vanish once unused.
+_local_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
 
 class DistributedLock:
     """Redis-based distributed lock using Redlock algorithm"""
     
-    def __init__(self, redis_client: aioredis.Redis, resource: str, timeout: int = None):
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        resource: str,
+        timeout: int = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         self.redis = redis_client
         self.resource = f"lock:{resource}"
         self.timeout = timeout or settings.LOCK_TIMEOUT
         self.lock_id = str(uuid.uuid4())
         self.acquired = False
+        self.breaker = breaker or redis_breaker
+        self.local_lock: Optional[asyncio.Lock] = None
+    
+    async def _acquire_local(self, wait_time: float) -> bool:
+        """Fall back to a process-local lock while Redis is unavailable"""
+        local_lock = _local_locks.get(self.resource)
+        if local_lock is None:
+            local_lock = asyncio.Lock()
+            _local_locks[self.resource] = local_lock
+        
+        try:
+            await asyncio.wait_for(local_lock.acquire(), timeout=wait_time)
+        except asyncio.TimeoutError:
+            logger.warning(f"Failed to acquire local fallback lock: {self.resource}")
+            return False
+        
+        self.local_lock = local_lock
+        self.acquired = True
+        logger.warning(f"Redis circuit open, acquired local fallback lock: {self.resource}")
+        return True
     
     async def acquire(self, retry_times: int = None, retry_delay: float = None) -> bool:
         """Acquire the distributed lock with retry logic"""
@@ -25,6 +58,10 @@ class DistributedLock:
         retry_delay = retry_delay or settings.LOCK_RETRY_DELAY
         
         for attempt in range(retry_times):
+            # Don't wait on socket timeouts while Redis is known to be down
+            if not self.breaker.allow_request():
+                return await self._acquire_local((retry_times - attempt) * retry_delay)
+            
             try:
                 # Try to acquire lock
                 result = await self.redis.set(
@@ -33,6 +70,7 @@ class DistributedLock:
                     nx=True,  # Only set if not exists
                     ex=self.timeout  # Expiration time
                 )
+                self.breaker.record_success()
                 
                 if result:
                     self.acquired = True
@@ -45,8 +83,9 @@ class DistributedLock:
                     logger.debug(f"Lock acquire retry {attempt + 1}/{retry_times}: {self.resource}")
             
             except Exception as e:
+                self.breaker.record_failure()
                 logger.error(f"Error acquiring lock {self.resource}: {e}")
-                if attempt < retry_times - 1:
+                if attempt < retry_times - 1 and self.breaker.state == self.breaker.CLOSED:
                     await asyncio.sleep(retry_delay)
         
         logger.warning(f"Failed to acquire lock after {retry_times} attempts: {self.resource}")
@@ -57,6 +96,18 @@ class DistributedLock:
         if not self.acquired:
             return False
         
+        if self.local_lock is not None:
+            self.local_lock.release()
+            self.local_lock = None
+            self.acquired = False
+            logger.debug(f"Local fallback lock released: {self.resource}")
+            return True
+        
+        if not self.breaker.allow_request():
+            # The key expires on its own once Redis is reachable again
+            self.acquired = False
+            return False
+        
         try:
             # Lua script to ensure we only delete our own lock
             lua_script = """
@@ -68,6 +119,7 @@ class DistributedLock:
             """
             
             result = await self.redis.eval(lua_script, 1, self.resource, self.lock_id)
+            self.breaker.record_success()
             
             if result:
                 self.acquired = False
@@ -78,6 +130,7 @@ class DistributedLock:
                 return False
         
         except Exception as e:
+            self.breaker.record_failure()
             logger.error(f"Error releasing lock {self.resource}: {e}")
             return False
     
@@ -86,6 +139,12 @@ class DistributedLock:
         if not self.acquired:
             return False
         
+        if self.local_lock is not None:
+            return True
+        
+        if not self.breaker.allow_request():
+            return False
+        
         try:
             additional_time = additional_time or self.timeout
             
@@ -105,6 +164,7 @@ class DistributedLock:
                 self.lock_id,
                 additional_time
             )
+            self.breaker.record_success()
             
             if result:
                 logger.debug(f"Lock extended: {self.resource} (+{additional_time}s)")
@@ -112,6 +172,7 @@ class DistributedLock:
             return False
         
         except Exception as e:
+            self.breaker.record_failure()
             logger.error(f"Error extending lock {self.resource}: {e}")
             return False
     
@@ -134,15 +195,9 @@ class LockManager:
         self.redis: Optional[aioredis.Redis] = None
     
     async def connect(self):
-        """Connect to Redis"""
+        """Connect to Redis using the shared connection pool"""
         try:
-            self.redis = await aioredis.from_url(
-                settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True,
-                max_connections=50
-            )
-            await self.redis.ping()
+            self.redis = await redis_factory.get_client()
             logger.info("Lock manager Redis connection established")
         except Exception as e:
             logger.error(f"Failed to connect lock manager to Redis: {e}")
@@ -151,7 +206,8 @@ class LockManager:
     async def close(self):
         """Close Redis connection"""
         if self.redis:
-            await self.redis.close()
+            await redis_factory.release()
+            self.redis = None
             logger.info("Lock manager Redis connection closed")
     
     def lock(self, resource: str, timeout: int = None) -> DistributedLock:
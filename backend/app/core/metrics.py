@@ -24,6 +24,11 @@ bookings_arrived_total = Counter(
     'Total number of bookings marked as arrived'
 )
 
+bookings_delivered_total = Counter(
+    'bookings_delivered_total',
+    'Total number of bookings marked as delivered'
+)
+
 bookings_cancelled_total = Counter(
     'bookings_cancelled_total',
     'Total number of bookings cancelled'
@@ -54,6 +59,18 @@ cache_misses_total = Counter(
     ['cache_type']
 )
 
+cache_compression_ratio = Histogram(
+    'cache_compression_ratio',
+    'Ratio of uncompressed to compressed size for cached values',
+    buckets=(1, 1.5, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+)
+
+cache_compression_duration_seconds = Histogram(
+    'cache_compression_duration_seconds',
+    'Time spent compressing and decompressing cached values',
+    ['operation']
+)
+
 # Lock Metrics
 lock_acquisitions_total = Counter(
     'lock_acquisitions_total',
@@ -70,6 +87,79 @@ lock_wait_duration_seconds = Histogram(
     'Time spent waiting for locks'
 )
 
+# Redis Metrics
+redis_pool_connections_in_use = Gauge(
+    'redis_pool_connections_in_use',
+    'Number of Redis connections currently checked out of the pool'
+)
+
+redis_pool_wait_seconds = Histogram(
+    'redis_pool_wait_seconds',
+    'Time spent waiting to check out a Redis connection',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+redis_pool_timeouts_total = Counter(
+    'redis_pool_timeouts_total',
+    'Total number of Redis connection checkouts that failed'
+)
+
+redis_command_duration_seconds = Histogram(
+    'redis_command_duration_seconds',
+    'Redis command latency in seconds',
+    ['command'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+circuit_breaker_state = Gauge(
+    'circuit_breaker_state',
+    'Circuit breaker state (0=closed, 1=half-open, 2=open)',
+    ['name']
+)
+
+circuit_breaker_short_circuits_total = Counter(
+    'circuit_breaker_short_circuits_total',
+    'Total number of calls rejected by an open circuit breaker',
+    ['name']
+)
+
+# Idempotency Metrics
+idempotency_requests_total = Counter(
+    'idempotency_requests_total',
+    'Total number of requests carrying an Idempotency-Key',
+    ['outcome']
+)
+
+# Streaming Metrics
+sse_connections_active = Gauge(
+    'sse_connections_active',
+    'Number of open booking event streams in this process'
+)
+
+bookings_exported_total = Counter(
+    'bookings_exported_total',
+    'Total number of bookings written by streaming exports',
+    ['format']
+)
+
+# Archive Metrics
+bookings_archived_total = Counter(
+    'bookings_archived_total',
+    'Total number of closed bookings moved to the archive tables'
+)
+
+# Group Commit Metrics
+event_group_commit_batch_size = Histogram(
+    'event_group_commit_batch_size',
+    'Booking transitions committed per group commit',
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250)
+)
+
+event_group_commit_fallbacks_total = Counter(
+    'event_group_commit_fallbacks_total',
+    'Group commits that failed and were retried one transition at a time'
+)
+
 # Database Metrics
 db_query_duration_seconds = Histogram(
     'db_query_duration_seconds',
@@ -96,23 +186,29 @@ async def initialize_metrics():
         from app.core.db import AsyncSessionLocal
         from sqlalchemy import select, func
         from app.models.booking import Booking
+        from app.models.booking_archive import BookingArchive
         
         async with AsyncSessionLocal() as db:
-            # Total bookings
-            result = await db.execute(select(func.count(Booking.id)))
-            total = result.scalar() or 0
+            # Total bookings (archived ones included)
+            total = 0
+            for table in (Booking, BookingArchive):
+                result = await db.execute(select(func.count(table.id)))
+                total += result.scalar() or 0
             bookings_created_total._value.set(total)
             
             # By status
             for status, counter in [
                 ('DEPARTED', bookings_departed_total),
                 ('ARRIVED', bookings_arrived_total),
+                ('DELIVERED', bookings_delivered_total),
                 ('CANCELLED', bookings_cancelled_total)
             ]:
-                result = await db.execute(
-                    select(func.count(Booking.id)).where(Booking.status == status)
-                )
-                count = result.scalar() or 0
+                count = 0
+                for table in (Booking, BookingArchive):
+                    result = await db.execute(
+                        select(func.count(table.id)).where(table.status == status)
+                    )
+                    count += result.scalar() or 0
                 counter._value.set(count)
             
             logger.info(f"Metrics initialized from database: {total} bookings")
@@ -0,0 +1,122 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+from app.core.cache import CacheService, cache
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import sse_connections_active
+
+logger = get_logger(__name__)
+
+BOOKING_EVENTS_CHANNEL = "booking_events"
+
+
+class BookingEventBroker:
+    """
+    Fans booking status changes out to local stream subscribers
+    - Writers publish to one Redis channel after commit
+    - Each process runs a single Redis subscriber and routes messages to
+      per-ref_id asyncio queues, so an idle viewer costs one queue
+    - The subscriber starts with the first local viewer and reconnects on errors
+    """
+    
+    def __init__(self, cache_service: Optional[CacheService] = None):
+        self.cache = cache_service or cache
+        self.queue_size = settings.SSE_QUEUE_SIZE
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+    
+    async def publish(self, messages: List[Dict[str, Any]]) -> None:
+        """Publish booking updates (each with a ref_id) in one pipelined round trip"""
+        if not messages:
+            return
+        
+        async def send():
+            async with self.cache.redis.pipeline(transaction=False) as pipe:
+                for message in messages:
+                    pipe.publish(BOOKING_EVENTS_CHANNEL, json.dumps(message, default=str))
+                await pipe.execute()
+        
+        try:
+            await self.cache.breaker.call(send)
+        except CircuitOpenError:
+            pass
+        except Exception as e:
+            # Viewers still see the change on their next history fetch
+            logger.error(f"Failed to publish booking events: {e}")
+    
+    def subscribe(self, ref_id: str) -> asyncio.Queue:
+        """Register a local viewer of a booking"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[ref_id].add(queue)
+        sse_connections_active.inc()
+        
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return queue
+    
+    def unsubscribe(self, ref_id: str, queue: asyncio.Queue) -> None:
+        """Remove a local viewer"""
+        queues = self._subscribers.get(ref_id)
+        if queues and queue in queues:
+            queues.discard(queue)
+            sse_connections_active.dec()
+            if not queues:
+                del self._subscribers[ref_id]
+    
+    def dispatch(self, message: Dict[str, Any]) -> None:
+        """Deliver a message to the local viewers of its booking"""
+        for queue in list(self._subscribers.get(message.get("ref_id"), ())):
+            if queue.full():
+                # Slow consumer: drop its oldest update rather than block the fan-out
+                queue.get_nowait()
+            queue.put_nowait(message)
+    
+    async def _listen(self) -> None:
+        """Single Redis subscriber for this process"""
+        backoff = 0.5
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.cache.redis.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(BOOKING_EVENTS_CHANNEL)
+                backoff = 0.5
+                
+                while True:
+                    # Explicit read timeout: the pool's socket_timeout is tuned for
+                    # commands and would otherwise break an idle subscription
+                    raw = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if raw is None:
+                        continue
+                    try:
+                        self.dispatch(json.loads(raw["data"]))
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"Ignoring malformed booking event: {e}")
+            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Booking event subscriber failed, reconnecting in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+    
+    async def close(self) -> None:
+        """Stop the subscriber"""
+        if self._listener is not None and not self._listener.done():
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        self._listener = None
+
+
+event_broker = BookingEventBroker()
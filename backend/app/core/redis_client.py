@@ -0,0 +1,109 @@
+import time
+from typing import Optional
+import redis.asyncio as aioredis
+from redis.asyncio.connection import BlockingConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.metrics import (
+    redis_pool_connections_in_use,
+    redis_pool_wait_seconds,
+    redis_pool_timeouts_total,
+    redis_command_duration_seconds,
+)
+
+logger = get_logger(__name__)
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Blocking connection pool that reports checkout wait time and usage"""
+    
+    async def get_connection(self, command_name, *keys, **options):
+        start_time = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError:
+            redis_pool_timeouts_total.inc()
+            raise
+        finally:
+            redis_pool_wait_seconds.observe(time.perf_counter() - start_time)
+            redis_pool_connections_in_use.set(len(self._in_use_connections))
+    
+    async def release(self, connection):
+        await super().release(connection)
+        redis_pool_connections_in_use.set(len(self._in_use_connections))
+
+
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client that records per-command latency"""
+    
+    async def execute_command(self, *args, **options):
+        start_time = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            redis_command_duration_seconds.labels(command=str(args[0]).upper()).observe(
+                time.perf_counter() - start_time
+            )
+
+
+class RedisClientFactory:
+    """
+    Owns the single Redis connection pool shared by the cache, distributed
+    locks and rate limiting. The pool is created on first use and closed
+    when the last user releases it.
+    """
+    
+    def __init__(self):
+        self.pool: Optional[InstrumentedConnectionPool] = None
+        self.client: Optional[aioredis.Redis] = None
+        self._users = 0
+    
+    async def get_client(self) -> aioredis.Redis:
+        """Get the shared Redis client, connecting on first use"""
+        if self.client is None:
+            pool = InstrumentedConnectionPool.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                decode_responses=False,
+            )
+            client = InstrumentedRedis(connection_pool=pool)
+            
+            try:
+                await client.ping()
+            except Exception:
+                await pool.disconnect()
+                raise
+            
+            self.pool = pool
+            self.client = client
+            logger.info(
+                f"Redis connection pool established (max_connections={settings.REDIS_MAX_CONNECTIONS})"
+            )
+        
+        self._users += 1
+        return self.client
+    
+    async def release(self):
+        """Release the shared client, closing the pool after the last user"""
+        self._users = max(self._users - 1, 0)
+        
+        if self._users == 0 and self.client is not None:
+            await self.client.close()
+            await self.pool.disconnect()
+            self.client = None
+            self.pool = None
+            redis_pool_connections_in_use.set(0)
+            logger.info("Redis connection pool closed")
+
+
+# Global Redis client factory
+redis_factory = RedisClientFactory()
+
+# Shared breaker for every Redis call made by the cache, locks and rate limiting
+redis_breaker = CircuitBreaker("redis")
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -7,9 +8,12 @@ from app.core.logging import setup_logging, get_logger
 from app.core.db import init_db, close_db
 from app.core.cache import cache
 from app.core.locks import lock_manager
+from app.core.pubsub import event_broker
+from app.services.event_writer import event_writer
 from app.middleware.logging_middleware import LoggingMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
-from app.routers import bookings_router, routes_router, health_router, metrics_router, auth_router
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.routers import bookings_router, routes_router, health_router, metrics_router, auth_router, flights_router
 
 # Setup logging
 setup_logging()
@@ -40,6 +44,11 @@ async def lifespan(app: FastAPI):
         from app.core.metrics import initialize_metrics
         await initialize_metrics()
         
+        # Warm the cache in the background so startup isn't blocked on it
+        if settings.CACHE_WARMUP_ENABLED:
+            from app.services.warmup_service import run_cache_warmup
+            app.state.warmup_task = asyncio.create_task(run_cache_warmup())
+        
         logger.info("Application startup complete")
         
     except Exception as e:
@@ -52,6 +61,12 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application")
     
     try:
+        warmup_task = getattr(app.state, "warmup_task", None)
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
+        
+        await event_broker.close()
+        await event_writer.close()
         await cache.close()
         await lock_manager.close()
         await close_db()
@@ -83,6 +98,9 @@ app.add_middleware(
 # Add logging middleware
 app.add_middleware(LoggingMiddleware)
 
+# Add idempotency middleware (inside rate limiting, so replays still count)
+app.add_middleware(IdempotencyMiddleware)
+
 # Add rate limiting middleware
 app.add_middleware(RateLimitMiddleware)
 
@@ -91,6 +109,7 @@ app.include_router(health_router)
 app.include_router(auth_router, prefix=settings.API_V1_PREFIX)
 app.include_router(bookings_router, prefix=settings.API_V1_PREFIX)
 app.include_router(routes_router, prefix=settings.API_V1_PREFIX)
+app.include_router(flights_router, prefix=settings.API_V1_PREFIX)
 app.include_router(metrics_router)
 
 # Mount Prometheus metrics endpoint
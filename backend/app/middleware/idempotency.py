@@ -0,0 +1,160 @@
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.auth import verify_token
+from app.core.idempotency import IdempotencyRecord, IdempotencyUnavailable, idempotency_store
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import idempotency_requests_total
+import asyncio
+import hashlib
+import time
+
+logger = get_logger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENT_METHODS = {"POST", "DELETE"}
+IDEMPOTENT_PATH_PREFIXES = (
+    f"{settings.API_V1_PREFIX}/bookings",
+    f"{settings.API_V1_PREFIX}/flights",
+)
+
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    """
+    Replays the first response for a repeated Idempotency-Key
+    - Keys are scoped by caller, method and path, so clients cannot collide
+    - Concurrent duplicates wait for the in-flight request instead of re-executing
+    - Reusing a key with a different request is rejected with 422
+    - 5xx responses are not stored, so the client can retry them
+    """
+    
+    def __init__(self, app, store=None):
+        super().__init__(app)
+        self.store = store or idempotency_store
+    
+    async def dispatch(self, request: Request, call_next):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if (
+            not settings.IDEMPOTENCY_ENABLED
+            or not key
+            or request.method not in IDEMPOTENT_METHODS
+            or not request.url.path.startswith(IDEMPOTENT_PATH_PREFIXES)
+        ):
+            return await call_next(request)
+        
+        if len(key) > 255:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"detail": f"{IDEMPOTENCY_HEADER} must be at most 255 characters"}
+            )
+        
+        scoped_key = self._scoped_key(request, key)
+        fingerprint = hashlib.sha256(
+            b"\n".join([request.method.encode(), request.url.path.encode(), await request.body()])
+        ).hexdigest()
+        
+        try:
+            existing = await self._claim_or_wait(scoped_key, fingerprint)
+        except IdempotencyUnavailable as e:
+            # No store to dedupe against - fail open like rate limiting
+            logger.error(f"Idempotency store unavailable, executing without it: {e}")
+            return await call_next(request)
+        
+        if existing is not None:
+            if existing.fingerprint != fingerprint:
+                idempotency_requests_total.labels(outcome='mismatch').inc()
+                return JSONResponse(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    content={"detail": f"{IDEMPOTENCY_HEADER} was already used for a different request"}
+                )
+            if not existing.completed:
+                idempotency_requests_total.labels(outcome='in_progress').inc()
+                return JSONResponse(
+                    status_code=status.HTTP_409_CONFLICT,
+                    content={"detail": f"A request with this {IDEMPOTENCY_HEADER} is still in progress"},
+                    headers={"Retry-After": "1"}
+                )
+            
+            idempotency_requests_total.labels(outcome='replayed').inc()
+            return Response(
+                content=existing.body or "",
+                status_code=existing.status_code,
+                media_type=existing.content_type,
+                headers={REPLAYED_HEADER: "true"}
+            )
+        
+        idempotency_requests_total.labels(outcome='executed').inc()
+        try:
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        except Exception:
+            await self._release(scoped_key)
+            raise
+        
+        if response.status_code >= 500:
+            await self._release(scoped_key)
+        else:
+            try:
+                await self.store.complete(scoped_key, IdempotencyRecord(
+                    fingerprint=fingerprint,
+                    status_code=response.status_code,
+                    content_type=response.headers.get("content-type"),
+                    body=body.decode("utf-8")
+                ))
+            except IdempotencyUnavailable as e:
+                logger.error(f"Failed to store idempotent response for key {key}: {e}")
+        
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            background=response.background
+        )
+    
+    @staticmethod
+    def _scoped_key(request: Request, key: str) -> str:
+        """
+        Store key for a client key: the caller (token subject, else client
+        address) plus method and path, hashed to fit the key column
+        """
+        caller = f"ip:{request.client.host if request.client else ''}"
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                subject = verify_token(token).get("sub")
+            except HTTPException:
+                subject = None
+            if subject:
+                caller = f"sub:{subject}"
+        
+        return hashlib.sha256(
+            "\n".join([caller, request.method, request.url.path, key]).encode()
+        ).hexdigest()
+    
+    async def _claim_or_wait(self, key: str, fingerprint: str):
+        """
+        Claim the key, or wait for the request holding it to finish
+        Returns None once claimed, otherwise the record to answer from
+        """
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        existing = await self.store.claim(key, fingerprint)
+        
+        while existing is not None and not existing.completed:
+            if existing.fingerprint != fingerprint or time.monotonic() >= deadline:
+                return existing
+            
+            await asyncio.sleep(settings.IDEMPOTENCY_POLL_INTERVAL)
+            existing = await self.store.get(key)
+            if existing is None:
+                # Holder failed or its claim expired - take over
+                existing = await self.store.claim(key, fingerprint)
+        
+        return existing
+    
+    async def _release(self, key: str) -> None:
+        try:
+            await self.store.release(key)
+        except IdempotencyUnavailable as e:
+            logger.error(f"Failed to release idempotency key {key}: {e}")
@@ -1,6 +1,7 @@
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.cache import cache
+from app.core.circuit_breaker import CircuitOpenError
 from app.core.config import settings
 from app.core.logging import get_logger
 import time
@@ -28,11 +29,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         try:
             # Get current count
-            current_count = await cache.redis.get(rate_limit_key)
+            current_count = await cache.call("get", rate_limit_key)
             
             if current_count is None:
                 # First request in this minute
-                await cache.redis.setex(rate_limit_key, 60, 1)
+                await cache.call("setex", rate_limit_key, 60, 1)
             else:
                 current_count = int(current_count)
                 
@@ -44,10 +45,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     )
                 
                 # Increment counter
-                await cache.redis.incr(rate_limit_key)
+                await cache.call("incr", rate_limit_key)
         
         except HTTPException:
             raise
+        except CircuitOpenError:
+            # Redis is down - fail open without waiting on it
+            pass
         except Exception as e:
             logger.error(f"Rate limit check failed: {e}")
             # Continue on error to not block requests
@@ -1,11 +1,52 @@
-from sqlalchemy import Column, Integer, String, DateTime, ARRAY
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, Sequence, Text, cast, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.db import Base
+from app.utils.ref_id_generator import REF_ID_BLOCK_SIZE, REF_ID_SPACE
+
+
+# Source of ref_ids: each nextval reserves a block of REF_ID_BLOCK_SIZE values
+booking_ref_seq = Sequence(
+    "booking_ref_seq",
+    start=0,
+    minvalue=0,
+    maxvalue=REF_ID_SPACE - 1,
+    increment=REF_ID_BLOCK_SIZE,
+    metadata=Base.metadata,
+)
+
+
+def current_xact_id():
+    """Id of the writing transaction as a bigint (xid8 is 64-bit and never wraps)"""
+    return cast(cast(func.pg_current_xact_id(), Text), BigInteger)
+
+
+def visible_xact_horizon():
+    """Transactions below this id have all finished (xmin of the current snapshot)"""
+    return cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
 
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Supports "bookings on flight X" lookups (flight_ids @> ARRAY[X])
+        Index("idx_bookings_flight_ids", "flight_ids", postgresql_using="gin"),
+        # Keyset pagination of the bookings list (ORDER BY created_at DESC, id DESC)
+        Index("idx_bookings_created_at_id", "created_at", "id"),
+        # Filtered listings: equality columns first, then the keyset order
+        Index("idx_bookings_status_created_at", "status", "created_at", "id"),
+        Index("idx_bookings_route_created_at", "origin", "destination", "created_at", "id"),
+        Index("idx_bookings_destination_created_at", "destination", "created_at", "id"),
+        # Small partial index for dashboard queries on in-flight bookings by origin
+        Index(
+            "idx_bookings_active_origin_created_at",
+            "origin", "created_at", "id",
+            postgresql_where=text("status IN ('BOOKED', 'DEPARTED', 'ARRIVED')")
+        ),
+        # Change feed (ORDER BY change_seq, id)
+        Index("idx_bookings_change_seq_id", "change_seq", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     ref_id = Column(String(20), unique=True, nullable=False, index=True)
@@ -17,9 +58,25 @@ class Booking(Base):
     flight_ids = Column(ARRAY(Integer), default=list)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Change feed position: id of the last transaction that wrote the row,
+    # set on insert and by every UPDATE issued through SQLAlchemy
+    change_seq = Column(
+        BigInteger,
+        nullable=False,
+        server_default=text("(pg_current_xact_id()::text::bigint)"),
+        onupdate=current_xact_id()
+    )
     
     # Relationships
-    events = relationship("BookingEvent", back_populates="booking", cascade="all, delete-orphan", lazy="selectin")
+    # Never loaded implicitly: readers that need the timeline ask for it with selectinload
+    events = relationship(
+        "BookingEvent",
+        back_populates="booking",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,
+        order_by="[BookingEvent.created_at, BookingEvent.id]",
+    )
     
     def __repr__(self):
         return f"<Booking(ref_id={self.ref_id}, status={self.status})>"
\ No newline at end of file
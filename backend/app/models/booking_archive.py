@@ -0,0 +1,63 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import func
+from app.core.db import Base
+
+
+class BookingArchive(Base):
+    """
+    Closed bookings moved out of the hot bookings table
+    Same columns as bookings (ids are kept), plus archived_at
+    """
+    __tablename__ = "bookings_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    ref_id = Column(String(20), unique=True, nullable=False)
+    origin = Column(String(10), nullable=False)
+    destination = Column(String(10), nullable=False)
+    pieces = Column(Integer, nullable=False)
+    weight_kg = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False)
+    flight_ids = Column(ARRAY(Integer))
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    change_seq = Column(BigInteger, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<BookingArchive(ref_id={self.ref_id}, status={self.status})>"
+
+
+class BookingEventArchive(Base):
+    """Events of archived bookings (same columns as booking_events)"""
+    __tablename__ = "booking_events_archive"
+    __table_args__ = (
+        Index("idx_booking_events_archive_booking_id", "booking_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    booking_id = Column(Integer, nullable=False)
+    event_type = Column(String(20), nullable=False)
+    location = Column(String(10), nullable=True)
+    flight_id = Column(Integer, nullable=True)
+    flight_number = Column(String(20), nullable=True)
+    notes = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<BookingEventArchive(booking_id={self.booking_id}, type={self.event_type})>"
+
+
+class BookingRefId(Base):
+    """
+    Every ref_id ever issued, hot or archived
+    A booking's ref_id is registered in the statement that creates it and
+    stays here when the booking is archived, so its primary key keeps
+    ref_ids unique across bookings and bookings_archive
+    """
+    __tablename__ = "booking_ref_ids"
+    
+    ref_id = Column(String(20), primary_key=True)
+    
+    def __repr__(self):
+        return f"<BookingRefId(ref_id={self.ref_id})>"
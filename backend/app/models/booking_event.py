@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.db import Base
@@ -6,9 +6,14 @@ from app.core.db import Base
 
 class BookingEvent(Base):
     __tablename__ = "booking_events"
+    __table_args__ = (
+        # A booking's timeline in order (created in 001_initial_schema); serves
+        # full and incremental (after_event_id) history reads
+        Index("idx_booking_events_booking_id", "booking_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, index=True)
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
     event_type = Column(String(20), nullable=False)
     location = Column(String(10), nullable=True)
     flight_id = Column(Integer, ForeignKey("flights.id"), nullable=True)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.core.db import Base
+
+
+class BookingTracking(Base):
+    """
+    Read model for tracking pages, maintained on every booking write
+    document holds the rendered BookingHistoryResponse (booking + timeline)
+    """
+    __tablename__ = "booking_tracking"
+    
+    ref_id = Column(String(20), primary_key=True)
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, unique=True)
+    status = Column(String(20), nullable=False)
+    document = Column(JSONB, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<BookingTracking(ref_id={self.ref_id}, status={self.status})>"
@@ -1,5 +1,7 @@
 from app.repositories.booking_repository import BookingRepository
 from app.repositories.flight_repository import FlightRepository
 from app.repositories.event_repository import EventRepository
+from app.repositories.tracking_repository import TrackingRepository
+from app.repositories.archive_repository import ArchiveRepository
 
-__all__ = ["BookingRepository", "FlightRepository", "EventRepository"]
\ No newline at end of file
+__all__ = ["BookingRepository", "FlightRepository", "EventRepository", "TrackingRepository", "ArchiveRepository"]
\ No newline at end of file
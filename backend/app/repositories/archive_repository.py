@@ -0,0 +1,131 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete, func, bindparam, any_, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
+from datetime import datetime
+from typing import List, Optional
+from app.models.booking import Booking
+from app.models.booking_event import BookingEvent
+from app.models.booking_archive import BookingArchive, BookingEventArchive
+from app.schemas.booking import BookingStatus
+from app.repositories.event_repository import EventRepository
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bookings in these states never change again and can leave the hot tables
+ARCHIVABLE_STATUSES = [BookingStatus.DELIVERED.value, BookingStatus.CANCELLED.value]
+
+# Postgres advisory lock key held by the transaction moving a batch
+ARCHIVE_LOCK_KEY = 0x41524348  # "ARCH"
+
+
+class ArchiveRepository:
+    """Repository for archived (closed) bookings and their events"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def try_lock(self) -> bool:
+        """
+        Take the archive lock for the current transaction, without waiting
+        Released at commit/rollback; held in Postgres, so it works without Redis
+        """
+        return await self.db.scalar(select(func.pg_try_advisory_xact_lock(ARCHIVE_LOCK_KEY)))
+    
+    async def archive_closed(self, closed_before: datetime, limit: int) -> List[str]:
+        """
+        Move up to limit closed bookings, with their events, into the archive tables
+        - One statement: DELETE ... RETURNING from the hot tables feeds the archive
+          INSERTs through CTEs, so a booking is never in both or neither
+        - Candidates are closed and last updated before closed_before; rows locked
+          by a concurrent writer are skipped, not waited on
+        - booking_tracking rows go with their booking (ON DELETE CASCADE)
+        - Returns the archived ref_ids
+        """
+        candidates = (
+            select(Booking.id)
+            .where(
+                Booking.status == any_(bindparam("closed", value=ARCHIVABLE_STATUSES, type_=ARRAY(String))),
+                # Implied by updated_at; lets idx_bookings_status_created_at bound the scan
+                Booking.created_at < closed_before,
+                Booking.updated_at < closed_before
+            )
+            .order_by(Booking.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("candidates")
+        )
+        
+        moved_events = (
+            delete(BookingEvent)
+            .where(BookingEvent.booking_id.in_(select(candidates.c.id)))
+            .returning(*BookingEvent.__table__.c)
+            .cte("moved_events")
+        )
+        moved = (
+            delete(Booking)
+            .where(Booking.id.in_(select(candidates.c.id)))
+            .returning(*Booking.__table__.c)
+            .cte("moved")
+        )
+        
+        event_columns = [column.name for column in BookingEvent.__table__.c]
+        booking_columns = [column.name for column in Booking.__table__.c]
+        
+        archived_events = (
+            insert(BookingEventArchive)
+            .from_select(event_columns, select(*[moved_events.c[name] for name in event_columns]))
+            .cte("archived_events")
+        )
+        
+        result = await self.db.execute(
+            insert(BookingArchive)
+            .from_select(booking_columns, select(*[moved.c[name] for name in booking_columns]))
+            .returning(BookingArchive.ref_id)
+            .add_cte(archived_events)
+        )
+        ref_ids = result.scalars().all()
+        
+        if ref_ids:
+            logger.info(f"Archived {len(ref_ids)} closed bookings")
+        return ref_ids
+    
+    async def get_by_ref_id(self, ref_id: str) -> Optional[BookingArchive]:
+        """Get an archived booking by reference ID"""
+        result = await self.db.execute(
+            select(BookingArchive).where(BookingArchive.ref_id == ref_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_many_by_ref_ids(self, ref_ids: List[str]) -> List[BookingArchive]:
+        """Get the archived bookings matching any of the given reference IDs (unordered)"""
+        if not ref_ids:
+            return []
+        
+        result = await self.db.execute(
+            select(BookingArchive).where(
+                BookingArchive.ref_id == any_(bindparam("ref_ids", value=ref_ids, type_=ARRAY(String)))
+            )
+        )
+        return result.scalars().all()
+    
+    async def get_history(self, ref_id: str, after_event_id: Optional[int] = None) -> Optional[Row]:
+        """Get an archived booking row with its ordered event timeline in one statement"""
+        result = await self.db.execute(
+            select(
+                *BookingArchive.__table__.c,
+                EventRepository.timeline_json(
+                    BookingArchive.id, after_event_id, events=BookingEventArchive
+                ).label("timeline")
+            )
+            .where(BookingArchive.ref_id == ref_id)
+        )
+        return result.one_or_none()
+    
+    async def get_status(self, ref_id: str) -> Optional[str]:
+        """Get the status of an archived booking"""
+        result = await self.db.execute(
+            select(BookingArchive.status).where(BookingArchive.ref_id == ref_id)
+        )
+        return result.scalar_one_or_none()
@@ -1,97 +1,387 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from typing import Optional, List
-from app.models.booking import Booking
-from app.schemas.booking import BookingCreate, BookingStatus
+from sqlalchemy import select, insert, update, bindparam, any_, and_, or_, func, tuple_, String, Select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional, List, Sequence, Tuple
+from app.models.booking import Booking, booking_ref_seq, visible_xact_horizon
+from app.models.booking_event import BookingEvent
+from app.models.booking_archive import BookingRefId
+from app.schemas.booking import BookingCreate, BookingFilters, BookingStatus, EventType
+from app.repositories.event_repository import EventRepository
+from app.repositories.tracking_repository import TrackingRepository
+from app.repositories.archive_repository import ArchiveRepository
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
 class BookingRepository:
-    """Repository for booking database operations"""
+    """
+    Repository for booking database operations
+    Reads by ref_id fall back to the archive tables for archived (closed) bookings
+    """
     
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.archive_repo = ArchiveRepository(db)
     
-    async def create(self, booking_data: BookingCreate, ref_id: str) -> Booking:
-        """Create a new booking"""
-        booking = Booking(
-            ref_id=ref_id,
-            origin=booking_data.origin,
-            destination=booking_data.destination,
-            pieces=booking_data.pieces,
-            weight_kg=booking_data.weight_kg,
-            status=BookingStatus.BOOKED.value,
-            flight_ids=booking_data.flight_ids or []
-        )
-        
-        self.db.add(booking)
-        await self.db.flush()
-        await self.db.refresh(booking)
+    async def create(self, booking_data: BookingCreate, ref_id: str) -> Row:
+        """
+        Create a new booking and its BOOKED event in one statement
+        - Returns the inserted booking row
+        """
+        [row] = await self.create_many([(ref_id, booking_data)])
         
         logger.info(f"Booking created: {ref_id}")
-        return booking
+        return row
+    
+    async def create_many(self, bookings: List[Tuple[str, BookingCreate]]) -> List[Row]:
+        """
+        Create many bookings and their BOOKED events in one statement
+        - Multi-row INSERT ... RETURNING, with the events and the tracking
+          documents inserted via CTEs
+        - ref_ids are also registered in booking_ref_ids, unique across hot
+          and archived bookings
+        - Returns the inserted booking rows
+        """
+        if not bookings:
+            return []
+        
+        inserted = (
+            insert(Booking)
+            .values([
+                {
+                    "ref_id": ref_id,
+                    "origin": data.origin,
+                    "destination": data.destination,
+                    "pieces": data.pieces,
+                    "weight_kg": data.weight_kg,
+                    "status": BookingStatus.BOOKED.value,
+                    "flight_ids": data.flight_ids or [],
+                }
+                for ref_id, data in bookings
+            ])
+            .returning(*Booking.__table__.c)
+            .cte("inserted")
+        )
+        
+        event_insert = EventRepository.insert_from_select(
+            inserted.c.id,
+            EventType.BOOKED,
+            location=inserted.c.origin,
+            notes="Booking created"
+        ).returning(*BookingEvent.__table__.c).cte("inserted_events")
+        
+        tracking_insert = TrackingRepository.insert_created(inserted, event_insert).cte("inserted_tracking")
+        
+        # Fails with a ref_id unique violation if an archived booking holds it
+        registered = (
+            insert(BookingRefId)
+            .from_select(["ref_id"], select(inserted.c.ref_id))
+            .cte("registered_ref_ids")
+        )
+        
+        result = await self.db.execute(
+            select(inserted).add_cte(event_insert, registered, tracking_insert).order_by(inserted.c.id)
+        )
+        rows = result.all()
+        
+        logger.info(f"Bulk created {len(rows)} bookings")
+        return rows
     
     async def get_by_ref_id(self, ref_id: str) -> Optional[Booking]:
-        """Get booking by reference ID"""
+        """Get booking by reference ID (BookingArchive if it was archived)"""
         result = await self.db.execute(
             select(Booking).where(Booking.ref_id == ref_id)
         )
-        return result.scalar_one_or_none()
+        booking = result.scalar_one_or_none()
+        if booking is None:
+            booking = await self.archive_repo.get_by_ref_id(ref_id)
+        return booking
     
-    async def get_by_id(self, booking_id: int) -> Optional[Booking]:
-        """Get booking by ID"""
+    async def get_many_by_ref_ids(self, ref_ids: List[str]) -> List[Booking]:
+        """Get the bookings matching any of the given reference IDs (unordered, archive included)"""
+        if not ref_ids:
+            return []
+        
         result = await self.db.execute(
-            select(Booking).where(Booking.id == booking_id)
+            select(Booking).where(
+                Booking.ref_id == any_(bindparam("ref_ids", value=ref_ids, type_=ARRAY(String)))
+            )
         )
-        return result.scalar_one_or_none()
+        bookings = list(result.scalars().all())
+        
+        found = {booking.ref_id for booking in bookings}
+        missing = [ref_id for ref_id in ref_ids if ref_id not in found]
+        return bookings + list(await self.archive_repo.get_many_by_ref_ids(missing))
     
-    async def update_status(self, booking_id: int, status: BookingStatus) -> bool:
-        """Update booking status"""
+    async def get_history(self, ref_id: str, after_event_id: Optional[int] = None) -> Optional[Row]:
+        """
+        Get a booking row with its ordered event timeline in one statement
+        - timeline is a JSON array of event objects (json_agg subquery)
+        - after_event_id limits the timeline to newer events
+        - Falls back to the archive when the booking is not in the hot table
+        """
         result = await self.db.execute(
+            select(
+                *Booking.__table__.c,
+                EventRepository.timeline_json(Booking.id, after_event_id).label("timeline")
+            )
+            .where(Booking.ref_id == ref_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            row = await self.archive_repo.get_history(ref_id, after_event_id)
+        return row
+    
+    async def transition_status(
+        self,
+        ref_id: str,
+        new_status: BookingStatus,
+        allowed_from: Iterable[BookingStatus],
+        event_type: EventType,
+        location: Optional[str] = None,
+        flight_id: Optional[int] = None,
+        flight_number: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> Optional[Row]:
+        """
+        Atomically change a booking's status and record the matching event
+        - One statement: UPDATE ... WHERE status = ANY(allowed) RETURNING, with the
+          event INSERT chained on as a CTE
+        - Every transition shares the same SQL text, so the compiled statement
+          and the driver's prepared statement are reused
+        - Row-level locking makes concurrent transitions serialize on the booking
+        - Returns None if the booking doesn't exist or isn't in an allowed status
+        """
+        allowed = bindparam(
+            "allowed_from",
+            value=sorted(s.value for s in allowed_from),
+            type_=ARRAY(String)
+        )
+        
+        updated = (
             update(Booking)
-            .where(Booking.id == booking_id)
-            .values(status=status.value)
+            .where(Booking.ref_id == ref_id, Booking.status == any_(allowed))
+            .values(status=new_status.value)
+            .returning(*Booking.__table__.c)
+            .cte("updated")
         )
         
-        success = result.rowcount > 0
-        if success:
-            logger.info(f"Booking {booking_id} status updated to {status.value}")
-        return success
+        event_insert = EventRepository.insert_from_select(
+            updated.c.id,
+            event_type,
+            location=location,
+            flight_id=flight_id,
+            flight_number=flight_number,
+            notes=notes
+        ).cte("inserted_event")
+        
+        result = await self.db.execute(select(updated).add_cte(event_insert))
+        row = result.one_or_none()
+        
+        if row:
+            logger.info(f"Booking {ref_id} status updated to {new_status.value}")
+        return row
     
-    async def update_flight_ids(self, booking_id: int, flight_ids: List[int]) -> bool:
-        """Update flight IDs"""
-        result = await self.db.execute(
+    async def transition_by_flight(
+        self,
+        flight_id: int,
+        new_status: BookingStatus,
+        allowed_from: Iterable[BookingStatus],
+        event_type: EventType,
+        first_leg_from: Iterable[BookingStatus] = (),
+        leg_event: Optional[EventType] = None,
+        leg_offset: int = 0,
+        location: Optional[str] = None,
+        flight_number: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> List[Row]:
+        """
+        Transition every eligible booking on a flight in one statement
+        - One set-based UPDATE plus a multi-row event INSERT (via CTE)
+        - first_leg_from statuses are eligible only when the flight is the
+          booking's first leg
+        - allowed_from statuses with a leg_event are eligible only when the
+          booking's latest leg_event was on the leg leg_offset places before
+          this flight in flight_ids (0: this flight), so a retry or another
+          leg's call never replays a leg
+        - Returns one row per booking on the flight: ref_id, previous_status,
+          status and updated_at (NULL when the booking was not eligible)
+        """
+        on_flight = Booking.flight_ids.contains([flight_id])
+        leg = func.array_position(Booking.flight_ids, flight_id)
+        
+        candidates = (
+            select(Booking.id, Booking.ref_id, Booking.status)
+            .where(on_flight)
+            .cte("candidates")
+        )
+        
+        eligible = Booking.status == any_(bindparam(
+            "allowed_from", value=sorted(s.value for s in allowed_from), type_=ARRAY(String)
+        ))
+        if leg_event is not None:
+            latest_leg = (
+                select(BookingEvent.flight_id)
+                .where(BookingEvent.booking_id == Booking.id, BookingEvent.event_type == leg_event.value)
+                .order_by(BookingEvent.id.desc())
+                .limit(1)
+                .scalar_subquery()
+            )
+            eligible = and_(eligible, latest_leg == Booking.flight_ids[leg - leg_offset])
+        
+        first_leg = sorted(s.value for s in first_leg_from)
+        if first_leg:
+            eligible = or_(
+                eligible,
+                and_(
+                    Booking.status == any_(bindparam("first_leg_from", value=first_leg, type_=ARRAY(String))),
+                    leg == 1
+                )
+            )
+        
+        updated = (
             update(Booking)
-            .where(Booking.id == booking_id)
-            .values(flight_ids=flight_ids)
+            .where(on_flight, eligible)
+            .values(status=new_status.value)
+            .returning(Booking.id, Booking.status, Booking.updated_at)
+            .cte("updated")
         )
         
-        return result.rowcount > 0
+        event_insert = EventRepository.insert_from_select(
+            updated.c.id,
+            event_type,
+            location=location,
+            flight_id=flight_id,
+            flight_number=flight_number,
+            notes=notes
+        ).cte("inserted_events")
+        
+        result = await self.db.execute(
+            select(
+                candidates.c.ref_id,
+                candidates.c.status.label("previous_status"),
+                updated.c.status,
+                updated.c.updated_at,
+            )
+            .select_from(candidates.outerjoin(updated, updated.c.id == candidates.c.id))
+            .add_cte(event_insert)
+            .order_by(candidates.c.ref_id)
+        )
+        rows = result.all()
+        
+        logger.info(
+            f"Flight {flight_id}: {sum(1 for r in rows if r.status)} of {len(rows)} "
+            f"bookings updated to {new_status.value}"
+        )
+        return rows
     
-    async def ref_id_exists(self, ref_id: str) -> bool:
-        """Check if reference ID exists"""
+    async def get_status(self, ref_id: str) -> Optional[str]:
+        """Get the current status of a booking (archived ones included)"""
         result = await self.db.execute(
-            select(Booking.id).where(Booking.ref_id == ref_id)
+            select(Booking.status).where(Booking.ref_id == ref_id)
         )
-        return result.scalar_one_or_none() is not None
+        current = result.scalar_one_or_none()
+        if current is None:
+            current = await self.archive_repo.get_status(ref_id)
+        return current
     
-    async def get_recent_ref_ids(self, limit: int = 1000) -> set:
-        """Get recent reference IDs for collision check"""
+    async def reserve_ref_block(self) -> int:
+        """Reserve the next block of ref_id sequence values, returning its first value"""
+        return await self.db.scalar(select(booking_ref_seq.next_value()))
+    
+    @staticmethod
+    def apply_filters(stmt: Select, filters: Optional[BookingFilters]) -> Select:
+        """
+        Add WHERE clauses for the given filters
+        Each filter has a matching composite index leading with its column
+        (see migration 007), ending in (created_at, id) for keyset order
+        """
+        if filters is None:
+            return stmt
+        
+        if filters.status is not None:
+            stmt = stmt.where(Booking.status == filters.status.value)
+        if filters.origin:
+            stmt = stmt.where(Booking.origin == filters.origin)
+        if filters.destination:
+            stmt = stmt.where(Booking.destination == filters.destination)
+        if filters.created_from is not None:
+            stmt = stmt.where(Booking.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            stmt = stmt.where(Booking.created_at < filters.created_to)
+        if filters.flight_id is not None:
+            stmt = stmt.where(Booking.flight_ids.contains([filters.flight_id]))
+        
+        return stmt
+    
+    async def list_bookings(
+        self,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None,
+        filters: Optional[BookingFilters] = None
+    ) -> List[Booking]:
+        """
+        List recent bookings, newest first
+        - Keyset pagination on (created_at, id): after is the last row of the previous page
+        - Served by idx_bookings_created_at_id (or a filter index), so every page costs the same
+        """
+        stmt = self.apply_filters(select(Booking), filters)
+        if after is not None:
+            stmt = stmt.where(tuple_(Booking.created_at, Booking.id) < tuple_(*after))
+        
         result = await self.db.execute(
-            select(Booking.ref_id)
-            .order_by(Booking.created_at.desc())
+            stmt
+            .order_by(Booking.created_at.desc(), Booking.id.desc())
             .limit(limit)
         )
-        return {row[0] for row in result.fetchall()}
+        return result.scalars().all()
     
-    async def list_bookings(self, limit: int = 50, offset: int = 0) -> List[Booking]:
-        """List recent bookings"""
+    async def list_changes(self, limit: int, after: Optional[Tuple[int, int]] = None) -> List[Booking]:
+        """
+        Bookings written since a change feed position, oldest change first
+        - Ordered by (change_seq, id) and served by idx_bookings_change_seq_id
+        - Stops below the snapshot xmin: rows of still-running transactions
+          (which could commit with a lower change_seq) are never skipped
+        """
+        stmt = select(Booking).where(Booking.change_seq < visible_xact_horizon())
+        if after is not None:
+            stmt = stmt.where(tuple_(Booking.change_seq, Booking.id) > tuple_(*after))
+        
         result = await self.db.execute(
-            select(Booking)
-            .order_by(Booking.created_at.desc())
+            stmt
+            .order_by(Booking.change_seq, Booking.id)
             .limit(limit)
-            .offset(offset)
         )
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+    
+    async def stream_bookings(
+        self,
+        filters: Optional[BookingFilters] = None,
+        include_events: bool = False,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream booking rows matching the filters in batches, newest first
+        - Server-side cursor (stream + yield_per): at most batch_size rows are
+          held in memory, however many rows match
+        - include_events adds an ordered JSON events array per booking
+        """
+        columns = [*Booking.__table__.c]
+        if include_events:
+            columns.append(EventRepository.timeline_json(Booking.id).label("events"))
+        
+        stmt = (
+            self.apply_filters(select(*columns), filters)
+            .order_by(Booking.created_at.desc(), Booking.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        
+        result = await self.db.stream(stmt)
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
\ No newline at end of file
@@ -1,53 +1,86 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, insert, func, literal, literal_column, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.sql.expression import ColumnElement, Insert, ScalarSelect
+from typing import Any, Iterable, Optional, Type
+from app.core.db import Base
 from app.models.booking_event import BookingEvent
 from app.schemas.booking import EventType
-from app.core.logging import get_logger
 
-logger = get_logger(__name__)
+
+def json_object(columns: Iterable[ColumnElement]) -> ColumnElement:
+    """Build json_build_object('name', column, ...) over the given table columns"""
+    return func.json_build_object(
+        *[part for column in columns for part in (literal_column(f"'{column.name}'"), column)]
+    )
 
 
 class EventRepository:
-    """Repository for booking event database operations"""
-    
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    """
+    Booking event statements, built to run inside booking writes and reads
+    (events are never written or read on their own)
+    """
     
-    async def create(
-        self,
-        booking_id: int,
+    @staticmethod
+    def insert_from_select(
+        booking_id: ColumnElement,
         event_type: EventType,
-        location: Optional[str] = None,
-        flight_id: Optional[int] = None,
-        flight_number: Optional[str] = None,
-        notes: Optional[str] = None
-    ) -> BookingEvent:
-        """Create a new booking event"""
-        
-        event = BookingEvent(
-            booking_id=booking_id,
-            event_type=event_type.value,
-            location=location,
-            flight_id=flight_id,
-            flight_number=flight_number,
-            notes=notes
-        )
+        location: Any = None,
+        flight_id: Any = None,
+        flight_number: Any = None,
+        notes: Any = None
+    ) -> Insert:
+        """
+        Build an INSERT ... SELECT that records one event per selected booking
+        Fields may be plain values or SQL expressions over the same selectable
+        as booking_id, so the insert can be chained onto a data-modifying CTE.
+        """
         
-        self.db.add(event)
-        await self.db.flush()
-        await self.db.refresh(event)
+        def as_column(value: Any, type_) -> ColumnElement:
+            return value if isinstance(value, ColumnElement) else literal(value, type_)
         
-        logger.info(f"Event created: {event_type.value} for booking {booking_id}")
-        return event
+        return insert(BookingEvent).from_select(
+            ["booking_id", "event_type", "location", "flight_id", "flight_number", "notes"],
+            select(
+                booking_id,
+                literal(event_type.value, String),
+                as_column(location, String),
+                as_column(flight_id, Integer),
+                as_column(flight_number, String),
+                as_column(notes, Text),
+            )
+        )
     
-    async def get_by_booking_id(self, booking_id: int) -> List[BookingEvent]:
-        """Get all events for a booking, ordered chronologically"""
-        
-        result = await self.db.execute(
-            select(BookingEvent)
-            .where(BookingEvent.booking_id == booking_id)
-            .order_by(BookingEvent.created_at.asc())
+    @staticmethod
+    def timeline_json(
+        booking_id: ColumnElement,
+        after_event_id: Optional[int] = None,
+        events: Type[Base] = BookingEvent
+    ) -> ScalarSelect:
+        """
+        Build a correlated subquery aggregating a booking's events into a JSON array
+        Ordered chronologically; an empty array when the booking has no events
+        - after_event_id: only events recorded after that one (incremental fetch)
+        - events: the events table to read (BookingEventArchive for archived bookings)
+        """
+        event_json = json_object(
+            column for column in events.__table__.c if column.name != "booking_id"
         )
         
-        return result.scalars().all()
\ No newline at end of file
+        stmt = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(event_json, events.created_at, events.id)
+                    ),
+                    literal_column("'[]'::json"),
+                    type_=JSON
+                )
+            )
+            .where(events.booking_id == booking_id)
+            .correlate_except(events)
+        )
+        if after_event_id is not None:
+            # Ids follow insert order, and a booking's events are inserted one
+            # transition at a time (row lock), so "newer" is id > after_event_id
+            stmt = stmt.where(events.id > after_event_id)
+        return stmt.scalar_subquery()
\ No newline at end of file
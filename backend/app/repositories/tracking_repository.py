@@ -0,0 +1,78 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, bindparam, any_, literal_column, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlalchemy.sql.expression import CTE, Insert
+from typing import Any, List, Optional
+from app.models.booking import Booking
+from app.models.booking_tracking import BookingTracking
+from app.repositories.event_repository import EventRepository, json_object
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TrackingRepository:
+    """Repository for the booking_tracking read model"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def refresh(self, ref_ids: List[str]) -> None:
+        """
+        Re-render the tracking documents of the given bookings
+        - One INSERT ... SELECT ... ON CONFLICT upsert for all of them
+        - Must run after the write it reflects, in the same transaction:
+          a statement cannot see rows changed by its own CTEs
+        """
+        if not ref_ids:
+            return
+        
+        document = func.jsonb_build_object(
+            literal_column("'booking'"), json_object(Booking.__table__.c),
+            literal_column("'timeline'"), EventRepository.timeline_json(Booking.id),
+            type_=JSONB
+        )
+        
+        stmt = insert(BookingTracking).from_select(
+            ["ref_id", "booking_id", "status", "document"],
+            select(Booking.ref_id, Booking.id, Booking.status, document)
+            .where(Booking.ref_id == any_(bindparam("ref_ids", value=ref_ids, type_=ARRAY(String))))
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BookingTracking.ref_id],
+            set_={
+                "status": stmt.excluded.status,
+                "document": stmt.excluded.document,
+                "updated_at": func.now(),
+            }
+        )
+        
+        await self.db.execute(stmt)
+    
+    @staticmethod
+    def insert_created(bookings: CTE, events: CTE) -> Insert:
+        """
+        Build the tracking documents of bookings being created, from the
+        RETURNING rows of their INSERT CTEs (one BOOKED event each)
+        Same document as refresh renders, so creation stays one statement
+        """
+        document = func.jsonb_build_object(
+            literal_column("'booking'"), json_object(bookings.c),
+            literal_column("'timeline'"), func.json_build_array(
+                json_object(column for column in events.c if column.name != "booking_id")
+            ),
+            type_=JSONB
+        )
+        
+        return insert(BookingTracking).from_select(
+            ["ref_id", "booking_id", "status", "document"],
+            select(bookings.c.ref_id, bookings.c.id, bookings.c.status, document)
+            .join(events, events.c.booking_id == bookings.c.id)
+        )
+    
+    async def get_document(self, ref_id: str) -> Optional[dict[str, Any]]:
+        """Get the rendered tracking document for a booking (primary key lookup)"""
+        result = await self.db.execute(
+            select(BookingTracking.document).where(BookingTracking.ref_id == ref_id)
+        )
+        return result.scalar_one_or_none()
@@ -3,5 +3,6 @@ from app.routers.routes import router as routes_router
 from app.routers.health import router as health_router
 from app.routers.metrics import router as metrics_router
 from app.routers.auth import router as auth_router
+from app.routers.flights import router as flights_router
 
-__all__ = ["bookings_router", "routes_router", "health_router", "metrics_router", "auth_router"]
\ No newline at end of file
+__all__ = ["bookings_router", "routes_router", "health_router", "metrics_router", "auth_router", "flights_router"]
\ No newline at end of file
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.services.booking_service import BookingService
 from app.services.tracking_service import TrackingService
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
 from app.schemas.booking import (
     BookingCreate,
     BookingResponse,
@@ -10,8 +17,18 @@ from app.schemas.booking import (
     BookingDepartRequest,
     BookingArriveRequest,
     BookingDeliverRequest,
+    BookingFilters,
+    BookingChangesResponse,
+    BookingListResponse,
+    BookingLookupRequest,
+    BookingLookupResponse,
+    BulkBookingResponse,
+    ExportFormat,
 )
-from typing import List
+from typing import AsyncIterator, List, Optional, Union
+from app.core.config import settings
+from app.core.pubsub import event_broker
+from app.utils.conditional import is_conditional
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -46,28 +63,124 @@ async def create_booking(
         )
 
 
-@router.get("", response_model=List[BookingResponse])
+def _parse_bulk_csv(text: str) -> List[dict]:
+    """
+    Parse a CSV manifest into booking rows
+    Columns: origin, destination, pieces, weight_kg and optional flight_ids
+    (separated by ';' or spaces)
+    """
+    rows = []
+    for record in csv.DictReader(io.StringIO(text)):
+        row = {key.strip(): (value or "").strip() for key, value in record.items() if key}
+        flight_ids = row.pop("flight_ids", "")
+        if flight_ids:
+            row["flight_ids"] = flight_ids.replace(";", " ").split()
+        rows.append(row)
+    return rows
+
+
+@router.post("/bulk", response_model=BulkBookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_bookings_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many bookings in one request
+    - Accepts a JSON array of bookings or a CSV manifest (Content-Type: text/csv)
+    - All rows are validated first; nothing is created if any row is invalid
+    - Bookings and BOOKED events are inserted in a single statement
+    - Returns the ref_ids in input order
+    """
+    
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("text/csv"):
+            raw_rows = _parse_bulk_csv((await request.body()).decode("utf-8-sig"))
+        else:
+            raw_rows = await request.json()
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid bulk booking payload: {str(e)}"
+        )
+    
+    if not isinstance(raw_rows, list) or not raw_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a non-empty list of bookings"
+        )
+    
+    if len(raw_rows) > settings.BULK_BOOKING_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_BOOKING_MAX_ROWS} bookings per request"
+        )
+    
+    bookings = []
+    errors = []
+    for index, raw_row in enumerate(raw_rows):
+        try:
+            bookings.append(BookingCreate.model_validate(raw_row))
+        except ValidationError as e:
+            errors.append({"row": index, "errors": e.errors(include_url=False, include_context=False)})
+    
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors
+        )
+    
+    try:
+        service = BookingService(db)
+        result = await service.create_bookings(bookings)
+        return result
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk booking creation failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create bookings: {str(e)}"
+        )
+
+
+@router.get("", response_model=Union[BookingListResponse, BookingLookupResponse])
 async def list_bookings(
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = None,
+    filters: BookingFilters = Depends(),
+    ref_ids: Optional[str] = Query(None, description="Comma-separated reference IDs to get at once"),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    List bookings with pagination
+    List bookings with cursor pagination, newest first
     - limit: Number of results (default: 50, max: 100)
-    - offset: Number of results to skip (default: 0)
+    - cursor: next_cursor from the previous page (omit for the first page)
+    - Filters: status, origin, destination, created_from, created_to, flight_id
+    - ref_ids: get these bookings in one round trip instead (max
+      BOOKING_LOOKUP_MAX_IDS); results follow the request order and unknown
+      ref_ids have found=false
     """
     
+    if ref_ids is not None:
+        ids = [ref_id.strip() for ref_id in ref_ids.split(",") if ref_id.strip()]
+        if not ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ref_ids must contain at least one reference ID"
+            )
+        return await _lookup_bookings(ids, db)
+    
     try:
         # Enforce max limit
         limit = min(limit, 100)
         
-        from app.repositories.booking_repository import BookingRepository
-        repo = BookingRepository(db)
-        bookings = await repo.list_bookings(limit=limit, offset=offset)
-        
-        return [BookingResponse.model_validate(b) for b in bookings]
+        service = BookingService(db)
+        return await service.list_bookings(limit=limit, cursor=cursor, filters=filters)
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"List bookings failed: {e}")
         raise HTTPException(
@@ -76,16 +189,115 @@ async def list_bookings(
         )
 
 
+@router.get("/changes", response_model=BookingChangesResponse)
+async def list_booking_changes(
+    since: Optional[str] = Query(None, description="next_cursor from the previous call (omit to start from the beginning)"),
+    limit: int = Query(100, ge=1),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Change feed for incremental sync, oldest change first
+    - Returns every booking created or updated since the cursor
+    - Keep calling with next_cursor; has_more=false means caught up for now
+    - limit: Number of changes (default: 100, max: 1000)
+    """
+    
+    try:
+        limit = min(limit, 1000)
+        
+        service = BookingService(db)
+        return await service.list_changes(limit=limit, since=since)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"List booking changes failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list booking changes: {str(e)}"
+        )
+
+
+@router.get("/export")
+async def export_bookings(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv or ndjson"),
+    include_events: bool = Query(False, description="Add each booking's event timeline"),
+    filters: BookingFilters = Depends()
+):
+    """
+    Export every booking matching the filters as CSV or NDJSON, newest first
+    - Same filters as the list endpoint, without a row limit
+    - Streamed from a server-side cursor in EXPORT_BATCH_SIZE chunks: memory
+      stays flat and output starts right away, whatever the export size
+    - include_events adds an events column (JSON array in CSV)
+    """
+    
+    # Validate before streaming starts: errors after the headers can't be a 400
+    BookingService.validate_filters(filters)
+    
+    service = ExportService()
+    return StreamingResponse(
+        service.export_bookings(export_format, filters, include_events=include_events),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="bookings.{export_format.value}"',
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.post("/lookup", response_model=BookingLookupResponse)
+async def lookup_bookings_post(
+    request: BookingLookupRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get many bookings by reference ID, for lists too long for a query string"""
+    
+    return await _lookup_bookings([ref_id.strip() for ref_id in request.ref_ids], db)
+
+
+async def _lookup_bookings(ref_ids: List[str], db: AsyncSession) -> BookingLookupResponse:
+    try:
+        service = BookingService(db)
+        return await service.lookup_bookings(ref_ids)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Booking lookup failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to look up bookings: {str(e)}"
+        )
+
+
 @router.get("/{ref_id}", response_model=BookingResponse)
 async def get_booking(
     ref_id: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get booking details by reference ID"""
+    """
+    Get booking details by reference ID
+    - Sends ETag/Last-Modified; answers If-None-Match with 304 from the
+      cached validators without loading the booking
+    """
     
     try:
         service = BookingService(db)
+        
+        if is_conditional(request):
+            validators = await service.get_booking_validators(ref_id)
+            if validators and validators.is_fresh(request):
+                return validators.not_modified()
+        
         result = await service.get_booking(ref_id)
+        
+        validators = BookingService.booking_validators(result)
+        if validators.is_fresh(request):
+            return validators.not_modified()
+        response.headers.update(validators.headers())
         return result
     
     except HTTPException:
@@ -109,7 +321,7 @@ async def depart_booking(
     - Updates status to DEPARTED
     - Records departure location and optional flight info
     - Creates DEPARTED event in timeline
-    - Uses distributed locks to handle concurrent updates
+    - Atomic conditional update, safe under concurrent requests
     """
     
     try:
@@ -138,7 +350,7 @@ async def arrive_booking(
     - Updates status to ARRIVED
     - Records arrival location and optional flight info
     - Creates ARRIVED event in timeline
-    - Uses distributed locks to handle concurrent updates
+    - Atomic conditional update, safe under concurrent requests
     """
     
     try:
@@ -167,7 +379,7 @@ async def deliver_booking(
     - Only allowed if status is ARRIVED
     - Updates status to DELIVERED
     - Creates DELIVERED event in timeline
-    - Uses distributed locks to handle concurrent updates
+    - Atomic conditional update, safe under concurrent requests
     """
     
     try:
@@ -195,7 +407,7 @@ async def cancel_booking(
     - Only allowed if status is not ARRIVED
     - Updates status to CANCELLED
     - Creates CANCELLED event in timeline
-    - Uses distributed locks to handle concurrent updates
+    - Atomic conditional update, safe under concurrent requests
     """
     
     try:
@@ -213,20 +425,96 @@ async def cancel_booking(
         )
 
 
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _booking_event_stream(
+    request: Request,
+    ref_id: str,
+    queue: asyncio.Queue,
+    initial: dict
+) -> AsyncIterator[str]:
+    """Yield the initial status, then each published change, with heartbeats"""
+    try:
+        yield _sse("status", initial)
+        
+        while not await request.is_disconnected():
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield _sse("status", message)
+    finally:
+        event_broker.unsubscribe(ref_id, queue)
+
+
+@router.get("/{ref_id}/events/stream")
+async def stream_booking_events(
+    ref_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream booking status changes as Server-Sent Events
+    - First event carries the current status, then one `status` event per change
+    - Fed by the process-wide Redis subscriber; no polling per viewer
+    - Comment heartbeats keep idle connections open through proxies
+    """
+    
+    # Subscribe before reading the status so no change can slip in between
+    queue = event_broker.subscribe(ref_id)
+    try:
+        service = BookingService(db)
+        booking = await service.get_booking(ref_id)
+    except Exception:
+        event_broker.unsubscribe(ref_id, queue)
+        raise
+    
+    initial = {"ref_id": ref_id, "status": booking.status.value, "updated_at": booking.updated_at}
+    return StreamingResponse(
+        _booking_event_stream(request, ref_id, queue, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{ref_id}/history", response_model=BookingHistoryResponse)
 async def get_booking_history(
     ref_id: str,
+    request: Request,
+    response: Response,
+    after_event_id: Optional[int] = Query(None, ge=0, description="Only return events newer than this one"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get booking with full chronological event timeline
     - Returns booking details + all events ordered by time
     - Used by UI for tracking display
+    - after_event_id: id of the client's latest event; returns only newer events
+      (plus the current booking) for incremental polling
+    - Conditional like GET /{ref_id}: 304 while the booking and its latest event are unchanged
     """
     
     try:
         service = TrackingService(db)
+        
+        if after_event_id is not None:
+            return await service.get_booking_history(ref_id, after_event_id=after_event_id)
+        
+        if is_conditional(request):
+            validators = await service.get_history_validators(ref_id)
+            if validators and validators.is_fresh(request):
+                return validators.not_modified()
+        
         result = await service.get_booking_history(ref_id)
+        
+        validators = TrackingService.history_validators(result)
+        if validators.is_fresh(request):
+            return validators.not_modified()
+        response.headers.update(validators.headers())
         return result
     
     except HTTPException:
@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.db import get_db
+from app.services.booking_service import BookingService
+from app.schemas.booking import BookingStatus, FlightTransitionRequest, FlightTransitionResponse
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/flights", tags=["Flights"])
+
+
+@router.post("/{flight_id}/depart", response_model=FlightTransitionResponse)
+async def depart_flight(
+    flight_id: int,
+    request: Optional[FlightTransitionRequest] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Mark every eligible booking on a flight as DEPARTED
+    - Bookings are selected by flight_ids containing the flight
+    - Eligible: BOOKED on its first leg, or ARRIVED from the leg before this flight
+    - Location and flight number are taken from the flight
+    - One set-based update and event insert in a single transaction
+    - Returns the outcome for each booking on the flight
+    """
+    
+    try:
+        service = BookingService(db)
+        result = await service.transition_flight(
+            flight_id,
+            BookingStatus.DEPARTED,
+            notes=request.notes if request else None
+        )
+        return result
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Flight departure failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to depart flight: {str(e)}"
+        )
+
+
+@router.post("/{flight_id}/arrive", response_model=FlightTransitionResponse)
+async def arrive_flight(
+    flight_id: int,
+    request: Optional[FlightTransitionRequest] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Mark every eligible booking on a flight as ARRIVED
+    - Bookings are selected by flight_ids containing the flight
+    - Eligible: DEPARTED on this flight
+    - Location and flight number are taken from the flight
+    - One set-based update and event insert in a single transaction
+    - Returns the outcome for each booking on the flight
+    """
+    
+    try:
+        service = BookingService(db)
+        result = await service.transition_flight(
+            flight_id,
+            BookingStatus.ARRIVED,
+            notes=request.notes if request else None
+        )
+        return result
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Flight arrival failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to arrive flight: {str(e)}"
+        )
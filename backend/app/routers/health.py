@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.core.db import get_db
 from app.core.cache import cache
+from app.core.redis_client import redis_breaker
 from app.core.config import settings
 from app.core.logging import get_logger
 
@@ -53,4 +54,6 @@ async def detailed_health_check(db: AsyncSession = Depends(get_db)):
         health_status["checks"]["redis"] = "unhealthy"
         health_status["status"] = "degraded"
     
+    health_status["checks"]["redis_circuit"] = redis_breaker.state
+    
     return health_status
\ No newline at end of file
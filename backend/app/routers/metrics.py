@@ -3,6 +3,7 @@ from app.core.metrics import (
     bookings_created_total,
     bookings_departed_total,
     bookings_arrived_total,
+    bookings_delivered_total,
     bookings_cancelled_total,
     route_searches_total,
     cache_hits_total,
@@ -21,6 +22,7 @@ async def get_metrics_summary():
                 "created": int(bookings_created_total._value._value),
                 "departed": int(bookings_departed_total._value._value),
                 "arrived": int(bookings_arrived_total._value._value),
+                "delivered": int(bookings_delivered_total._value._value),
                 "cancelled": int(bookings_cancelled_total._value._value),
             },
             "routes": {
@@ -33,7 +35,7 @@ async def get_metrics_summary():
         }
     except Exception as e:
         return {
-            "bookings": {"created": 0, "departed": 0, "arrived": 0, "cancelled": 0},
+            "bookings": {"created": 0, "departed": 0, "arrived": 0, "delivered": 0, "cancelled": 0},
             "routes": {"searches": 0},
             "cache": {"hits": 0, "misses": 0}
         }
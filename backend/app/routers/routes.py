@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.services.route_service import RouteService
 from app.schemas.route import RouteRequest, RouteResponse
+from app.utils.conditional import is_conditional
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -28,6 +30,48 @@ async def search_routes(
         result = await service.search_routes(route_request)
         return result
     
+    except Exception as e:
+        logger.error(f"Route search failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search routes: {str(e)}"
+        )
+
+
+@router.get("/search", response_model=RouteResponse)
+async def search_routes_get(
+    origin: str,
+    destination: str,
+    departure_date: date,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search for routes (cacheable GET form of POST /search)
+    - Sends an ETag; If-None-Match is answered with 304 from the cached
+      validators without loading the result
+    """
+    
+    route_request = RouteRequest(origin=origin, destination=destination, departure_date=departure_date)
+    
+    try:
+        service = RouteService(db)
+        
+        if is_conditional(request):
+            validators = await service.get_route_validators(route_request)
+            if validators and validators.is_fresh(request):
+                await service.record_search(route_request)
+                return validators.not_modified()
+        
+        result = await service.search_routes(route_request)
+        
+        validators = RouteService.route_validators(result)
+        if validators.is_fresh(request):
+            return validators.not_modified()
+        response.headers.update(validators.headers())
+        return result
+    
     except Exception as e:
         logger.error(f"Route search failed: {e}")
         raise HTTPException(
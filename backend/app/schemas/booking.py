@@ -20,6 +20,11 @@ class EventType(str, Enum):
     CANCELLED = "CANCELLED"
 
 
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class BookingCreate(BaseModel):
     origin: str = Field(..., min_length=3, max_length=10, description="Origin airport code")
     destination: str = Field(..., min_length=3, max_length=10, description="Destination airport code")
@@ -33,6 +38,20 @@ class BookingCreate(BaseModel):
         return v.upper().strip()
 
 
+class BookingFilters(BaseModel):
+    status: Optional[BookingStatus] = Field(None, description="Current booking status")
+    origin: Optional[str] = Field(None, max_length=10, description="Origin airport code")
+    destination: Optional[str] = Field(None, max_length=10, description="Destination airport code")
+    created_from: Optional[datetime] = Field(None, description="Created at or after (inclusive)")
+    created_to: Optional[datetime] = Field(None, description="Created before (exclusive)")
+    flight_id: Optional[int] = Field(None, description="Booked on this flight")
+    
+    @field_validator('origin', 'destination')
+    @classmethod
+    def validate_airport_code(cls, v: Optional[str]) -> Optional[str]:
+        return v.upper().strip() if v else v
+
+
 class BookingUpdate(BaseModel):
     status: Optional[BookingStatus] = None
     flight_ids: Optional[List[int]] = None
@@ -91,6 +110,17 @@ class BookingResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class BookingListResponse(BaseModel):
+    items: List[BookingResponse]
+    next_cursor: Optional[str] = None
+
+
+class BookingChangesResponse(BaseModel):
+    items: List[BookingResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as since= on the next call; null until the first change")
+    has_more: bool = Field(..., description="More changes are available right now")
+
+
 class BookingEventResponse(BaseModel):
     id: int
     event_type: EventType
@@ -107,4 +137,44 @@ class BookingHistoryResponse(BaseModel):
     booking: BookingResponse
     timeline: List[BookingEventResponse]
     
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+
+class FlightTransitionRequest(BaseModel):
+    notes: Optional[str] = Field(None, description="Additional notes recorded on every event")
+
+
+class BookingTransitionOutcome(BaseModel):
+    ref_id: str
+    previous_status: BookingStatus
+    status: BookingStatus
+    transitioned: bool
+    detail: Optional[str] = None
+
+
+class FlightTransitionResponse(BaseModel):
+    flight_id: int
+    flight_number: str
+    status: BookingStatus
+    transitioned: int
+    skipped: int
+    outcomes: List[BookingTransitionOutcome]
+
+
+class BookingLookupRequest(BaseModel):
+    ref_ids: List[str] = Field(..., min_length=1, description="Reference IDs to look up")
+
+
+class BookingLookupResult(BaseModel):
+    ref_id: str
+    found: bool
+    booking: Optional[BookingResponse] = None
+
+
+class BookingLookupResponse(BaseModel):
+    results: List[BookingLookupResult]
+
+
+class BulkBookingResponse(BaseModel):
+    created: int
+    ref_ids: List[str]
@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.archive_repository import ArchiveRepository
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import bookings_archived_total
+
+logger = get_logger(__name__)
+
+
+class ArchiveService:
+    """Moves closed bookings out of the hot bookings/booking_events tables"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.archive_repo = ArchiveRepository(db)
+    
+    async def archive_closed_bookings(
+        self,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> int:
+        """
+        Archive DELIVERED/CANCELLED bookings closed more than older_than_days ago
+        - Moves ARCHIVE_BATCH_SIZE bookings per statement, committing each batch
+          so locks and transactions stay short
+        - Pauses ARCHIVE_BATCH_DELAY between batches to spare the database
+        - Each batch holds a Postgres advisory lock for its transaction; if
+          another worker holds it, this run stops
+        - Returns the number of bookings archived
+        """
+        older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        closed_before = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        
+        archived = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            if not await self.archive_repo.try_lock():
+                await self.db.rollback()
+                logger.info("Archival batch running in another worker, stopping")
+                break
+            
+            ref_ids = await self.archive_repo.archive_closed(closed_before, batch_size)
+            await self.db.commit()
+            if not ref_ids:
+                break
+            
+            archived += len(ref_ids)
+            batches += 1
+            bookings_archived_total.inc(len(ref_ids))
+            await asyncio.sleep(settings.ARCHIVE_BATCH_DELAY)
+        
+        logger.info(f"Archival: {archived} closed bookings older than {older_than_days} days archived")
+        return archived
\ No newline at end of file
@@ -1,32 +1,47 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
-from typing import Optional
+from dataclasses import asdict
+from typing import List, Optional
 from app.repositories.booking_repository import BookingRepository
-from app.repositories.event_repository import EventRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.tracking_repository import TrackingRepository
 from app.schemas.booking import (
     BookingCreate,
+    BookingFilters,
     BookingResponse,
     BookingStatus,
-    EventType,
     BookingDepartRequest,
     BookingArriveRequest,
     BookingDeliverRequest,
+    BookingChangesResponse,
+    BookingListResponse,
+    BookingLookupResponse,
+    BookingLookupResult,
+    BookingTransitionOutcome,
+    BulkBookingResponse,
+    FlightTransitionResponse,
 )
-from app.utils.ref_id_generator import generate_unique_ref_id
-from app.core.locks import lock_manager
+from app.services.booking_transitions import BOOKING_TRANSITIONS, FLIGHT_TRANSITIONS
+from app.utils.ref_id_generator import ref_id_allocator
+from app.utils.pagination import encode_cursor, decode_cursor, encode_change_cursor, decode_change_cursor
+from app.utils.conditional import Validators, cached_validators, validator_key
 from app.core.cache import cache
+from app.core.config import settings
+from app.core.pubsub import event_broker
+from app.services.event_writer import CommitOutcomeUnknown, event_writer
 from app.core.logging import get_logger
 from app.core.metrics import (
     bookings_created_total,
-    bookings_departed_total,
-    bookings_arrived_total,
-    bookings_cancelled_total,
     cache_hits_total,
     cache_misses_total,
 )
 
 logger = get_logger(__name__)
 
+# Sequence-backed ref_ids only collide with pre-existing random ones
+REF_ID_MAX_ATTEMPTS = 5
+
 
 class BookingService:
     """Service for booking business logic"""
@@ -34,14 +49,14 @@ class BookingService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.booking_repo = BookingRepository(db)
-        self.event_repo = EventRepository(db)
+        self.tracking_repo = TrackingRepository(db)
     
     async def create_booking(self, booking_data: BookingCreate) -> BookingResponse:
         """
         Create a new booking
-        - Generates unique ref_id
+        - Allocates ref_id from the sequence-backed allocator (no lookups)
         - Sets initial status to BOOKED
-        - Creates initial BOOKED event
+        - Creates initial BOOKED event in the same INSERT ... RETURNING statement
         """
         
         # Validate origin and destination are different
@@ -51,35 +66,22 @@ class BookingService:
                 detail="Origin and destination must be different"
             )
         
-        # Generate unique ref_id
-        existing_ids = await self.booking_repo.get_recent_ref_ids()
-        ref_id = generate_unique_ref_id(existing_ids)
-        
-        # Ensure uniqueness
-        max_retries = 10
-        for _ in range(max_retries):
-            if not await self.booking_repo.ref_id_exists(ref_id):
+        # Allocate ref_id; retry only if it hits a legacy random ref_id
+        for _ in range(REF_ID_MAX_ATTEMPTS):
+            [ref_id] = await ref_id_allocator.allocate(1, self.booking_repo.reserve_ref_block)
+            try:
+                # Insert booking, BOOKED event and tracking document in one round trip
+                booking = await self.booking_repo.create(booking_data, ref_id)
+                await self.db.commit()
                 break
-            ref_id = generate_unique_ref_id(existing_ids)
+            except IntegrityError as e:
+                await self._rollback_ref_id_collision(e)
         else:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to generate unique reference ID"
             )
         
-        # Create booking
-        booking = await self.booking_repo.create(booking_data, ref_id)
-        
-        # Create initial BOOKED event
-        await self.event_repo.create(
-            booking_id=booking.id,
-            event_type=EventType.BOOKED,
-            location=booking.origin,
-            notes="Booking created"
-        )
-        
-        await self.db.commit()
-        
         # Update metrics
         bookings_created_total.inc()
         
@@ -87,295 +89,278 @@ class BookingService:
         
         return BookingResponse.model_validate(booking)
     
-    async def depart_booking(
-        self,
-        ref_id: str,
-        depart_data: BookingDepartRequest
-    ) -> BookingResponse:
+    async def create_bookings(self, bookings: List[BookingCreate]) -> BulkBookingResponse:
         """
-        Mark booking as DEPARTED
-        - Uses distributed lock for concurrency control
-        - Validates current status
-        - Creates DEPARTED event
+        Create many bookings at once
+        - Allocates all ref_ids from the sequence-backed allocator
+        - Inserts bookings and BOOKED events in one statement and one commit
+        - Returns ref_ids in input order
         """
         
-        # Acquire distributed lock
-        lock = lock_manager.lock(f"booking:{ref_id}")
+        invalid_rows = [
+            index for index, booking_data in enumerate(bookings)
+            if booking_data.origin == booking_data.destination
+        ]
+        if invalid_rows:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Origin and destination must be different (rows: {invalid_rows})"
+            )
         
-        try:
-            async with lock:
-                # Get booking
-                booking = await self.booking_repo.get_by_ref_id(ref_id)
-                if not booking:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Booking not found: {ref_id}"
-                    )
-                
-                # Validate status transition
-                if booking.status == BookingStatus.CANCELLED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Cannot depart a cancelled booking"
-                    )
-                
-                if booking.status == BookingStatus.DEPARTED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Booking has already departed"
-                    )
-                
-                # Update status
-                await self.booking_repo.update_status(booking.id, BookingStatus.DEPARTED)
-                
-                # Create DEPARTED event
-                await self.event_repo.create(
-                    booking_id=booking.id,
-                    event_type=EventType.DEPARTED,
-                    location=depart_data.location,
-                    flight_id=depart_data.flight_id,
-                    flight_number=depart_data.flight_number,
-                    notes=depart_data.notes
-                )
-                
+        # Allocate ref_ids in bulk; retry only if one hits a legacy random ref_id
+        for _ in range(REF_ID_MAX_ATTEMPTS):
+            ref_ids = await ref_id_allocator.allocate(len(bookings), self.booking_repo.reserve_ref_block)
+            try:
+                await self.booking_repo.create_many(list(zip(ref_ids, bookings)))
                 await self.db.commit()
-                
-                # Invalidate cache
-                await cache.delete(f"booking:{ref_id}")
-                await cache.delete(f"booking_history:{ref_id}")
-                
-                # Update metrics
-                bookings_departed_total.inc()
-                
-                # Refresh booking
-                await self.db.refresh(booking)
-                
-                logger.info(f"Booking departed: {ref_id} from {depart_data.location}")
-                
-                return BookingResponse.model_validate(booking)
-        
-        except TimeoutError:
-            logger.error(f"Failed to acquire lock for booking: {ref_id}")
+                break
+            except IntegrityError as e:
+                await self._rollback_ref_id_collision(e)
+        else:
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Booking is being updated by another process. Please try again."
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to generate unique reference IDs"
             )
+        
+        # Update metrics
+        bookings_created_total.inc(len(bookings))
+        
+        logger.info(f"Bulk booking created successfully: {len(bookings)} bookings")
+        
+        return BulkBookingResponse(created=len(ref_ids), ref_ids=ref_ids)
     
-    async def arrive_booking(
+    async def _rollback_ref_id_collision(self, error: IntegrityError) -> None:
+        """Roll back an insert that collided on ref_id; re-raise any other integrity error"""
+        await self.db.rollback()
+        if "ref_id" not in str(error.orig):
+            raise error
+        logger.warning("Allocated ref_id collided with an existing booking, retrying")
+    
+    @staticmethod
+    def booking_cache_keys(ref_id: str) -> List[str]:
+        """Cache keys holding views of a booking (and their validators)"""
+        keys = [f"booking:{ref_id}", f"booking_history:{ref_id}"]
+        return keys + [validator_key(key) for key in keys]
+    
+    @staticmethod
+    def booking_validators(booking: BookingResponse) -> Validators:
+        """ETag/Last-Modified of a booking: every status change bumps updated_at"""
+        return Validators.build(
+            "booking", booking.ref_id, booking.status, booking.updated_at.isoformat(),
+            modified_at=booking.updated_at
+        )
+    
+    async def transition_booking(
         self,
         ref_id: str,
-        arrive_data: BookingArriveRequest
+        target: BookingStatus,
+        location: Optional[str] = None,
+        flight_id: Optional[int] = None,
+        flight_number: Optional[str] = None,
+        notes: Optional[str] = None
     ) -> BookingResponse:
         """
-        Mark booking as ARRIVED
-        - Uses distributed lock for concurrency control
-        - Validates current status
-        - Creates ARRIVED event
+        Move a booking to the target status using BOOKING_TRANSITIONS
+        - Status check, update and event insert are one atomic statement
+        - One commit, then one batched cache invalidation
+        - With EVENT_GROUP_COMMIT_ENABLED the statement joins the event writer's
+          next group commit instead of committing on its own
+        - The current status is only read when the transition is rejected
         """
+        transition = BOOKING_TRANSITIONS[target]
         
-        # Acquire distributed lock
-        lock = lock_manager.lock(f"booking:{ref_id}")
+        transition_args = dict(
+            allowed_from=transition.allowed_from,
+            event_type=transition.event_type,
+            location=location,
+            flight_id=flight_id,
+            flight_number=flight_number,
+            notes=notes if notes is not None else transition.default_notes
+        )
         
-        try:
-            async with lock:
-                # Get booking
-                booking = await self.booking_repo.get_by_ref_id(ref_id)
-                if not booking:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Booking not found: {ref_id}"
-                    )
-                
-                # Validate status transition
-                if booking.status == BookingStatus.CANCELLED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Cannot arrive a cancelled booking"
-                    )
-                
-                if booking.status == BookingStatus.ARRIVED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Booking has already arrived"
-                    )
-                
-                # Update status
-                await self.booking_repo.update_status(booking.id, BookingStatus.ARRIVED)
-                
-                # Create ARRIVED event
-                await self.event_repo.create(
-                    booking_id=booking.id,
-                    event_type=EventType.ARRIVED,
-                    location=arrive_data.location,
-                    flight_id=arrive_data.flight_id,
-                    flight_number=arrive_data.flight_number,
-                    notes=arrive_data.notes
+        if settings.EVENT_GROUP_COMMIT_ENABLED:
+            # Committed (with the tracking refresh) by the time it returns
+            try:
+                booking = await event_writer.transition(ref_id, transition.target, **transition_args)
+            except CommitOutcomeUnknown:
+                # The transition may have been applied - drop cached copies either way
+                await cache.delete_many(self.booking_cache_keys(ref_id))
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Could not confirm the update of booking {ref_id}; check its status before retrying"
                 )
-                
+        else:
+            booking = await self.booking_repo.transition_status(ref_id, transition.target, **transition_args)
+            if booking is not None:
+                await self.tracking_repo.refresh([ref_id])
                 await self.db.commit()
-                
-                # Invalidate cache
-                await cache.delete(f"booking:{ref_id}")
-                await cache.delete(f"booking_history:{ref_id}")
-                
-                # Update metrics
-                bookings_arrived_total.inc()
-                
-                # Refresh booking
-                await self.db.refresh(booking)
-                
-                logger.info(f"Booking arrived: {ref_id} at {arrive_data.location}")
-                
-                return BookingResponse.model_validate(booking)
-        
-        except TimeoutError:
-            logger.error(f"Failed to acquire lock for booking: {ref_id}")
+        
+        if booking is None:
+            current_status = await self.booking_repo.get_status(ref_id)
+            if current_status is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Booking not found: {ref_id}"
+                )
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Booking is being updated by another process. Please try again."
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=transition.rejection_for(current_status)
             )
+        
+        # Invalidate cache
+        await cache.delete_many(self.booking_cache_keys(ref_id))
+        
+        # Notify live viewers
+        await event_broker.publish([{
+            "ref_id": ref_id,
+            "status": booking.status,
+            "event_type": transition.event_type.value,
+            "updated_at": booking.updated_at,
+        }])
+        
+        # Update metrics
+        if transition.metric:
+            transition.metric.inc()
+        
+        logger.info(f"Booking {ref_id} transitioned to {target.value}")
+        
+        return BookingResponse.model_validate(booking)
+    
+    async def depart_booking(
+        self,
+        ref_id: str,
+        depart_data: BookingDepartRequest
+    ) -> BookingResponse:
+        """Mark booking as DEPARTED"""
+        return await self.transition_booking(
+            ref_id,
+            BookingStatus.DEPARTED,
+            location=depart_data.location,
+            flight_id=depart_data.flight_id,
+            flight_number=depart_data.flight_number,
+            notes=depart_data.notes
+        )
+    
+    async def arrive_booking(
+        self,
+        ref_id: str,
+        arrive_data: BookingArriveRequest
+    ) -> BookingResponse:
+        """Mark booking as ARRIVED"""
+        return await self.transition_booking(
+            ref_id,
+            BookingStatus.ARRIVED,
+            location=arrive_data.location,
+            flight_id=arrive_data.flight_id,
+            flight_number=arrive_data.flight_number,
+            notes=arrive_data.notes
+        )
     
     async def deliver_booking(
         self,
         ref_id: str,
         deliver_data: BookingDeliverRequest
     ) -> BookingResponse:
-        """
-        Mark booking as DELIVERED
-        - Uses distributed lock for concurrency control
-        - Validates current status (must be ARRIVED)
-        - Creates DELIVERED event
-        """
-        
-        # Acquire distributed lock
-        lock = lock_manager.lock(f"booking:{ref_id}")
-        
-        try:
-            async with lock:
-                # Get booking
-                booking = await self.booking_repo.get_by_ref_id(ref_id)
-                if not booking:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Booking not found: {ref_id}"
-                    )
-                
-                # Validate status transition
-                if booking.status == BookingStatus.CANCELLED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Cannot deliver a cancelled booking"
-                    )
-                
-                if booking.status == BookingStatus.DELIVERED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Booking has already been delivered"
-                    )
-                
-                if booking.status != BookingStatus.ARRIVED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Booking must be ARRIVED before it can be delivered"
-                    )
-                
-                # Update status
-                await self.booking_repo.update_status(booking.id, BookingStatus.DELIVERED)
-                
-                # Create DELIVERED event
-                await self.event_repo.create(
-                    booking_id=booking.id,
-                    event_type=EventType.DELIVERED,
-                    location=deliver_data.location,
-                    notes=deliver_data.notes
-                )
-                
-                await self.db.commit()
-                
-                # Invalidate cache
-                await cache.delete(f"booking:{ref_id}")
-                await cache.delete(f"booking_history:{ref_id}")
-                
-                # Refresh booking
-                await self.db.refresh(booking)
-                
-                logger.info(f"Booking delivered: {ref_id} at {deliver_data.location}")
-                
-                return BookingResponse.model_validate(booking)
-        
-        except TimeoutError:
-            logger.error(f"Failed to acquire lock for booking: {ref_id}")
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Booking is being updated by another process. Please try again."
-            )
+        """Mark booking as DELIVERED (only allowed from ARRIVED)"""
+        return await self.transition_booking(
+            ref_id,
+            BookingStatus.DELIVERED,
+            location=deliver_data.location,
+            notes=deliver_data.notes
+        )
     
     async def cancel_booking(self, ref_id: str) -> BookingResponse:
+        """Cancel a booking (not allowed once ARRIVED or DELIVERED)"""
+        return await self.transition_booking(ref_id, BookingStatus.CANCELLED)
+    
+    async def transition_flight(
+        self,
+        flight_id: int,
+        target: BookingStatus,
+        notes: Optional[str] = None
+    ) -> FlightTransitionResponse:
         """
-        Cancel a booking
-        - Can only cancel if status is not ARRIVED
-        - Uses distributed lock for concurrency control
-        - Creates CANCELLED event
+        Move every eligible booking on a flight to DEPARTED or ARRIVED
+        - Eligibility follows FLIGHT_TRANSITIONS: depart from BOOKED on the first
+          leg or ARRIVED from the previous leg, arrive from DEPARTED on this
+          flight, never from DELIVERED
+        - Location is the flight's origin (depart) or destination (arrive)
+        - One set-based statement, one commit, one cache invalidation
+        - Reports an outcome per booking on the flight
         """
+        flight = await FlightRepository(self.db).get_by_id(flight_id)
+        if not flight:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Flight not found: {flight_id}"
+            )
         
-        # Acquire distributed lock
-        lock = lock_manager.lock(f"booking:{ref_id}")
+        transition = FLIGHT_TRANSITIONS[target]
+        location = flight.origin if target == BookingStatus.DEPARTED else flight.destination
         
-        try:
-            async with lock:
-                # Get booking
-                booking = await self.booking_repo.get_by_ref_id(ref_id)
-                if not booking:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Booking not found: {ref_id}"
-                    )
-                
-                # Validate cancellation is allowed
-                if booking.status == BookingStatus.ARRIVED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Cannot cancel a booking that has already arrived"
-                    )
-                
-                if booking.status == BookingStatus.CANCELLED.value:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Booking is already cancelled"
-                    )
-                
-                # Update status
-                await self.booking_repo.update_status(booking.id, BookingStatus.CANCELLED)
-                
-                # Create CANCELLED event
-                await self.event_repo.create(
-                    booking_id=booking.id,
-                    event_type=EventType.CANCELLED,
-                    notes="Booking cancelled by user"
-                )
-                
-                await self.db.commit()
-                
-                # Invalidate cache
-                await cache.delete(f"booking:{ref_id}")
-                await cache.delete(f"booking_history:{ref_id}")
-                
-                # Update metrics
-                bookings_cancelled_total.inc()
-                
-                # Refresh booking
-                await self.db.refresh(booking)
-                
-                logger.info(f"Booking cancelled: {ref_id}")
-                
-                return BookingResponse.model_validate(booking)
-        
-        except TimeoutError:
-            logger.error(f"Failed to acquire lock for booking: {ref_id}")
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Booking is being updated by another process. Please try again."
+        rows = await self.booking_repo.transition_by_flight(
+            flight_id,
+            transition.target,
+            allowed_from=transition.allowed_from,
+            event_type=transition.event_type,
+            first_leg_from=transition.first_leg_from,
+            leg_event=transition.leg_event,
+            leg_offset=transition.leg_offset,
+            location=location,
+            flight_number=flight.flight_number,
+            notes=notes
+        )
+        
+        transitioned_rows = [row for row in rows if row.status is not None]
+        transitioned = [row.ref_id for row in transitioned_rows]
+        
+        await self.tracking_repo.refresh(transitioned)
+        await self.db.commit()
+        
+        # Invalidate cache
+        await cache.delete_many([
+            key for ref_id in transitioned for key in self.booking_cache_keys(ref_id)
+        ])
+        
+        # Notify live viewers
+        await event_broker.publish([
+            {
+                "ref_id": row.ref_id,
+                "status": row.status,
+                "event_type": transition.event_type.value,
+                "updated_at": row.updated_at,
+            }
+            for row in transitioned_rows
+        ])
+        
+        # Update metrics
+        if transition.metric and transitioned:
+            transition.metric.inc(len(transitioned))
+        
+        outcomes = [
+            BookingTransitionOutcome(
+                ref_id=row.ref_id,
+                previous_status=row.previous_status,
+                status=row.status or row.previous_status,
+                transitioned=row.status is not None,
+                detail=None if row.status is not None else transition.rejection_for(row.previous_status)
             )
+            for row in rows
+        ]
+        
+        logger.info(
+            f"Flight {flight.flight_number} ({flight_id}): {len(transitioned)} bookings "
+            f"transitioned to {target.value}, {len(rows) - len(transitioned)} skipped"
+        )
+        
+        return FlightTransitionResponse(
+            flight_id=flight_id,
+            flight_number=flight.flight_number,
+            status=target,
+            transitioned=len(transitioned),
+            skipped=len(rows) - len(transitioned),
+            outcomes=outcomes
+        )
     
     async def get_booking(self, ref_id: str) -> BookingResponse:
         """Get booking by reference ID with caching"""
@@ -400,12 +385,141 @@ class BookingService:
         
         response = BookingResponse.model_validate(booking)
         
-        # Cache the result
-        await cache.set(cache_key, response.model_dump(), ttl=300)
+        # Cache the result with its validators for conditional requests
+        await cache.set_many({
+            cache_key: response.model_dump(),
+            validator_key(cache_key): asdict(self.booking_validators(response)),
+        }, ttl=300)
         
         return response
     
-    async def list_bookings(self, limit: int = 50, offset: int = 0) -> list[BookingResponse]:
-        """List recent bookings"""
-        bookings = await self.booking_repo.list_bookings(limit, offset)
-        return [BookingResponse.model_validate(b) for b in bookings]
\ No newline at end of file
+    async def get_booking_validators(self, ref_id: str) -> Optional[Validators]:
+        """Cached validators of a booking, without loading the booking"""
+        return await cached_validators(f"booking:{ref_id}")
+    
+    async def lookup_bookings(self, ref_ids: List[str]) -> BookingLookupResponse:
+        """
+        Get many bookings by reference ID
+        - One cache MGET, one ref_id = ANY(...) query for the misses,
+          one pipelined cache fill
+        - Results follow the input order (deduplicated), with found=False
+          for unknown ref_ids
+        """
+        # Deduplicate while keeping the caller's order
+        unique_ids = list(dict.fromkeys(ref_ids))
+        if len(unique_ids) > settings.BOOKING_LOOKUP_MAX_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.BOOKING_LOOKUP_MAX_IDS} ref_ids per lookup"
+            )
+        
+        cached = await cache.get_many([f"booking:{ref_id}" for ref_id in unique_ids])
+        found = {
+            ref_id: BookingResponse(**value)
+            for ref_id, value in zip(unique_ids, cached)
+            if value
+        }
+        
+        misses = [ref_id for ref_id in unique_ids if ref_id not in found]
+        cache_hits_total.labels(cache_type='booking').inc(len(found))
+        if misses:
+            cache_misses_total.labels(cache_type='booking').inc(len(misses))
+            
+            loaded = {
+                booking.ref_id: BookingResponse.model_validate(booking)
+                for booking in await self.booking_repo.get_many_by_ref_ids(misses)
+            }
+            found.update(loaded)
+            
+            # Same entries as get_booking, validators included
+            entries = {}
+            for ref_id, booking in loaded.items():
+                entries[f"booking:{ref_id}"] = booking.model_dump()
+                entries[validator_key(f"booking:{ref_id}")] = asdict(self.booking_validators(booking))
+            await cache.set_many(entries, ttl=300)
+        
+        return BookingLookupResponse(results=[
+            BookingLookupResult(
+                ref_id=ref_id,
+                found=ref_id in found,
+                booking=found.get(ref_id)
+            )
+            for ref_id in unique_ids
+        ])
+    
+    @staticmethod
+    def validate_filters(filters: Optional[BookingFilters]) -> None:
+        """Reject filter combinations that can never match (400)"""
+        if (
+            filters is not None
+            and filters.created_from is not None
+            and filters.created_to is not None
+            and filters.created_from >= filters.created_to
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="created_from must be earlier than created_to"
+            )
+    
+    async def list_bookings(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        filters: Optional[BookingFilters] = None
+    ) -> BookingListResponse:
+        """
+        List recent bookings a page at a time
+        - cursor is the next_cursor of the previous page (with the same filters)
+        - next_cursor is None on the last page
+        """
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        self.validate_filters(filters)
+        
+        # Fetch one extra row to know whether another page exists
+        bookings = await self.booking_repo.list_bookings(limit + 1, after, filters)
+        page = bookings[:limit]
+        
+        next_cursor = None
+        if len(bookings) > limit:
+            next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+        
+        return BookingListResponse(
+            items=[BookingResponse.model_validate(b) for b in page],
+            next_cursor=next_cursor
+        )
+    
+    async def list_changes(self, limit: int = 100, since: Optional[str] = None) -> BookingChangesResponse:
+        """
+        Change feed for downstream mirrors
+        - Each booking appears once per write, with its state as of the read
+        - next_cursor resumes exactly after the last returned change; when
+          nothing changed it echoes since, so consumers can poll with it
+        """
+        try:
+            after = decode_change_cursor(since) if since else None
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        # Fetch one extra row to know whether to keep paging
+        bookings = await self.booking_repo.list_changes(limit + 1, after)
+        page = bookings[:limit]
+        
+        next_cursor = since
+        if page:
+            next_cursor = encode_change_cursor(page[-1].change_seq, page[-1].id)
+        
+        return BookingChangesResponse(
+            items=[BookingResponse.model_validate(b) for b in page],
+            next_cursor=next_cursor,
+            has_more=len(bookings) > limit
+        )
\ No newline at end of file
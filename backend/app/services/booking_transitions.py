@@ -0,0 +1,127 @@
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+from prometheus_client import Counter
+from app.schemas.booking import BookingStatus, EventType
+from app.core.metrics import (
+    bookings_departed_total,
+    bookings_arrived_total,
+    bookings_delivered_total,
+    bookings_cancelled_total,
+)
+
+
+@dataclass(frozen=True)
+class Transition:
+    """A booking status change, the states it may start from and its side effects"""
+    
+    target: BookingStatus
+    allowed_from: FrozenSet[BookingStatus]
+    event_type: EventType
+    metric: Optional[Counter] = None
+    # Error message per rejected source status, with a fallback for the rest
+    rejections: Dict[BookingStatus, str] = field(default_factory=dict)
+    default_rejection: str = "Invalid status transition"
+    default_notes: Optional[str] = None
+    # Flight-level transitions only (see FLIGHT_TRANSITIONS):
+    # - first_leg_from: also allowed from these when the flight is the booking's first leg
+    # - allowed_from then additionally requires the booking's latest leg_event
+    #   to be on the leg leg_offset places before this flight (0: this flight)
+    first_leg_from: FrozenSet[BookingStatus] = frozenset()
+    leg_event: Optional[EventType] = None
+    leg_offset: int = 0
+    
+    def rejection_for(self, current_status: str) -> str:
+        """Error message for a booking stuck in current_status"""
+        return self.rejections.get(BookingStatus(current_status), self.default_rejection)
+
+
+# DELIVERED and CANCELLED are terminal: no transition starts from them, which
+# is what lets archival move closed bookings out of the hot tables
+BOOKING_TRANSITIONS: Dict[BookingStatus, Transition] = {
+    BookingStatus.DEPARTED: Transition(
+        target=BookingStatus.DEPARTED,
+        allowed_from=frozenset({BookingStatus.BOOKED, BookingStatus.ARRIVED}),
+        event_type=EventType.DEPARTED,
+        metric=bookings_departed_total,
+        rejections={
+            BookingStatus.CANCELLED: "Cannot depart a cancelled booking",
+            BookingStatus.DEPARTED: "Booking has already departed",
+            BookingStatus.DELIVERED: "Cannot depart a delivered booking",
+        },
+    ),
+    BookingStatus.ARRIVED: Transition(
+        target=BookingStatus.ARRIVED,
+        allowed_from=frozenset({BookingStatus.BOOKED, BookingStatus.DEPARTED}),
+        event_type=EventType.ARRIVED,
+        metric=bookings_arrived_total,
+        rejections={
+            BookingStatus.CANCELLED: "Cannot arrive a cancelled booking",
+            BookingStatus.ARRIVED: "Booking has already arrived",
+            BookingStatus.DELIVERED: "Cannot arrive a delivered booking",
+        },
+    ),
+    BookingStatus.DELIVERED: Transition(
+        target=BookingStatus.DELIVERED,
+        allowed_from=frozenset({BookingStatus.ARRIVED}),
+        event_type=EventType.DELIVERED,
+        metric=bookings_delivered_total,
+        rejections={
+            BookingStatus.CANCELLED: "Cannot deliver a cancelled booking",
+            BookingStatus.DELIVERED: "Booking has already been delivered",
+        },
+        default_rejection="Booking must be ARRIVED before it can be delivered",
+    ),
+    BookingStatus.CANCELLED: Transition(
+        target=BookingStatus.CANCELLED,
+        allowed_from=frozenset({BookingStatus.BOOKED, BookingStatus.DEPARTED}),
+        event_type=EventType.CANCELLED,
+        metric=bookings_cancelled_total,
+        rejections={
+            BookingStatus.ARRIVED: "Cannot cancel a booking that has already arrived",
+            BookingStatus.CANCELLED: "Booking is already cancelled",
+            BookingStatus.DELIVERED: "Cannot cancel a delivered booking",
+        },
+        default_notes="Booking cancelled by user",
+    ),
+}
+
+
+# Bulk transitions of every booking on a flight. Stricter than the single-booking
+# rules, and tied to the booking's legs (its flight_ids, in order), so that a
+# flight-wide call or its retry never moves a booking backwards or onto the
+# wrong leg:
+# - depart: BOOKED on its first leg, or ARRIVED from the leg before this one
+# - arrive: DEPARTED on this flight
+FLIGHT_TRANSITIONS: Dict[BookingStatus, Transition] = {
+    BookingStatus.DEPARTED: Transition(
+        target=BookingStatus.DEPARTED,
+        allowed_from=frozenset({BookingStatus.ARRIVED}),
+        first_leg_from=frozenset({BookingStatus.BOOKED}),
+        leg_event=EventType.ARRIVED,
+        leg_offset=1,
+        event_type=EventType.DEPARTED,
+        metric=bookings_departed_total,
+        rejections={
+            BookingStatus.CANCELLED: "Cannot depart a cancelled booking",
+            BookingStatus.DEPARTED: "Booking has already departed",
+            BookingStatus.BOOKED: "Booking has not flown its earlier legs",
+            BookingStatus.ARRIVED: "Booking has not arrived from the leg before this flight",
+            BookingStatus.DELIVERED: "Booking has already been delivered",
+        },
+    ),
+    BookingStatus.ARRIVED: Transition(
+        target=BookingStatus.ARRIVED,
+        allowed_from=frozenset({BookingStatus.DEPARTED}),
+        leg_event=EventType.DEPARTED,
+        leg_offset=0,
+        event_type=EventType.ARRIVED,
+        metric=bookings_arrived_total,
+        rejections={
+            BookingStatus.CANCELLED: "Cannot arrive a cancelled booking",
+            BookingStatus.BOOKED: "Booking has not departed yet",
+            BookingStatus.DEPARTED: "Booking did not depart on this flight",
+            BookingStatus.ARRIVED: "Booking has already arrived",
+            BookingStatus.DELIVERED: "Booking has already been delivered",
+        },
+    ),
+}
@@ -0,0 +1,190 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.tracking_repository import TrackingRepository
+from app.schemas.booking import BookingStatus, EventType
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.core.metrics import event_group_commit_batch_size, event_group_commit_fallbacks_total
+
+logger = get_logger(__name__)
+
+
+class CommitOutcomeUnknown(Exception):
+    """session.commit() failed, so the batch may or may not have been applied"""
+    pass
+
+
+@dataclass
+class PendingTransition:
+    """A transition waiting for the next group commit"""
+    ref_id: str
+    new_status: BookingStatus
+    allowed_from: Iterable[BookingStatus]
+    event_type: EventType
+    location: Optional[str] = None
+    flight_id: Optional[int] = None
+    flight_number: Optional[str] = None
+    notes: Optional[str] = None
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class GroupCommitEventWriter:
+    """
+    Group commit for booking transitions and their events
+    - Concurrent requests queue their transitions; one flusher runs up to
+      max_batch of them in a single transaction, refreshes their tracking
+      documents in one statement and commits once (one WAL flush)
+    - A batch closes when full or max_delay after its first transition
+    - Callers resume only after the commit is durable
+    - If a statement in a batch fails, its transitions are retried one per
+      transaction so a single bad request cannot fail the others
+    - If the commit itself fails the batch may already be applied, so it is
+      not re-executed; every caller gets CommitOutcomeUnknown instead
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        max_batch: Optional[int] = None,
+        max_delay: Optional[float] = None
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch or settings.EVENT_GROUP_COMMIT_MAX_BATCH
+        self.max_delay = settings.EVENT_GROUP_COMMIT_MAX_DELAY if max_delay is None else max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+    
+    async def transition(
+        self,
+        ref_id: str,
+        new_status: BookingStatus,
+        allowed_from: Iterable[BookingStatus],
+        event_type: EventType,
+        location: Optional[str] = None,
+        flight_id: Optional[int] = None,
+        flight_number: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> Optional[Row]:
+        """
+        Same contract as BookingRepository.transition_status, committed
+        Returns the updated booking row, or None if the transition was not allowed
+        """
+        pending = PendingTransition(
+            ref_id=ref_id,
+            new_status=new_status,
+            allowed_from=list(allowed_from),
+            event_type=event_type,
+            location=location,
+            flight_id=flight_id,
+            flight_number=flight_number,
+            notes=notes
+        )
+        
+        if self._flusher is None or self._flusher.done():
+            self._queue = asyncio.Queue()
+            self._flusher = asyncio.create_task(self._run())
+        self._queue.put_nowait(pending)
+        
+        return await pending.future
+    
+    async def _run(self) -> None:
+        """Collect batches and flush them, one transaction at a time"""
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            first = await self._queue.get()
+            if first is None:
+                return
+            
+            batch = [first]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if pending is None:
+                    closing = True
+                    break
+                batch.append(pending)
+            
+            await self._flush(batch)
+    
+    async def _flush(self, batch: List[PendingTransition]) -> None:
+        try:
+            results = await self._commit(batch)
+        except CommitOutcomeUnknown as e:
+            logger.error(f"Commit of {len(batch)} transitions failed: {e.__cause__}")
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+        except Exception as e:
+            event_group_commit_fallbacks_total.inc()
+            logger.warning(f"Group commit of {len(batch)} transitions failed, retrying singly: {e}")
+            await self._flush_singly(batch)
+            return
+        
+        event_group_commit_batch_size.observe(len(batch))
+        for pending, row in zip(batch, results):
+            if not pending.future.done():
+                pending.future.set_result(row)
+    
+    async def _flush_singly(self, batch: List[PendingTransition]) -> None:
+        for pending in batch:
+            try:
+                row = (await self._commit([pending]))[0]
+            except Exception as e:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+                continue
+            if not pending.future.done():
+                pending.future.set_result(row)
+    
+    async def _commit(self, batch: List[PendingTransition]) -> List[Optional[Row]]:
+        """Run the transitions in order in one transaction and commit"""
+        async with self.session_factory() as session:
+            booking_repo = BookingRepository(session)
+            results = []
+            for pending in batch:
+                results.append(await booking_repo.transition_status(
+                    pending.ref_id,
+                    pending.new_status,
+                    allowed_from=pending.allowed_from,
+                    event_type=pending.event_type,
+                    location=pending.location,
+                    flight_id=pending.flight_id,
+                    flight_number=pending.flight_number,
+                    notes=pending.notes
+                ))
+            
+            transitioned = list(dict.fromkeys(
+                pending.ref_id for pending, row in zip(batch, results) if row is not None
+            ))
+            await TrackingRepository(session).refresh(transitioned)
+            try:
+                await session.commit()
+            except Exception as e:
+                raise CommitOutcomeUnknown(str(e)) from e
+        
+        return results
+    
+    async def close(self) -> None:
+        """Stop the flusher once the transitions queued so far are committed"""
+        if self._flusher is None or self._flusher.done():
+            return
+        
+        self._queue.put_nowait(None)
+        await self._flusher
+        self._flusher = None
+
+
+event_writer = GroupCommitEventWriter()
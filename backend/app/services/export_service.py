@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Optional, Sequence
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.booking_repository import BookingRepository
+from app.schemas.booking import BookingFilters, ExportFormat
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.core.metrics import bookings_exported_total
+
+logger = get_logger(__name__)
+
+EXPORT_COLUMNS = [
+    "id", "ref_id", "origin", "destination", "pieces", "weight_kg",
+    "status", "flight_ids", "created_at", "updated_at"
+]
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+class ExportService:
+    """
+    Streams bookings as CSV or NDJSON
+    - Runs on its own session, opened when the response body starts and held
+      for the whole transfer, independent of the request's session
+    - Rows come from a server-side cursor one batch at a time and each batch
+      is yielded as one chunk, so memory stays flat and the client receives
+      data as soon as the first batch is read
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        batch_size: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    
+    async def export_bookings(
+        self,
+        export_format: ExportFormat,
+        filters: Optional[BookingFilters] = None,
+        include_events: bool = False
+    ) -> AsyncIterator[str]:
+        """Yield the export in chunks of up to batch_size bookings"""
+        columns = EXPORT_COLUMNS + (["events"] if include_events else [])
+        if export_format == ExportFormat.CSV:
+            yield self._csv_chunk([columns])
+        
+        exported = 0
+        try:
+            async with self.session_factory() as session:
+                batches = BookingRepository(session).stream_bookings(
+                    filters, include_events=include_events, batch_size=self.batch_size
+                )
+                async for rows in batches:
+                    if export_format == ExportFormat.CSV:
+                        yield self._csv_chunk(self._csv_row(row, columns) for row in rows)
+                    else:
+                        yield self._ndjson_chunk(rows, columns)
+                    exported += len(rows)
+        except Exception as e:
+            # Headers are already sent: abort the transfer so the client sees
+            # an incomplete response instead of a silently truncated file
+            logger.error(f"Booking export failed after {exported} rows: {e}")
+            raise
+        finally:
+            bookings_exported_total.labels(format=export_format.value).inc(exported)
+        
+        logger.info(f"Exported {exported} bookings as {export_format.value}")
+    
+    @staticmethod
+    def _csv_chunk(records) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _csv_row(row: Row, columns: Sequence[str]) -> list:
+        """CSV cells: flight_ids joined with ';' (as the bulk import reads them), events as JSON"""
+        values = row._mapping
+        cells = []
+        for column in columns:
+            value = values[column]
+            if column == "flight_ids":
+                value = ";".join(str(flight_id) for flight_id in value or [])
+            elif column == "events":
+                value = json.dumps(value, default=_json_default)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            cells.append(value)
+        return cells
+    
+    @staticmethod
+    def _ndjson_chunk(rows: Sequence[Row], columns: Sequence[str]) -> str:
+        return "".join(
+            json.dumps({column: row._mapping[column] for column in columns}, default=_json_default) + "\n"
+            for row in rows
+        )
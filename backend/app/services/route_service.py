@@ -1,16 +1,21 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from datetime import datetime, timedelta
+from dataclasses import asdict
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
 from app.repositories.flight_repository import FlightRepository
 from app.schemas.route import RouteRequest, RouteResponse, RouteOption
 from app.schemas.flight import FlightResponse
 from app.core.cache import cache
+from app.utils.conditional import Validators, cached_validators, validator_key
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.metrics import route_searches_total, cache_hits_total, cache_misses_total
 
 logger = get_logger(__name__)
 
+# Sorted set of "ORIGIN:DESTINATION" lanes scored by search count
+POPULAR_LANES_KEY = "route_searches:lanes"
+
 
 class RouteService:
     """Service for route search business logic"""
@@ -28,11 +33,10 @@ class RouteService:
         - Second hop must be same day or next day only
         """
         
-        # Update metrics
-        route_searches_total.inc()
+        await self.record_search(route_request)
         
         # Try cache first
-        cache_key = f"route:{route_request.origin}:{route_request.destination}:{route_request.departure_date}"
+        cache_key = self.cache_key(route_request)
         cached = await cache.get(cache_key)
         if cached:
             cache_hits_total.labels(cache_type='route').inc()
@@ -41,6 +45,39 @@ class RouteService:
         
         cache_misses_total.labels(cache_type='route').inc()
         
+        return await self.refresh_route_cache(route_request)
+    
+    async def record_search(self, route_request: RouteRequest) -> None:
+        """Count a search, including ones answered with 304 Not Modified"""
+        
+        # Update metrics
+        route_searches_total.inc()
+        
+        # Track lane popularity for cache warm-up
+        await cache.increment_score(
+            POPULAR_LANES_KEY,
+            f"{route_request.origin}:{route_request.destination}"
+        )
+    
+    @staticmethod
+    def route_validators(response: RouteResponse) -> Validators:
+        """ETag of a route search: a digest of the result, since flights can also drop out"""
+        return Validators.build("route", response.model_dump_json())
+    
+    async def get_route_validators(self, route_request: RouteRequest) -> Optional[Validators]:
+        """Cached validators of a route search, without loading the result"""
+        return await cached_validators(self.cache_key(route_request))
+    
+    @staticmethod
+    def cache_key(route_request: RouteRequest) -> str:
+        """Cache key for a route search"""
+        return f"route:{route_request.origin}:{route_request.destination}:{route_request.departure_date}"
+    
+    async def refresh_route_cache(self, route_request: RouteRequest) -> RouteResponse:
+        """Compute routes from the database and store them in the cache"""
+        
+        cache_key = self.cache_key(route_request)
+        
         # Search for direct flights
         direct_flights = await self.flight_repo.get_direct_flights(
             origin=route_request.origin,
@@ -93,7 +130,12 @@ class RouteService:
             transit_routes=transit_routes
         )
         
-        # Cache the result (routes change infrequently)
-        await cache.set(cache_key, response.model_dump(), ttl=settings.ROUTE_CACHE_TTL)
+        # Cache the result - far-future schedules are stable, near-term ones are volatile
+        days_ahead = (route_request.departure_date - datetime.now(timezone.utc).date()).days
+        ttl = cache.ttl_for("route", days_ahead, default=settings.ROUTE_CACHE_TTL)
+        await cache.set_many({
+            cache_key: response.model_dump(),
+            validator_key(cache_key): asdict(self.route_validators(response)),
+        }, ttl=ttl)
         
         return response
\ No newline at end of file
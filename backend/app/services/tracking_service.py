@@ -1,9 +1,12 @@
+from dataclasses import asdict
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.repositories.booking_repository import BookingRepository
-from app.repositories.event_repository import EventRepository
+from app.repositories.tracking_repository import TrackingRepository
 from app.schemas.booking import BookingHistoryResponse, BookingResponse, BookingEventResponse
 from app.core.cache import cache
+from app.utils.conditional import Validators, cached_validators, validator_key
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -15,12 +18,18 @@ class TrackingService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.booking_repo = BookingRepository(db)
-        self.event_repo = EventRepository(db)
+        self.tracking_repo = TrackingRepository(db)
     
-    async def get_booking_history(self, ref_id: str) -> BookingHistoryResponse:
+    async def get_booking_history(
+        self,
+        ref_id: str,
+        after_event_id: Optional[int] = None
+    ) -> BookingHistoryResponse:
         """
         Get booking with full chronological event timeline
         Used by UI for tracking
+        - after_event_id: only events newer than the client's latest one,
+          plus the current booking state
         """
         
         # Try cache first
@@ -28,18 +37,30 @@ class TrackingService:
         cached = await cache.get(cache_key)
         if cached:
             logger.debug(f"Booking history cache hit: {ref_id}")
+            if after_event_id is not None:
+                # Trim before validation so only new events are parsed and sent
+                cached["timeline"] = [e for e in cached["timeline"] if e["id"] > after_event_id]
             return BookingHistoryResponse(**cached)
         
-        # Get booking
-        booking = await self.booking_repo.get_by_ref_id(ref_id)
+        if after_event_id is not None:
+            return await self._get_new_events(ref_id, after_event_id)
+        
+        # Pre-rendered tracking document: a single primary key lookup
+        document = await self.tracking_repo.get_document(ref_id)
+        if document is not None:
+            response = BookingHistoryResponse(**document)
+            await self._cache_history(cache_key, response)
+            return response
+        
+        # Not projected yet (or archived): build it from bookings + events in one query
+        booking = await self.booking_repo.get_history(ref_id)
         if not booking:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Booking not found: {ref_id}"
             )
         
-        # Get all events (chronologically ordered)
-        events = await self.event_repo.get_by_booking_id(booking.id)
+        events = booking.timeline
         
         # Build response
         response = BookingHistoryResponse(
@@ -48,8 +69,48 @@ class TrackingService:
         )
         
         # Cache the result
-        await cache.set(cache_key, response.model_dump(), ttl=300)
+        await self._cache_history(cache_key, response)
         
         logger.info(f"Retrieved booking history: {ref_id} with {len(events)} events")
         
-        return response
\ No newline at end of file
+        return response
+    
+    async def _get_new_events(self, ref_id: str, after_event_id: int) -> BookingHistoryResponse:
+        """Incremental history straight from the (booking_id, created_at) index; not cached"""
+        booking = await self.booking_repo.get_history(ref_id, after_event_id=after_event_id)
+        if not booking:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Booking not found: {ref_id}"
+            )
+        
+        return BookingHistoryResponse(
+            booking=BookingResponse.model_validate(booking),
+            timeline=[BookingEventResponse.model_validate(e) for e in booking.timeline]
+        )
+    
+    @staticmethod
+    def history_validators(history: BookingHistoryResponse) -> Validators:
+        """ETag/Last-Modified of a booking history: the booking version plus its latest event"""
+        last_event = history.timeline[-1] if history.timeline else None
+        modified_at = history.booking.updated_at
+        if last_event is not None and last_event.created_at > modified_at:
+            modified_at = last_event.created_at
+        return Validators.build(
+            "booking_history",
+            history.booking.ref_id,
+            history.booking.updated_at.isoformat(),
+            last_event.id if last_event else 0,
+            modified_at=modified_at
+        )
+    
+    async def get_history_validators(self, ref_id: str) -> Optional[Validators]:
+        """Cached validators of a booking history, without loading the timeline"""
+        return await cached_validators(f"booking_history:{ref_id}")
+    
+    async def _cache_history(self, cache_key: str, response: BookingHistoryResponse) -> None:
+        """Cache a history with its validators in one round trip"""
+        await cache.set_many({
+            cache_key: response.model_dump(),
+            validator_key(cache_key): asdict(self.history_validators(response)),
+        }, ttl=300)
@@ -0,0 +1,140 @@
+import asyncio
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.booking import Booking
+from app.schemas.booking import (
+    BookingResponse,
+    BookingHistoryResponse,
+    BookingEventResponse,
+    BookingStatus,
+)
+from app.schemas.route import RouteRequest
+from app.services.booking_service import BookingService
+from app.services.route_service import RouteService, POPULAR_LANES_KEY
+from app.services.tracking_service import TrackingService
+from app.utils.conditional import validator_key
+from app.core.cache import cache
+from app.core.locks import lock_manager
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bookings in these states never change again, so there is no point warming them
+CLOSED_STATUSES = [BookingStatus.DELIVERED.value, BookingStatus.CANCELLED.value]
+
+
+class CacheWarmupService:
+    """Preloads the Redis working set after a deploy"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def warm_bookings(self) -> int:
+        """
+        Cache active bookings and their histories
+        - Walks bookings by id in batches of CACHE_WARMUP_BATCH_SIZE
+        - Pauses CACHE_WARMUP_BATCH_DELAY between batches to spare the database
+        """
+        warmed = 0
+        last_id = 0
+        
+        while warmed < settings.CACHE_WARMUP_BOOKING_LIMIT:
+            batch_size = min(settings.CACHE_WARMUP_BATCH_SIZE, settings.CACHE_WARMUP_BOOKING_LIMIT - warmed)
+            
+            result = await self.db.execute(
+                select(Booking)
+                .options(selectinload(Booking.events))
+                .where(Booking.id > last_id, Booking.status.notin_(CLOSED_STATUSES))
+                .order_by(Booking.id)
+                .limit(batch_size)
+            )
+            bookings = result.scalars().all()
+            if not bookings:
+                break
+            
+            entries = {}
+            for booking in bookings:
+                response = BookingResponse.model_validate(booking)
+                events = sorted(booking.events, key=lambda e: (e.created_at, e.id))
+                history = BookingHistoryResponse(
+                    booking=response,
+                    timeline=[BookingEventResponse.model_validate(e) for e in events]
+                )
+                booking_key = f"booking:{booking.ref_id}"
+                history_key = f"booking_history:{booking.ref_id}"
+                entries[booking_key] = response.model_dump()
+                entries[history_key] = history.model_dump()
+                entries[validator_key(booking_key)] = asdict(BookingService.booking_validators(response))
+                entries[validator_key(history_key)] = asdict(TrackingService.history_validators(history))
+            
+            await cache.set_many(entries, ttl=settings.CACHE_TTL)
+            
+            warmed += len(bookings)
+            last_id = bookings[-1].id
+            # Drop loaded rows so memory stays flat across batches
+            self.db.expunge_all()
+            await asyncio.sleep(settings.CACHE_WARMUP_BATCH_DELAY)
+        
+        logger.info(f"Cache warm-up: {warmed} active bookings cached")
+        return warmed
+    
+    async def warm_routes(self) -> int:
+        """Cache the most searched lanes for the next CACHE_WARMUP_DAYS days"""
+        lanes = await cache.top_scored(POPULAR_LANES_KEY, settings.CACHE_WARMUP_TOP_LANES)
+        route_service = RouteService(self.db)
+        today = datetime.now(timezone.utc).date()
+        warmed = 0
+        
+        for lane in lanes:
+            origin, _, destination = lane.partition(":")
+            if not origin or not destination:
+                continue
+            
+            for day in range(settings.CACHE_WARMUP_DAYS):
+                route_request = RouteRequest(
+                    origin=origin,
+                    destination=destination,
+                    departure_date=today + timedelta(days=day)
+                )
+                if await cache.exists(RouteService.cache_key(route_request)):
+                    continue
+                
+                await route_service.refresh_route_cache(route_request)
+                warmed += 1
+                await asyncio.sleep(settings.CACHE_WARMUP_BATCH_DELAY)
+        
+        logger.info(f"Cache warm-up: {warmed} route searches cached across {len(lanes)} lanes")
+        return warmed
+    
+    async def run(self) -> dict:
+        """
+        Run the full warm-up
+        Only one worker warms the cache at a time; the others skip it
+        """
+        lock = lock_manager.lock("cache_warmup", timeout=600)
+        if not await lock.acquire(retry_times=1):
+            logger.info("Cache warm-up already running in another worker, skipping")
+            return {"bookings": 0, "routes": 0}
+        
+        try:
+            bookings = await self.warm_bookings()
+            routes = await self.warm_routes()
+            return {"bookings": bookings, "routes": routes}
+        finally:
+            await lock.release()
+
+
+async def run_cache_warmup() -> dict:
+    """Run the cache warm-up with its own database session"""
+    from app.core.db import AsyncSessionLocal
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            return await CacheWarmupService(db).run()
+    except Exception as e:
+        logger.warning(f"Cache warm-up failed: {e}")
+        return {"bookings": 0, "routes": 0}
@@ -0,0 +1,80 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+from fastapi import Request, Response, status
+from app.core.cache import cache
+
+
+def validator_key(cache_key: str) -> str:
+    """Cache key holding the validators of the representation cached at cache_key"""
+    return f"etag:{cache_key}"
+
+
+@dataclass
+class Validators:
+    """
+    ETag / Last-Modified pair for a representation
+    Small enough to keep in its own cache entry, so a conditional request
+    can be answered with 304 without loading or serializing the body
+    """
+    etag: str
+    last_modified: Optional[str] = None
+    
+    @classmethod
+    def build(cls, *parts: Any, modified_at: Optional[datetime] = None) -> "Validators":
+        """Weak ETag over the given version parts (ids, timestamps, content digests)"""
+        digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:32]
+        last_modified = None
+        if modified_at is not None:
+            if modified_at.tzinfo is None:
+                modified_at = modified_at.replace(tzinfo=timezone.utc)
+            last_modified = format_datetime(modified_at.astimezone(timezone.utc), usegmt=True)
+        return cls(etag=f'W/"{digest}"', last_modified=last_modified)
+    
+    def headers(self) -> Dict[str, str]:
+        # no-cache: clients may store the body but must revalidate before reuse,
+        # instead of guessing a freshness lifetime from Last-Modified
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        return headers
+    
+    def is_fresh(self, request: Request) -> bool:
+        """
+        Whether the client's copy is current
+        - If-None-Match wins when present (weak comparison, RFC 9110 13.1.2)
+        - If-Modified-Since is only consulted without it
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            opaque = self.etag.removeprefix("W/")
+            return any(
+                tag.strip().removeprefix("W/") == opaque
+                for tag in if_none_match.split(",")
+            )
+        
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified:
+            try:
+                return parsedate_to_datetime(self.last_modified) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+    
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers())
+
+
+def is_conditional(request: Request) -> bool:
+    """Whether the request carries a validator worth checking before loading the body"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+async def cached_validators(cache_key: str) -> Optional[Validators]:
+    """Validators stored next to the representation cached at cache_key"""
+    cached = await cache.get(validator_key(cache_key))
+    return Validators(**cached) if cached else None
@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+
+def _encode(parts: List[Any]) -> str:
+    raw = json.dumps(parts, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode a keyset position as an opaque cursor
+    Format: urlsafe base64 of [created_at ISO timestamp, id]
+    """
+    return _encode([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+    Raises ValueError for malformed cursors
+    """
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def encode_change_cursor(change_seq: int, row_id: int) -> str:
+    """
+    Encode a change feed position as an opaque cursor
+    Format: urlsafe base64 of [change_seq, id]
+    """
+    return _encode([change_seq, row_id])
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a cursor produced by encode_change_cursor
+    Raises ValueError for malformed cursors
+    """
+    try:
+        change_seq, row_id = _decode(cursor)
+        return int(change_seq), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
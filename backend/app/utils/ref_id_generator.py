@@ -1,32 +1,93 @@
-import random
+import asyncio
+import hashlib
+import hmac
 import string
-from datetime import datetime
+from typing import Awaitable, Callable, List
+from app.core.config import settings
 
 
-def generate_ref_id() -> str:
+# Sequence-backed allocation
+#
+# A Postgres sequence hands out plain integers; a keyed Feistel permutation
+# turns each one into a different, non-sequential integer below 36^5, which
+# is then base36-encoded. The permutation is a bijection, so distinct
+# sequence values always give distinct ref_ids without any lookup query.
+
+REF_ID_ALPHABET = string.digits + string.ascii_uppercase
+REF_ID_SPACE = 36 ** 5
+REF_ID_BLOCK_SIZE = 100
+
+_FEISTEL_HALF_BITS = 13  # 2 * 13 bits = 2^26, the smallest even split covering 36^5
+_FEISTEL_HALF_MASK = (1 << _FEISTEL_HALF_BITS) - 1
+_FEISTEL_ROUNDS = 4
+
+
+def _feistel_round(key: bytes, round_number: int, value: int) -> int:
+    digest = hmac.new(key, f"{round_number}:{value}".encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], "big") & _FEISTEL_HALF_MASK
+
+
+def permute_ref_number(number: int, key: bytes) -> int:
     """
-    Generate human-friendly reference ID
-    Format: ACB + 5 alphanumeric characters (uppercase)
-    Example: ACB12A4D, ACBX9K2M
+    Map a number in [0, 36^5) to another number in the same range
+    Bijective for a fixed key; cycle-walks the 2^26 Feistel domain
     """
-    chars = string.ascii_uppercase + string.digits
-    random_part = ''.join(random.choices(chars, k=5))
-    return f"ACB{random_part}"
+    if not 0 <= number < REF_ID_SPACE:
+        raise ValueError(f"Ref number out of range: {number}")
+    
+    value = number
+    while True:
+        left, right = value >> _FEISTEL_HALF_BITS, value & _FEISTEL_HALF_MASK
+        for round_number in range(_FEISTEL_ROUNDS):
+            left, right = right, left ^ _feistel_round(key, round_number, right)
+        value = (left << _FEISTEL_HALF_BITS) | right
+        if value < REF_ID_SPACE:
+            return value
 
 
-def generate_unique_ref_id(existing_ids: set = None) -> str:
+def encode_ref_number(number: int) -> str:
+    """Encode a number in [0, 36^5) as ACB + 5 base36 characters"""
+    chars = []
+    for _ in range(5):
+        number, remainder = divmod(number, 36)
+        chars.append(REF_ID_ALPHABET[remainder])
+    return "ACB" + "".join(reversed(chars))
+
+
+def ref_id_from_sequence(value: int, key: bytes) -> str:
+    """Turn a sequence value into its ref_id"""
+    return encode_ref_number(permute_ref_number(value, key))
+
+
+class RefIdAllocator:
     """
-    Generate unique reference ID
-    Ensures no collision with existing IDs
+    Hands out ref_ids from blocks reserved on a sequence
+    - One reservation query per REF_ID_BLOCK_SIZE ids, shared by the process
+    - reserve() must return the first value of a fresh block
     """
-    max_attempts = 100
-    existing_ids = existing_ids or set()
     
-    for _ in range(max_attempts):
-        ref_id = generate_ref_id()
-        if ref_id not in existing_ids:
-            return ref_id
+    def __init__(self, key: bytes, block_size: int = REF_ID_BLOCK_SIZE):
+        self.key = key
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = asyncio.Lock()
     
-    # Fallback with timestamp
-    timestamp = datetime.utcnow().strftime("%H%M%S")
-    return f"ACB{timestamp[:5]}"
\ No newline at end of file
+    async def allocate(self, count: int, reserve: Callable[[], Awaitable[int]]) -> List[str]:
+        """Allocate count ref_ids, reserving new blocks as needed"""
+        values = []
+        async with self._lock:
+            while len(values) < count:
+                if self._next >= self._end:
+                    start = await reserve()
+                    self._next, self._end = start, min(start + self.block_size, REF_ID_SPACE)
+                take = min(count - len(values), self._end - self._next)
+                values.extend(range(self._next, self._next + take))
+                self._next += take
+        
+        return [ref_id_from_sequence(value, self.key) for value in values]
+
+
+ref_id_allocator = RefIdAllocator(
+    hashlib.sha256((settings.REF_ID_SECRET or settings.SECRET_KEY).encode()).digest()
+)
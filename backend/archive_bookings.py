@@ -0,0 +1,47 @@
+"""
+Archival script - Move closed bookings older than N days to the archive tables
+"""
+import argparse
+import asyncio
+import sys
+from app.core.config import settings
+from app.core.db import close_db
+from app.core.logging import get_logger
+from app.services.archive_service import ArchiveService
+
+logger = get_logger(__name__)
+
+
+async def archive_bookings(older_than_days: int, batch_size: int, max_batches: int = None):
+    """Run the archival once"""
+    
+    try:
+        from app.core.db import AsyncSessionLocal
+        
+        async with AsyncSessionLocal() as db:
+            archived = await ArchiveService(db).archive_closed_bookings(
+                older_than_days=older_than_days,
+                batch_size=batch_size,
+                max_batches=max_batches
+            )
+        
+        logger.info(f"Archival complete: {archived} bookings archived")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Archival failed: {e}")
+        return False
+    
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+    
+    success = asyncio.run(archive_bookings(args.older_than_days, args.batch_size, args.max_batches))
+    sys.exit(0 if success else 1)
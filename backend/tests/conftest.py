@@ -8,6 +8,9 @@ from app.core.db import Base
 from app.models.booking import Booking
 from app.models.flight import Flight
 from app.models.booking_event import BookingEvent
+from app.models.booking_tracking import BookingTracking
+from app.models.idempotency_key import IdempotencyKey
+from app.models.booking_archive import BookingArchive, BookingEventArchive
 
 
 # Test database URL - Use local test database
@@ -1,7 +1,16 @@
+import csv
+import io
+import json
 import pytest
+from unittest.mock import patch
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from app.main import app
+from app.core.cache import cache
 from app.core.db import get_db
+from app.services.export_service import ExportService
+from app.utils.conditional import validator_key
 from tests.conftest import db_session
 
 
@@ -196,3 +205,324 @@ async def test_booking_not_found(db_session):
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         response = await client.get("/api/v1/bookings/INVALID123")
         assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_bookings_via_api(db_session):
+    """Test bulk booking creation from JSON and CSV payloads"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        json_response = await client.post(
+            "/api/v1/bookings/bulk",
+            json=[
+                {"origin": "DEL", "destination": "BLR", "pieces": 5, "weight_kg": 250},
+                {"origin": "BOM", "destination": "HYD", "pieces": 2, "weight_kg": 80},
+            ]
+        )
+        assert json_response.status_code == 201
+        data = json_response.json()
+        assert data["created"] == 2
+        assert len(set(data["ref_ids"])) == 2
+        
+        first = await client.get(f"/api/v1/bookings/{data['ref_ids'][0]}")
+        assert first.json()["origin"] == "DEL"
+        
+        history = await client.get(f"/api/v1/bookings/{data['ref_ids'][1]}/history")
+        assert history.json()["timeline"][0]["event_type"] == "BOOKED"
+        
+        csv_response = await client.post(
+            "/api/v1/bookings/bulk",
+            content="origin,destination,pieces,weight_kg\nDEL,BLR,1,10\nBLR,DEL,3,30\n",
+            headers={"Content-Type": "text/csv"}
+        )
+        assert csv_response.status_code == 201
+        assert csv_response.json()["created"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_invalid_rows(db_session):
+    """Test an invalid row rejects the whole bulk request"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/bookings/bulk",
+            json=[
+                {"origin": "DEL", "destination": "BLR", "pieces": 5, "weight_kg": 250},
+                {"origin": "DEL", "destination": "BLR", "pieces": 0, "weight_kg": 250},
+            ]
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["row"] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_bookings_cursor_pagination(db_session):
+    """Test walking the bookings list page by page with next_cursor"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = await client.post(
+            "/api/v1/bookings/bulk",
+            json=[
+                {"origin": "DEL", "destination": "BLR", "pieces": i + 1, "weight_kg": 100}
+                for i in range(5)
+            ]
+        )
+        assert created.status_code == 201
+        
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/v1/bookings", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(item["ref_id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert sorted(seen) == sorted(created.json()["ref_ids"])
+        assert len(seen) == 5
+        
+        invalid = await client.get("/api/v1/bookings", params={"cursor": "garbage"})
+        assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_bookings_filters(db_session):
+    """Test filtering the bookings list by status, route and flight"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = await client.post(
+            "/api/v1/bookings/bulk",
+            json=[
+                {"origin": "DEL", "destination": "BLR", "pieces": 1, "weight_kg": 10, "flight_ids": [7]},
+                {"origin": "DEL", "destination": "BOM", "pieces": 1, "weight_kg": 10},
+                {"origin": "BOM", "destination": "BLR", "pieces": 1, "weight_kg": 10},
+            ]
+        )
+        del_blr, del_bom, bom_blr = created.json()["ref_ids"]
+        await client.delete(f"/api/v1/bookings/{del_bom}")
+        
+        async def ref_ids(**params):
+            response = await client.get("/api/v1/bookings", params=params)
+            assert response.status_code == 200
+            return {item["ref_id"] for item in response.json()["items"]}
+        
+        assert await ref_ids(origin="del") == {del_blr, del_bom}
+        assert await ref_ids(destination="BLR") == {del_blr, bom_blr}
+        assert await ref_ids(origin="DEL", status="BOOKED") == {del_blr}
+        assert await ref_ids(status="CANCELLED") == {del_bom}
+        assert await ref_ids(flight_id=7) == {del_blr}
+        assert await ref_ids(created_to="2000-01-01T00:00:00Z") == set()
+        
+        invalid = await client.get(
+            "/api/v1/bookings",
+            params={"created_from": "2026-01-02T00:00:00Z", "created_to": "2026-01-01T00:00:00Z"}
+        )
+        assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_and_get_bookings_issue_single_select(db_session):
+    """Test booking reads do not load the event timeline"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    selects = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+    
+    sync_engine = db_session.bind.sync_engine
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = await client.post(
+            "/api/v1/bookings/bulk",
+            json=[
+                {"origin": "DEL", "destination": "BLR", "pieces": 1, "weight_kg": 10},
+                {"origin": "BOM", "destination": "HYD", "pieces": 1, "weight_kg": 10},
+            ]
+        )
+        ref_id = created.json()["ref_ids"][0]
+        
+        event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            list_response = await client.get("/api/v1/bookings")
+            assert list_response.status_code == 200
+            assert len(selects) == 1
+            
+            selects.clear()
+            get_response = await client.get(f"/api/v1/bookings/{ref_id}")
+            assert get_response.status_code == 200
+            assert len(selects) <= 1  # 0 when served from cache
+            assert all("booking_events" not in s for s in selects)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_lookup_bookings_by_ref_ids(db_session):
+    """Test multi-get keeps request order and marks unknown ref_ids"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = await client.post(
+            "/api/v1/bookings/bulk",
+            json=[
+                {"origin": "DEL", "destination": "BLR", "pieces": 1, "weight_kg": 10},
+                {"origin": "BOM", "destination": "HYD", "pieces": 1, "weight_kg": 10},
+            ]
+        )
+        first, second = created.json()["ref_ids"]
+        
+        response = await client.get(f"/api/v1/bookings?ref_ids={second},MISSING,{first}")
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["ref_id"] for r in results] == [second, "MISSING", first]
+        assert [r["found"] for r in results] == [True, False, True]
+        assert results[0]["booking"]["origin"] == "BOM"
+        assert results[1]["booking"] is None
+        
+        # Second call is answered from the cache filled by the first,
+        # which also holds the validators for conditional GETs
+        assert await cache.get(validator_key(f"booking:{first}")) is not None
+        post_response = await client.post("/api/v1/bookings/lookup", json={"ref_ids": [first]})
+        assert post_response.json()["results"][0]["booking"]["origin"] == "DEL"
+        
+        too_many = await client.post(
+            "/api/v1/bookings/lookup",
+            json={"ref_ids": [f"X{i}" for i in range(101)]}
+        )
+        assert too_many.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_booking_and_history(db_session):
+    """Test ETags turn repeat reads into 304s until the booking changes"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = await client.post(
+            "/api/v1/bookings",
+            json={"origin": "DEL", "destination": "BLR", "pieces": 1, "weight_kg": 10}
+        )
+        ref_id = created.json()["ref_id"]
+        
+        for path in (f"/api/v1/bookings/{ref_id}", f"/api/v1/bookings/{ref_id}/history"):
+            first = await client.get(path)
+            etag = first.headers["ETag"]
+            assert "Last-Modified" in first.headers
+            
+            repeat = await client.get(path, headers={"If-None-Match": etag})
+            assert repeat.status_code == 304
+            assert repeat.content == b""
+        
+        booking_etag = (await client.get(f"/api/v1/bookings/{ref_id}")).headers["ETag"]
+        await client.post(f"/api/v1/bookings/{ref_id}/depart", json={"location": "DEL"})
+        
+        changed = await client.get(f"/api/v1/bookings/{ref_id}", headers={"If-None-Match": booking_etag})
+        assert changed.status_code == 200
+        assert changed.json()["status"] == "DEPARTED"
+        assert changed.headers["ETag"] != booking_etag
+
+
+@pytest.mark.asyncio
+async def test_booking_change_feed(db_session):
+    """Test the change feed returns each write once, in order, resuming from the cursor"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        created = await client.post(
+            "/api/v1/bookings/bulk",
+            json=[
+                {"origin": "DEL", "destination": "BLR", "pieces": 1, "weight_kg": 10},
+                {"origin": "BOM", "destination": "HYD", "pieces": 1, "weight_kg": 10},
+            ]
+        )
+        first, second = created.json()["ref_ids"]
+        
+        feed = await client.get("/api/v1/bookings/changes", params={"limit": 1})
+        assert feed.status_code == 200
+        page = feed.json()
+        assert len(page["items"]) == 1 and page["has_more"] is True
+        
+        rest = (await client.get("/api/v1/bookings/changes", params={"since": page["next_cursor"]})).json()
+        assert {page["items"][0]["ref_id"], rest["items"][0]["ref_id"]} == {first, second}
+        assert rest["has_more"] is False
+        
+        # Caught up: nothing new, and the cursor is handed back unchanged
+        idle = (await client.get("/api/v1/bookings/changes", params={"since": rest["next_cursor"]})).json()
+        assert idle["items"] == [] and idle["next_cursor"] == rest["next_cursor"]
+        
+        await client.post(f"/api/v1/bookings/{first}/depart", json={"location": "DEL"})
+        
+        changed = (await client.get("/api/v1/bookings/changes", params={"since": rest["next_cursor"]})).json()
+        assert [b["ref_id"] for b in changed["items"]] == [first]
+        assert changed["items"][0]["status"] == "DEPARTED"
+        
+        invalid = await client.get("/api/v1/bookings/changes", params={"since": "garbage"})
+        assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_streams_csv_and_ndjson(db_session):
+    """Test the export streams filtered bookings as CSV and NDJSON"""
+    
+    app.dependency_overrides[get_db] = lambda: db_session
+    
+    # The export opens its own session; point it at the test database
+    test_sessions = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    export_service = lambda: ExportService(session_factory=test_sessions, batch_size=1)
+    
+    with patch('app.routers.bookings.ExportService', export_service):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            created = await client.post(
+                "/api/v1/bookings/bulk",
+                json=[
+                    {"origin": "DEL", "destination": "BLR", "pieces": 1, "weight_kg": 10, "flight_ids": [1, 2]},
+                    {"origin": "DEL", "destination": "HYD", "pieces": 2, "weight_kg": 20},
+                    {"origin": "BOM", "destination": "HYD", "pieces": 3, "weight_kg": 30},
+                ]
+            )
+            first, second, _ = created.json()["ref_ids"]
+            
+            csv_response = await client.get("/api/v1/bookings/export", params={"origin": "DEL"})
+            assert csv_response.status_code == 200
+            assert csv_response.headers["content-type"].startswith("text/csv")
+            records = list(csv.DictReader(io.StringIO(csv_response.text)))
+            assert [r["ref_id"] for r in records] == [second, first]
+            assert records[1]["flight_ids"] == "1;2"
+            
+            ndjson_response = await client.get(
+                "/api/v1/bookings/export",
+                params={"format": "ndjson", "destination": "HYD", "include_events": "true"}
+            )
+            assert ndjson_response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [json.loads(line) for line in ndjson_response.text.splitlines()]
+            assert len(lines) == 2
+            assert all(line["events"][0]["event_type"] == "BOOKED" for line in lines)
+            
+            invalid = await client.get("/api/v1/bookings/export", params={"format": "xml"})
+            assert invalid.status_code == 422
+            
+            inverted = await client.get(
+                "/api/v1/bookings/export",
+                params={"created_from": "2026-02-01T00:00:00Z", "created_to": "2026-01-01T00:00:00Z"}
+            )
+            assert inverted.status_code == 400
+            assert "created_from" in inverted.json()["detail"]
@@ -0,0 +1,121 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import select, update
+from fastapi import HTTPException
+from app.models.booking import Booking
+from app.models.booking_archive import BookingArchive, BookingEventArchive
+from app.services.archive_service import ArchiveService
+from app.services.booking_service import BookingService
+from app.services.tracking_service import TrackingService
+from app.schemas.booking import BookingCreate, BookingDepartRequest
+
+
+async def age_booking(db_session, ref_id: str, days: int):
+    """Backdate a booking as if it was created and closed days ago"""
+    past = datetime.now(timezone.utc) - timedelta(days=days)
+    await db_session.execute(
+        update(Booking).where(Booking.ref_id == ref_id).values(created_at=past, updated_at=past)
+    )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_closed_bookings_only(db_session, sample_booking_data):
+    """Test archival moves old closed bookings with their events and leaves the rest"""
+    
+    service = BookingService(db_session)
+    old_departed = await service.create_booking(BookingCreate(**sample_booking_data))
+    await service.depart_booking(old_departed.ref_id, BookingDepartRequest(location="DEL"))
+    recent_closed = await service.create_booking(BookingCreate(**sample_booking_data))
+    old_active = await service.create_booking(BookingCreate(**sample_booking_data))
+    
+    cancelled = await service.create_booking(BookingCreate(**sample_booking_data))
+    await service.cancel_booking(cancelled.ref_id)
+    await service.cancel_booking(recent_closed.ref_id)
+    await age_booking(db_session, cancelled.ref_id, 120)
+    await age_booking(db_session, old_active.ref_id, 120)
+    await age_booking(db_session, old_departed.ref_id, 120)
+    
+    archived = await ArchiveService(db_session).archive_closed_bookings(older_than_days=90, batch_size=1)
+    
+    assert archived == 1
+    hot = (await db_session.execute(select(Booking.ref_id))).scalars().all()
+    assert cancelled.ref_id not in hot
+    assert {old_departed.ref_id, recent_closed.ref_id, old_active.ref_id} <= set(hot)
+    
+    archive_row = (await db_session.execute(
+        select(BookingArchive).where(BookingArchive.ref_id == cancelled.ref_id)
+    )).scalar_one()
+    events = (await db_session.execute(
+        select(BookingEventArchive.event_type).where(BookingEventArchive.booking_id == archive_row.id)
+    )).scalars().all()
+    assert sorted(events) == ["BOOKED", "CANCELLED"]
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_archive(db_session, sample_booking_data):
+    """Test booking, lookup and history reads find archived bookings"""
+    
+    service = BookingService(db_session)
+    booking = await service.create_booking(BookingCreate(**sample_booking_data))
+    await service.cancel_booking(booking.ref_id)
+    await age_booking(db_session, booking.ref_id, 120)
+    await ArchiveService(db_session).archive_closed_bookings(older_than_days=90)
+    
+    with patch('app.services.booking_service.cache.get', AsyncMock(return_value=None)), \
+         patch('app.services.booking_service.cache.get_many', AsyncMock(return_value=[None])), \
+         patch('app.services.booking_service.cache.set_many', AsyncMock(return_value=True)), \
+         patch('app.services.tracking_service.cache.get', AsyncMock(return_value=None)), \
+         patch('app.services.tracking_service.cache.set_many', AsyncMock(return_value=True)):
+        found = await service.get_booking(booking.ref_id)
+        lookup = await service.lookup_bookings([booking.ref_id])
+        history = await TrackingService(db_session).get_booking_history(booking.ref_id)
+    
+    assert found.status == "CANCELLED"
+    assert lookup.results[0].found
+    assert [e.event_type for e in history.timeline] == ["BOOKED", "CANCELLED"]
+    
+    # Closed bookings still reject transitions with a 400, not a 404
+    with pytest.raises(HTTPException) as exc_info:
+        await service.depart_booking(booking.ref_id, BookingDepartRequest(location="DEL"))
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_archived_ref_id_is_never_reissued(db_session, sample_booking_data):
+    """Test a new booking cannot take the ref_id of an archived one"""
+    
+    service = BookingService(db_session)
+    archived = await service.create_booking(BookingCreate(**sample_booking_data))
+    await service.cancel_booking(archived.ref_id)
+    await age_booking(db_session, archived.ref_id, 120)
+    await ArchiveService(db_session).archive_closed_bookings(older_than_days=90)
+    
+    # First allocation collides with the archived ref_id, the retry gets a fresh one
+    allocate = AsyncMock(side_effect=[[archived.ref_id], ["ACBZZZZZ"]])
+    with patch('app.services.booking_service.ref_id_allocator.allocate', allocate):
+        created = await service.create_booking(BookingCreate(**sample_booking_data))
+    
+    assert created.ref_id == "ACBZZZZZ"
+    assert allocate.await_count == 2
+    assert (await service.booking_repo.get_by_ref_id(archived.ref_id)).id == archived.id
+
+
+@pytest.mark.asyncio
+async def test_archive_skips_while_another_worker_holds_the_lock(db_session, sample_booking_data):
+    """Test archival is exclusive through the Postgres advisory lock, not Redis"""
+    from sqlalchemy import func
+    from app.repositories.archive_repository import ARCHIVE_LOCK_KEY
+    
+    service = BookingService(db_session)
+    booking = await service.create_booking(BookingCreate(**sample_booking_data))
+    await service.cancel_booking(booking.ref_id)
+    await age_booking(db_session, booking.ref_id, 120)
+    
+    async with db_session.bind.connect() as other_worker:
+        async with other_worker.begin():
+            assert await other_worker.scalar(select(func.pg_try_advisory_xact_lock(ARCHIVE_LOCK_KEY)))
+            assert await ArchiveService(db_session).archive_closed_bookings(older_than_days=90) == 0
+    
+    assert await ArchiveService(db_session).archive_closed_bookings(older_than_days=90) == 1
@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from app.models.booking import Booking
+from app.repositories.booking_repository import BookingRepository
+from app.schemas.booking import BookingCreate, BookingFilters, BookingStatus
+
+WEEK_AGO = datetime.now(timezone.utc) - timedelta(days=7)
+
+# Filter combination -> the index from migrations 006/007 meant to serve it
+FILTER_PLANS = [
+    (None, "idx_bookings_created_at_id"),
+    (BookingFilters(created_from=WEEK_AGO), "idx_bookings_created_at_id"),
+    (BookingFilters(status=BookingStatus.DEPARTED), "idx_bookings_status_created_at"),
+    (BookingFilters(origin="DEL"), "idx_bookings_route_created_at"),
+    (BookingFilters(destination="BLR"), "idx_bookings_destination_created_at"),
+    (BookingFilters(origin="DEL", destination="BLR"), "idx_bookings_route_created_at"),
+    (BookingFilters(flight_id=1), "idx_bookings_flight_ids"),
+    (
+        BookingFilters(status=BookingStatus.DEPARTED, origin="DEL", created_from=WEEK_AGO),
+        "idx_bookings_active_origin_created_at"
+    ),
+    (
+        BookingFilters(status=BookingStatus.DELIVERED, created_from=WEEK_AGO),
+        "idx_bookings_status_created_at"
+    ),
+]
+
+
+async def explain(db_session, filters: Optional[BookingFilters], after: Optional[Tuple[datetime, int]] = None) -> str:
+    """EXPLAIN the statement BookingRepository.list_bookings runs for a page"""
+    stmt = BookingRepository.apply_filters(select(Booking), filters)
+    if after is not None:
+        stmt = stmt.where(tuple_(Booking.created_at, Booking.id) < tuple_(*after))
+    stmt = (
+        stmt
+        .order_by(Booking.created_at.desc(), Booking.id.desc())
+        .limit(51)
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    result = await db_session.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(row[0] for row in result.fetchall())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters,expected_index", FILTER_PLANS)
+@pytest.mark.parametrize("keyset_page", [False, True])
+async def test_booking_filters_use_their_index(db_session, filters, expected_index, keyset_page):
+    """Test every filter combination, first page and later pages, uses its intended index"""
+    
+    airports = ["DEL", "BOM", "BLR", "HYD", "MAA"]
+    repo = BookingRepository(db_session)
+    await repo.create_many([
+        (
+            f"ACBQ{i:04d}",
+            BookingCreate(
+                origin=airports[i % 5],
+                destination=airports[(i + 1) % 5],
+                pieces=1,
+                weight_kg=10,
+                flight_ids=[i % 20]
+            )
+        )
+        for i in range(500)
+    ])
+    await db_session.execute(text("ANALYZE bookings"))
+    
+    # Table is small; make sure the planner reports what it would do at scale
+    await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    after = (datetime.now(timezone.utc), 1_000_000) if keyset_page else None
+    plan = await explain(db_session, filters, after)
+    
+    assert "Seq Scan" not in plan, plan
+    assert expected_index in plan, plan
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import event
 from app.services.booking_service import BookingService
+from app.services.tracking_service import TrackingService
 from app.schemas.booking import BookingCreate, BookingDepartRequest, BookingArriveRequest, BookingStatus
 from fastapi import HTTPException
 
@@ -23,6 +25,37 @@ async def test_create_booking(db_session, sample_booking_data):
     assert result.weight_kg == 500
 
 
+@pytest.mark.asyncio
+async def test_create_booking_single_statement(db_session, sample_booking_data):
+    """Test booking, BOOKED event and tracking document are written by one statement"""
+    
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("SELECT nextval"):
+            statements.append(statement)
+    
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        service = BookingService(db_session)
+        result = await service.create_booking(BookingCreate(**sample_booking_data))
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    
+    assert len(statements) == 1
+    assert "booking_events" in statements[0]
+    assert "booking_tracking" in statements[0]
+    
+    row = await service.booking_repo.get_history(result.ref_id)
+    assert [e["event_type"] for e in row.timeline] == ["BOOKED"]
+    
+    # The document rendered at creation matches a full re-render
+    created_document = await service.tracking_repo.get_document(result.ref_id)
+    await service.tracking_repo.refresh([result.ref_id])
+    assert await service.tracking_repo.get_document(result.ref_id) == created_document
+
+
 @pytest.mark.asyncio
 async def test_create_booking_same_origin_destination(db_session):
     """Test that booking with same origin and destination fails"""
@@ -229,4 +262,232 @@ async def test_double_depart_fails(db_session, sample_booking_data):
             await service.depart_booking(booking.ref_id, depart_data)
         
         assert exc_info.value.status_code == 400
-        assert "already departed" in str(exc_info.value.detail).lower()
\ No newline at end of file
+        assert "already departed" in str(exc_info.value.detail).lower()
+
+@pytest.mark.asyncio
+async def test_transition_flight_departs_eligible_bookings(db_session, sample_booking_data, sample_flight_data):
+    """Test departing a flight moves every eligible booking on it in one call"""
+    from app.models.flight import Flight
+    
+    flight = Flight(**sample_flight_data)
+    db_session.add(flight)
+    await db_session.commit()
+    
+    service = BookingService(db_session)
+    on_flight = BookingCreate(**sample_booking_data, flight_ids=[flight.id])
+    
+    booked = await service.create_booking(on_flight)
+    cancelled = await service.create_booking(on_flight)
+    await service.cancel_booking(cancelled.ref_id)
+    other_flight = await service.create_booking(BookingCreate(**sample_booking_data))
+    
+    result = await service.transition_flight(flight.id, BookingStatus.DEPARTED)
+    
+    assert result.transitioned == 1
+    assert result.skipped == 1
+    outcomes = {o.ref_id: o for o in result.outcomes}
+    assert outcomes[booked.ref_id].transitioned is True
+    assert outcomes[booked.ref_id].status == "DEPARTED"
+    assert outcomes[cancelled.ref_id].transitioned is False
+    assert "cancelled" in outcomes[cancelled.ref_id].detail.lower()
+    assert other_flight.ref_id not in outcomes
+    
+    departed = await service.get_booking(booked.ref_id)
+    assert departed.status == "DEPARTED"
+
+
+@pytest.mark.asyncio
+async def test_transition_flight_never_moves_delivered_bookings(db_session, sample_booking_data, sample_flight_data):
+    """Test flight depart/arrive (and their retries) leave DELIVERED bookings and their timeline alone"""
+    from sqlalchemy import select, func
+    from app.models.flight import Flight
+    from app.models.booking_event import BookingEvent
+    from app.schemas.booking import BookingDeliverRequest
+    
+    flight = Flight(**sample_flight_data)
+    db_session.add(flight)
+    await db_session.commit()
+    
+    service = BookingService(db_session)
+    on_flight = BookingCreate(**sample_booking_data, flight_ids=[flight.id])
+    
+    delivered = await service.create_booking(on_flight)
+    await service.depart_booking(delivered.ref_id, BookingDepartRequest(location="DEL"))
+    await service.arrive_booking(delivered.ref_id, BookingArriveRequest(location="BLR"))
+    await service.deliver_booking(delivered.ref_id, BookingDeliverRequest(location="BLR"))
+    booked = await service.create_booking(on_flight)
+    
+    async def event_count():
+        result = await db_session.execute(
+            select(func.count()).select_from(BookingEvent).where(BookingEvent.booking_id == delivered.id)
+        )
+        return result.scalar_one()
+    
+    events_before = await event_count()
+    
+    for target in (BookingStatus.DEPARTED, BookingStatus.DEPARTED, BookingStatus.ARRIVED, BookingStatus.ARRIVED):
+        result = await service.transition_flight(flight.id, target)
+        outcomes = {o.ref_id: o for o in result.outcomes}
+        assert outcomes[delivered.ref_id].transitioned is False
+        assert "delivered" in outcomes[delivered.ref_id].detail.lower()
+    
+    assert await event_count() == events_before
+    assert (await service.get_booking(delivered.ref_id)).status == "DELIVERED"
+    assert (await service.get_booking(booked.ref_id)).status == "ARRIVED"
+
+
+async def two_leg_booking(db_session, sample_booking_data, sample_flight_data):
+    """A booking on DEL -> BLR -> HYD, with both flights"""
+    from app.models.flight import Flight
+    
+    first_leg = Flight(**sample_flight_data)
+    second_leg = Flight(**{**sample_flight_data, "flight_number": "AI202", "origin": "BLR", "destination": "HYD"})
+    db_session.add_all([first_leg, second_leg])
+    await db_session.commit()
+    
+    service = BookingService(db_session)
+    booking = await service.create_booking(
+        BookingCreate(**sample_booking_data, flight_ids=[first_leg.id, second_leg.id])
+    )
+    return service, booking, first_leg, second_leg
+
+
+@pytest.mark.asyncio
+async def test_transition_flight_follows_booking_legs(db_session, sample_booking_data, sample_flight_data):
+    """Test a booking departs each leg once, in order, and only after the previous leg arrived"""
+    service, booking, first_leg, second_leg = await two_leg_booking(db_session, sample_booking_data, sample_flight_data)
+    
+    # The second leg cannot depart a booking whose first leg never flew
+    early = await service.transition_flight(second_leg.id, BookingStatus.DEPARTED)
+    assert early.transitioned == 0
+    assert "earlier legs" in early.outcomes[0].detail
+    
+    await service.transition_flight(first_leg.id, BookingStatus.DEPARTED)
+    await service.transition_flight(first_leg.id, BookingStatus.ARRIVED)
+    
+    # ARRIVED from the first leg: departing that leg again is a no-op
+    repeat = await service.transition_flight(first_leg.id, BookingStatus.DEPARTED)
+    assert repeat.transitioned == 0
+    
+    onward = await service.transition_flight(second_leg.id, BookingStatus.DEPARTED)
+    assert onward.transitioned == 1
+    await service.transition_flight(second_leg.id, BookingStatus.ARRIVED)
+    
+    # Retrying the second leg's departure after it arrived does not repeat it
+    retry = await service.transition_flight(second_leg.id, BookingStatus.DEPARTED)
+    assert retry.transitioned == 0
+    assert (await service.get_booking(booking.ref_id)).status == "ARRIVED"
+
+
+@pytest.mark.asyncio
+async def test_retried_arrive_of_previous_leg_is_ignored(db_session, sample_booking_data, sample_flight_data):
+    """Test a retried arrive of the first leg leaves a booking in flight on the second leg alone"""
+    service, booking, first_leg, second_leg = await two_leg_booking(db_session, sample_booking_data, sample_flight_data)
+    
+    await service.transition_flight(first_leg.id, BookingStatus.DEPARTED)
+    await service.transition_flight(first_leg.id, BookingStatus.ARRIVED)
+    await service.transition_flight(second_leg.id, BookingStatus.DEPARTED)
+    
+    retry = await service.transition_flight(first_leg.id, BookingStatus.ARRIVED)
+    
+    assert retry.transitioned == 0
+    assert "did not depart on this flight" in retry.outcomes[0].detail
+    history = await service.booking_repo.get_history(booking.ref_id)
+    assert [e["event_type"] for e in history.timeline] == ["BOOKED", "DEPARTED", "ARRIVED", "DEPARTED"]
+    assert history.status == "DEPARTED"
+
+
+@pytest.mark.asyncio
+async def test_transition_unknown_flight_fails(db_session):
+    """Test bulk transitions on a missing flight return 404"""
+    service = BookingService(db_session)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await service.transition_flight(999999, BookingStatus.ARRIVED)
+    
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_booking_history_single_query(db_session, sample_booking_data):
+    """Test an uncached history view reads booking and timeline in one statement"""
+    
+    service = BookingService(db_session)
+    booking = await service.create_booking(BookingCreate(**sample_booking_data))
+    await service.depart_booking(booking.ref_id, BookingDepartRequest(location="DEL", flight_number="AI101"))
+    
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        with patch('app.services.tracking_service.cache.get', AsyncMock(return_value=None)), \
+             patch('app.services.tracking_service.cache.set_many', AsyncMock(return_value=True)):
+            history = await TrackingService(db_session).get_booking_history(booking.ref_id)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    
+    assert len(statements) == 1
+    assert history.booking.ref_id == booking.ref_id
+    assert [e.event_type for e in history.timeline] == ["BOOKED", "DEPARTED"]
+    assert history.timeline[1].flight_number == "AI101"
+
+
+@pytest.mark.asyncio
+async def test_tracking_document_follows_every_write(db_session, sample_booking_data):
+    """Test the booking_tracking projection is refreshed by create and transitions"""
+    
+    service = BookingService(db_session)
+    booking = await service.create_booking(BookingCreate(**sample_booking_data))
+    
+    document = await service.tracking_repo.get_document(booking.ref_id)
+    assert document["booking"]["status"] == "BOOKED"
+    assert [e["event_type"] for e in document["timeline"]] == ["BOOKED"]
+    
+    await service.depart_booking(booking.ref_id, BookingDepartRequest(location="DEL"))
+    await service.cancel_booking(booking.ref_id)
+    
+    document = await service.tracking_repo.get_document(booking.ref_id)
+    assert document["booking"]["status"] == "CANCELLED"
+    assert [e["event_type"] for e in document["timeline"]] == ["BOOKED", "DEPARTED", "CANCELLED"]
+    
+    with patch('app.services.tracking_service.cache.get', AsyncMock(return_value=None)), \
+         patch('app.services.tracking_service.cache.set_many', AsyncMock(return_value=True)):
+        history = await TrackingService(db_session).get_booking_history(booking.ref_id)
+    assert history.booking.status == "CANCELLED"
+    assert len(history.timeline) == 3
+
+
+@pytest.mark.asyncio
+async def test_booking_history_after_event_id(db_session, sample_booking_data):
+    """Test incremental history returns only newer events with the current booking"""
+    
+    service = BookingService(db_session)
+    booking = await service.create_booking(BookingCreate(**sample_booking_data))
+    
+    with patch('app.services.tracking_service.cache.get', AsyncMock(return_value=None)), \
+         patch('app.services.tracking_service.cache.set_many', AsyncMock(return_value=True)):
+        tracking = TrackingService(db_session)
+        first = await tracking.get_booking_history(booking.ref_id)
+        
+        await service.depart_booking(booking.ref_id, BookingDepartRequest(location="DEL"))
+        await service.arrive_booking(booking.ref_id, BookingArriveRequest(location="BLR"))
+        
+        newer = await tracking.get_booking_history(booking.ref_id, after_event_id=first.timeline[-1].id)
+        assert newer.booking.status == "ARRIVED"
+        assert [e.event_type for e in newer.timeline] == ["DEPARTED", "ARRIVED"]
+        
+        latest = await tracking.get_booking_history(booking.ref_id, after_event_id=newer.timeline[-1].id)
+        assert latest.timeline == []
+    
+    # A cached full history is trimmed instead of querying
+    cached = first.model_dump()
+    cached["timeline"] += newer.model_dump()["timeline"]
+    with patch('app.services.tracking_service.cache.get', AsyncMock(return_value=cached)):
+        trimmed = await TrackingService(db_session).get_booking_history(
+            booking.ref_id, after_event_id=first.timeline[-1].id
+        )
+    assert [e.event_type for e in trimmed.timeline] == ["DEPARTED", "ARRIVED"]
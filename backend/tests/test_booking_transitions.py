@@ -0,0 +1,59 @@
+import pytest
+from app.services.booking_transitions import BOOKING_TRANSITIONS, FLIGHT_TRANSITIONS
+from app.schemas.booking import BookingStatus, EventType
+
+
+def test_every_transition_records_matching_event():
+    """Test each transition records the event named after its target status"""
+    for target, transition in BOOKING_TRANSITIONS.items():
+        assert transition.target == target
+        assert transition.event_type == EventType(target.value)
+        assert target not in transition.allowed_from
+
+
+def test_deliver_only_from_arrived():
+    """Test delivery is only possible after arrival"""
+    transition = BOOKING_TRANSITIONS[BookingStatus.DELIVERED]
+    
+    assert transition.allowed_from == {BookingStatus.ARRIVED}
+    assert "must be ARRIVED" in transition.rejection_for("BOOKED")
+    assert "cancelled" in transition.rejection_for("CANCELLED")
+
+
+def test_cancelled_bookings_cannot_move():
+    """Test no transition starts from CANCELLED"""
+    for transition in BOOKING_TRANSITIONS.values():
+        assert BookingStatus.CANCELLED not in transition.allowed_from
+
+
+def test_delivered_bookings_cannot_move():
+    """Test DELIVERED is terminal, with a clear message for each attempt"""
+    for target, transition in BOOKING_TRANSITIONS.items():
+        assert BookingStatus.DELIVERED not in transition.allowed_from
+        if target != BookingStatus.DELIVERED:
+            assert "delivered" in transition.rejection_for("DELIVERED")
+
+
+def test_cancel_not_allowed_after_arrival():
+    """Test cancelling an arrived booking is rejected with a clear message"""
+    transition = BOOKING_TRANSITIONS[BookingStatus.CANCELLED]
+    
+    assert BookingStatus.ARRIVED not in transition.allowed_from
+    assert "arrived" in transition.rejection_for("ARRIVED")
+    assert transition.default_notes == "Booking cancelled by user"
+
+
+def test_flight_transitions_never_start_from_delivered():
+    """Test flight-wide depart/arrive only move bookings forward, leg by leg"""
+    depart = FLIGHT_TRANSITIONS[BookingStatus.DEPARTED]
+    arrive = FLIGHT_TRANSITIONS[BookingStatus.ARRIVED]
+    
+    assert depart.first_leg_from == {BookingStatus.BOOKED}
+    assert depart.allowed_from == {BookingStatus.ARRIVED}
+    assert (depart.leg_event, depart.leg_offset) == (EventType.ARRIVED, 1)
+    assert arrive.allowed_from == {BookingStatus.DEPARTED}
+    assert (arrive.leg_event, arrive.leg_offset) == (EventType.DEPARTED, 0)
+    assert not arrive.first_leg_from
+    for transition in FLIGHT_TRANSITIONS.values():
+        assert BookingStatus.DELIVERED not in transition.allowed_from | transition.first_leg_from
+        assert "delivered" in transition.rejection_for("DELIVERED")
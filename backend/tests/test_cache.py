@@ -1,6 +1,7 @@
+import json
 import pytest
 from unittest.mock import AsyncMock, patch
-from app.core.cache import CacheService
+from app.core.cache import CacheService, COMPRESSION_MAGIC
 
 
 @pytest.mark.asyncio
@@ -35,6 +36,21 @@ async def test_cache_miss():
     assert value is None
 
 
+@pytest.mark.asyncio
+async def test_cache_get_many_uses_one_mget():
+    """Test multi-get returns values in key order with None for misses"""
+    cache = CacheService()
+    cache.redis = AsyncMock()
+    cache.redis.mget = AsyncMock(return_value=['{"id": 1}', None, '{"id": 3}'])
+    
+    values = await cache.get_many(["a", "b", "c"])
+    assert values == [{"id": 1}, None, {"id": 3}]
+    cache.redis.mget.assert_called_once_with(["a", "b", "c"])
+    
+    cache.redis.mget = AsyncMock(side_effect=Exception("Redis error"))
+    assert await cache.get_many(["a", "b"]) == [None, None]
+
+
 @pytest.mark.asyncio
 async def test_cache_delete():
     """Test cache deletion"""
@@ -91,3 +107,50 @@ async def test_cache_error_handling():
     # Should return None on error, not raise
     value = await cache.get("test_key")
     assert value is None
+
+
+@pytest.mark.asyncio
+async def test_cache_compresses_large_values():
+    """Test large values are stored compressed and read back transparently"""
+    cache = CacheService()
+    cache.redis = AsyncMock()
+    cache.redis.setex = AsyncMock(return_value=True)
+    
+    value = {"flights": [{"flight_number": "AI101", "origin": "DEL"}] * 200}
+    await cache.set("route:DEL:BLR", value, ttl=300)
+    
+    stored = cache.redis.setex.call_args[0][2]
+    assert stored.startswith(COMPRESSION_MAGIC)
+    assert len(stored) < len(json.dumps(value))
+    
+    cache.redis.get = AsyncMock(return_value=stored)
+    assert await cache.get("route:DEL:BLR") == value
+
+
+@pytest.mark.asyncio
+async def test_cache_small_values_not_compressed():
+    """Test values below the threshold are stored as plain JSON"""
+    cache = CacheService()
+    cache.redis = AsyncMock()
+    cache.redis.setex = AsyncMock(return_value=True)
+    
+    await cache.set("booking:ACB12345", {"key": "value"}, ttl=300)
+    
+    stored = cache.redis.setex.call_args[0][2]
+    assert not stored.startswith(COMPRESSION_MAGIC)
+    assert json.loads(stored) == {"key": "value"}
+
+
+def test_cache_ttl_for_departure_proximity():
+    """Test TTL tiers pick short TTLs for near-term and long TTLs for far-future data"""
+    cache = CacheService()
+    cache.ttl_tiers = {"route": [(1, 300), (7, 3600), (None, 259200)]}
+    
+    assert cache.ttl_for("route", -1) == 300
+    assert cache.ttl_for("route", 1) == 300
+    assert cache.ttl_for("route", 5) == 3600
+    assert cache.ttl_for("route", 180) == 259200
+    
+    # Unknown families fall back to the default
+    assert cache.ttl_for("booking", 3, default=120) == 120
+    assert cache.ttl_for("booking", 3) == cache.default_ttl
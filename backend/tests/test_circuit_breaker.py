@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import AsyncMock
+from app.core.cache import CacheService
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def test_breaker_opens_after_consecutive_failures():
+    """Test the breaker trips only after the failure threshold"""
+    breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=60)
+    
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is True
+    
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+
+
+def test_breaker_success_resets_failure_count():
+    """Test failures must be consecutive to trip the breaker"""
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+    
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_probe_recovers():
+    """Test a successful half-open probe closes the breaker"""
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+    
+    # Pretend the recovery timeout has elapsed
+    breaker.opened_at -= 61
+    assert breaker.allow_request() is True
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    
+    # Only one probe at a time
+    assert breaker.allow_request() is False
+    
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_probe_failure_reopens():
+    """Test a failed half-open probe re-opens the breaker"""
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+    breaker.opened_at -= 61
+    
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+
+
+@pytest.mark.asyncio
+async def test_cache_short_circuits_when_open():
+    """Test cache calls skip Redis entirely while the breaker is open"""
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+    cache = CacheService(breaker=breaker)
+    cache.redis = AsyncMock()
+    cache.redis.get = AsyncMock(side_effect=TimeoutError("Redis timeout"))
+    
+    assert await cache.get("key1") is None
+    assert await cache.get("key2") is None
+    assert breaker.state == CircuitBreaker.OPEN
+    
+    assert await cache.get("key3") is None
+    assert await cache.set("key3", {"a": 1}) is False
+    assert cache.redis.get.call_count == 2
+    cache.redis.setex.assert_not_called()
+    
+    with pytest.raises(CircuitOpenError):
+        await cache.call("incr", "rate_limit:key")
@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime, timezone
+from starlette.requests import Request
+from app.utils.conditional import Validators, is_conditional
+
+
+def make_request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+UPDATED_AT = datetime(2026, 10, 19, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def test_validators_change_with_version_parts():
+    """Test the ETag is stable for a version and changes with it"""
+    first = Validators.build("booking", "ACB12345", "BOOKED", modified_at=UPDATED_AT)
+    
+    assert first == Validators.build("booking", "ACB12345", "BOOKED", modified_at=UPDATED_AT)
+    assert first.etag != Validators.build("booking", "ACB12345", "DEPARTED").etag
+    assert first.etag.startswith('W/"')
+    assert first.last_modified == "Mon, 19 Oct 2026 09:30:15 GMT"
+
+
+@pytest.mark.parametrize("if_none_match,fresh", [
+    (None, False),
+    ("*", True),
+    ('"other"', False),
+    ('"other", {etag}', True),
+    ("{strong}", True),
+])
+def test_if_none_match(if_none_match, fresh):
+    """Test If-None-Match uses weak comparison over a list of tags"""
+    validators = Validators.build("route", "payload")
+    headers = {}
+    if if_none_match is not None:
+        headers["if_none_match"] = if_none_match.format(
+            etag=validators.etag, strong=validators.etag.removeprefix("W/")
+        )
+    
+    assert validators.is_fresh(make_request(**headers)) is fresh
+
+
+def test_if_modified_since_only_without_if_none_match():
+    """Test If-Modified-Since is honoured, but If-None-Match takes precedence"""
+    validators = Validators.build("booking", "v1", modified_at=UPDATED_AT)
+    
+    assert validators.is_fresh(make_request(if_modified_since="Mon, 19 Oct 2026 09:30:15 GMT"))
+    assert not validators.is_fresh(make_request(if_modified_since="Mon, 19 Oct 2026 09:30:14 GMT"))
+    assert not validators.is_fresh(make_request(
+        if_none_match='"stale"',
+        if_modified_since="Mon, 19 Oct 2026 09:30:15 GMT"
+    ))
+    assert is_conditional(make_request(if_none_match='"x"'))
+    assert not is_conditional(make_request())
+
+
+def test_not_modified_response_carries_validators():
+    """Test the 304 response has no body and repeats the validators"""
+    validators = Validators.build("booking", "v1", modified_at=UPDATED_AT)
+    
+    response = validators.not_modified()
+    
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == validators.etag
+    assert response.headers["last-modified"] == validators.last_modified
+    assert response.headers["cache-control"] == "no-cache"
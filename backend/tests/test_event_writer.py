@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.schemas.booking import BookingStatus, EventType
+from app.services.event_writer import CommitOutcomeUnknown, GroupCommitEventWriter
+
+
+class FakeSession:
+    """
+    Records statements and commits; a 'BAD' ref_id aborts the transaction
+    and a 'LOST' ref_id commits but loses the connection before replying
+    """
+    
+    commits = []
+    
+    def __init__(self):
+        self.pending = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    async def commit(self):
+        await asyncio.sleep(0)
+        FakeSession.commits.append(list(self.pending))
+        if "LOST" in self.pending:
+            raise ConnectionError("connection lost during commit")
+
+
+class FakeBookingRepository:
+    def __init__(self, session):
+        self.session = session
+    
+    async def transition_status(self, ref_id, new_status, **kwargs):
+        if ref_id == "BAD":
+            raise RuntimeError("statement failed")
+        self.session.pending.append(ref_id)
+        return None if ref_id == "REJECTED" else {"ref_id": ref_id, "status": new_status.value}
+
+
+@pytest.fixture
+def writer():
+    FakeSession.commits = []
+    with patch("app.services.event_writer.BookingRepository", FakeBookingRepository), \
+         patch("app.services.event_writer.TrackingRepository") as tracking:
+        tracking.return_value.refresh = AsyncMock()
+        yield GroupCommitEventWriter(session_factory=FakeSession, max_batch=10, max_delay=0.01), tracking
+
+
+async def depart(writer, ref_id):
+    return await writer.transition(
+        ref_id,
+        BookingStatus.DEPARTED,
+        allowed_from=[BookingStatus.BOOKED],
+        event_type=EventType.DEPARTED
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_transitions_share_one_commit(writer):
+    """Test concurrent transitions are committed together and resolved after the commit"""
+    writer, tracking = writer
+    
+    results = await asyncio.gather(*[depart(writer, f"ACB{i:05d}") for i in range(5)], depart(writer, "REJECTED"))
+    await writer.close()
+    
+    assert len(FakeSession.commits) == 1
+    assert len(FakeSession.commits[0]) == 6
+    assert [r["ref_id"] for r in results[:5]] == [f"ACB{i:05d}" for i in range(5)]
+    assert results[5] is None
+    # One tracking refresh for the transitioned bookings only
+    tracking.return_value.refresh.assert_awaited_once_with([f"ACB{i:05d}" for i in range(5)])
+
+
+@pytest.mark.asyncio
+async def test_batches_are_bounded_by_size(writer):
+    """Test a burst larger than max_batch is split across commits"""
+    writer, _ = writer
+    
+    await asyncio.gather(*[depart(writer, f"ACB{i:05d}") for i in range(25)])
+    await writer.close()
+    
+    assert [len(c) for c in FakeSession.commits] == [10, 10, 5]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_retries_transitions_singly(writer):
+    """Test one failing transition does not fail the rest of its batch"""
+    writer, _ = writer
+    
+    results = await asyncio.gather(
+        depart(writer, "ACB00001"), depart(writer, "BAD"), depart(writer, "ACB00002"),
+        return_exceptions=True
+    )
+    await writer.close()
+    
+    assert results[0]["ref_id"] == "ACB00001"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2]["ref_id"] == "ACB00002"
+    assert FakeSession.commits == [["ACB00001"], ["ACB00002"]]
+
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_is_not_re_executed(writer):
+    """Test a commit failure reaches every caller without retrying the batch"""
+    writer, _ = writer
+    
+    results = await asyncio.gather(
+        depart(writer, "ACB00001"), depart(writer, "LOST"),
+        return_exceptions=True
+    )
+    await writer.close()
+    
+    assert all(isinstance(r, CommitOutcomeUnknown) for r in results)
+    assert FakeSession.commits == [["ACB00001", "LOST"]]
@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from app.schemas.booking import ExportFormat
+from app.services.export_service import ExportService
+
+CREATED = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def booking_row(booking_id, **extra):
+    """A row shaped like BookingRepository.stream_bookings output"""
+    row = {
+        "id": booking_id,
+        "ref_id": f"ACB{booking_id:05d}",
+        "origin": "DEL",
+        "destination": "BLR",
+        "pieces": 1,
+        "weight_kg": 10,
+        "status": "BOOKED",
+        "flight_ids": [7, 8],
+        "created_at": CREATED,
+        "updated_at": CREATED,
+        **extra
+    }
+    return type("Row", (), {"_mapping": row})()
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeBookingRepository:
+    """Serves two batches; 'fail' makes the cursor break after the first"""
+    
+    fail = False
+    
+    def __init__(self, session):
+        self.session = session
+    
+    async def stream_bookings(self, filters, include_events=False, batch_size=1000):
+        events = {"events": [{"id": 1, "event_type": "BOOKED"}]} if include_events else {}
+        yield [booking_row(1, **events), booking_row(2, **events)]
+        if FakeBookingRepository.fail:
+            raise RuntimeError("connection lost")
+        yield [booking_row(3, **events)]
+
+
+async def collect(export_format, include_events=False):
+    service = ExportService(session_factory=FakeSession, batch_size=2)
+    with patch('app.services.export_service.BookingRepository', FakeBookingRepository):
+        return [chunk async for chunk in service.export_bookings(export_format, include_events=include_events)]
+
+
+@pytest.fixture(autouse=True)
+def reset_repository():
+    FakeBookingRepository.fail = False
+
+
+@pytest.mark.asyncio
+async def test_csv_export_yields_header_then_one_chunk_per_batch():
+    """Test CSV output is flushed per batch with a header first"""
+    
+    chunks = await collect(ExportFormat.CSV)
+    
+    assert len(chunks) == 3
+    records = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [r["ref_id"] for r in records] == ["ACB00001", "ACB00002", "ACB00003"]
+    assert records[0]["flight_ids"] == "7;8"
+    assert records[0]["created_at"] == CREATED.isoformat()
+    assert "events" not in records[0]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_with_events():
+    """Test NDJSON output has one object per line with the events array"""
+    
+    chunks = await collect(ExportFormat.NDJSON, include_events=True)
+    
+    assert len(chunks) == 2
+    lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [line["id"] for line in lines] == [1, 2, 3]
+    assert lines[0]["flight_ids"] == [7, 8]
+    assert lines[0]["created_at"] == CREATED.isoformat()
+    assert lines[0]["events"] == [{"id": 1, "event_type": "BOOKED"}]
+
+
+@pytest.mark.asyncio
+async def test_csv_events_column_is_json():
+    """Test the CSV events cell holds the timeline as JSON"""
+    
+    records = list(csv.DictReader(io.StringIO("".join(await collect(ExportFormat.CSV, include_events=True)))))
+    
+    assert json.loads(records[0]["events"]) == [{"id": 1, "event_type": "BOOKED"}]
+
+
+@pytest.mark.asyncio
+async def test_export_failure_aborts_stream():
+    """Test a cursor failure mid-export propagates instead of ending the file early"""
+    
+    FakeBookingRepository.fail = True
+    service = ExportService(session_factory=FakeSession, batch_size=2)
+    chunks = []
+    
+    with patch('app.services.export_service.BookingRepository', FakeBookingRepository):
+        with pytest.raises(RuntimeError):
+            async for chunk in service.export_bookings(ExportFormat.NDJSON):
+                chunks.append(chunk)
+    
+    assert len(chunks) == 1
@@ -0,0 +1,173 @@
+import asyncio
+import pytest
+from fastapi import FastAPI, HTTPException
+from httpx import AsyncClient, ASGITransport
+from app.core.auth import create_access_token
+from app.core.idempotency import IdempotencyRecord, IdempotencyStore
+from app.middleware.idempotency import IdempotencyMiddleware
+
+
+class FakeRedisCache:
+    """In-memory stand-in for CacheService.call"""
+    
+    def __init__(self):
+        self.data = {}
+        self.down = False
+    
+    async def call(self, command, *args, **kwargs):
+        if self.down:
+            raise ConnectionError("redis is down")
+        if command == "set":
+            key, value = args
+            if kwargs.get("nx") and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+        if command == "get":
+            return self.data.get(args[0])
+        if command == "delete":
+            return self.data.pop(args[0], None) is not None
+        raise NotImplementedError(command)
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """IdempotencyStore with the idempotency_keys table kept in a dict"""
+    
+    def __init__(self, cache_service):
+        super().__init__(cache_service=cache_service)
+        self.rows = {}
+    
+    async def _db_claim(self, key, fingerprint):
+        if key in self.rows:
+            return self.rows[key]
+        self.rows[key] = IdempotencyRecord(fingerprint=fingerprint)
+        return None
+    
+    async def _db_get(self, key):
+        return self.rows.get(key)
+    
+    async def _db_complete(self, key, record):
+        self.rows[key] = record
+    
+    async def _db_release(self, key):
+        self.rows.pop(key, None)
+
+
+def build_app(delay: float = 0.0, fail_first: bool = False, redis: FakeRedisCache = None):
+    app = FastAPI()
+    calls = {"count": 0}
+    
+    @app.post("/api/v1/bookings")
+    async def create(payload: dict):
+        calls["count"] += 1
+        await asyncio.sleep(delay)
+        if fail_first and calls["count"] == 1:
+            raise HTTPException(status_code=503, detail="try again")
+        return {"call": calls["count"], **payload}
+    
+    store = InMemoryIdempotencyStore(cache_service=redis or FakeRedisCache())
+    app.add_middleware(IdempotencyMiddleware, store=store)
+    return app, calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_key_replays_first_response():
+    """Test a retried request returns the stored response without re-executing"""
+    app, calls = build_app()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        headers = {"Idempotency-Key": "key-1"}
+        first = await client.post("/api/v1/bookings", json={"origin": "DEL"}, headers=headers)
+        second = await client.post("/api/v1/bookings", json={"origin": "DEL"}, headers=headers)
+    
+    assert calls["count"] == 1
+    assert second.status_code == first.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_in_flight_request():
+    """Test concurrent requests with the same key execute once"""
+    app, calls = build_app(delay=0.2)
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        headers = {"Idempotency-Key": "key-2"}
+        responses = await asyncio.gather(*[
+            client.post("/api/v1/bookings", json={"origin": "DEL"}, headers=headers)
+            for _ in range(3)
+        ])
+    
+    assert calls["count"] == 1
+    assert {r.json()["call"] for r in responses} == {1}
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_different_body_is_rejected():
+    """Test reusing a key for a different request fails with 422"""
+    app, calls = build_app()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        headers = {"Idempotency-Key": "key-3"}
+        await client.post("/api/v1/bookings", json={"origin": "DEL"}, headers=headers)
+        response = await client.post("/api/v1/bookings", json={"origin": "BOM"}, headers=headers)
+    
+    assert response.status_code == 422
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_not_stored():
+    """Test a 5xx response releases the key so the retry executes"""
+    app, calls = build_app(fail_first=True)
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        headers = {"Idempotency-Key": "key-4"}
+        first = await client.post("/api/v1/bookings", json={"origin": "DEL"}, headers=headers)
+        second = await client.post("/api/v1/bookings", json={"origin": "DEL"}, headers=headers)
+    
+    assert first.status_code == 503
+    assert second.status_code == 200
+    assert calls["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_by_caller():
+    """Test two callers reusing the same key on different requests both execute"""
+    app, calls = build_app()
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        responses = [
+            await client.post(
+                "/api/v1/bookings",
+                json={"origin": origin},
+                headers={
+                    "Idempotency-Key": "key-5",
+                    "Authorization": f"Bearer {create_access_token({'sub': user})}",
+                }
+            )
+            for user, origin in [("alice", "DEL"), ("bob", "BOM")]
+        ]
+    
+    assert [r.status_code for r in responses] == [200, 200]
+    assert [r.json()["origin"] for r in responses] == ["DEL", "BOM"]
+    assert calls["count"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("down_during", ["first", "retry"])
+async def test_redis_outage_does_not_re_execute(down_during):
+    """Test a response stored around a Redis outage is replayed either way"""
+    redis = FakeRedisCache()
+    app, calls = build_app(redis=redis)
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        headers = {"Idempotency-Key": "key-6"}
+        redis.down = down_during == "first"
+        first = await client.post("/api/v1/bookings", json={"origin": "DEL"}, headers=headers)
+        redis.down = down_during == "retry"
+        second = await client.post("/api/v1/bookings", json={"origin": "DEL"}, headers=headers)
+    
+    assert calls["count"] == 1
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
@@ -112,3 +112,28 @@ async def test_lock_manager_creation():
     assert isinstance(lock, DistributedLock)
     assert lock.resource == "lock:test_resource"
     assert lock.timeout == 15
+
+
+@pytest.mark.asyncio
+async def test_lock_falls_back_to_local_lock_when_circuit_open():
+    """Test locks stop retrying Redis and serialize locally once the circuit opens"""
+    from app.core.circuit_breaker import CircuitBreaker
+    
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+    redis_mock = AsyncMock()
+    redis_mock.set = AsyncMock(side_effect=ConnectionError("Redis down"))
+    
+    lock = DistributedLock(redis_mock, "local_resource", timeout=10, breaker=breaker)
+    result = await lock.acquire(retry_times=50, retry_delay=0.01)
+    
+    assert result is True
+    assert lock.local_lock is not None
+    redis_mock.set.assert_called_once()
+    
+    # A second holder in this process has to wait for the first
+    other = DistributedLock(redis_mock, "local_resource", timeout=10, breaker=breaker)
+    assert await other.acquire(retry_times=2, retry_delay=0.01) is False
+    
+    assert await lock.release() is True
+    assert await other.acquire(retry_times=2, retry_delay=0.01) is True
+    await other.release()
@@ -0,0 +1,30 @@
+import pytest
+from datetime import datetime, timezone
+from app.utils.pagination import encode_cursor, decode_cursor, encode_change_cursor, decode_change_cursor
+
+
+def test_cursor_round_trip():
+    """Test a cursor decodes to the position it was built from"""
+    created_at = datetime(2026, 10, 19, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    
+    cursor = encode_cursor(created_at, 42)
+    
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", "W10", "bm90IGpzb24"])
+def test_decode_cursor_rejects_garbage(cursor):
+    """Test malformed cursors raise ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_change_cursor_round_trip():
+    """Test a change feed cursor decodes to its position and rejects list cursors"""
+    cursor = encode_change_cursor(9_000_000_123, 42)
+    
+    assert decode_change_cursor(cursor) == (9_000_000_123, 42)
+    with pytest.raises(ValueError):
+        decode_change_cursor(encode_cursor(datetime.now(timezone.utc), 42))
+
@@ -0,0 +1,72 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.core.pubsub import BookingEventBroker
+from app.routers.bookings import _booking_event_stream
+
+
+@pytest.fixture
+async def broker():
+    broker = BookingEventBroker(cache_service=MagicMock(redis=None))
+    broker.queue_size = 2
+    yield broker
+    await broker.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_fans_out_to_viewers_of_the_booking(broker):
+    """Test one message reaches every viewer of its booking and no one else"""
+    first = broker.subscribe("ACB00001")
+    second = broker.subscribe("ACB00001")
+    other = broker.subscribe("ACB00002")
+    
+    broker.dispatch({"ref_id": "ACB00001", "status": "DEPARTED"})
+    
+    assert first.get_nowait()["status"] == "DEPARTED"
+    assert second.get_nowait()["status"] == "DEPARTED"
+    assert other.empty()
+
+
+@pytest.mark.asyncio
+async def test_slow_viewer_keeps_latest_updates(broker):
+    """Test a full queue drops its oldest message instead of blocking"""
+    queue = broker.subscribe("ACB00001")
+    
+    for status in ("DEPARTED", "ARRIVED", "DELIVERED"):
+        broker.dispatch({"ref_id": "ACB00001", "status": status})
+    
+    assert [queue.get_nowait()["status"] for _ in range(2)] == ["ARRIVED", "DELIVERED"]
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_removes_viewer(broker):
+    """Test unsubscribed viewers are forgotten"""
+    queue = broker.subscribe("ACB00001")
+    broker.unsubscribe("ACB00001", queue)
+    
+    broker.dispatch({"ref_id": "ACB00001", "status": "DEPARTED"})
+    
+    assert queue.empty()
+    assert "ACB00001" not in broker._subscribers
+
+
+@pytest.mark.asyncio
+async def test_event_stream_formats_sse(broker, monkeypatch):
+    """Test the stream sends the initial status, then published changes"""
+    monkeypatch.setattr("app.routers.bookings.event_broker", broker)
+    queue = broker.subscribe("ACB00001")
+    broker.dispatch({"ref_id": "ACB00001", "status": "DEPARTED"})
+    
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(side_effect=[False, True])
+    
+    chunks = [
+        chunk async for chunk in
+        _booking_event_stream(request, "ACB00001", queue, {"ref_id": "ACB00001", "status": "BOOKED"})
+    ]
+    
+    assert len(chunks) == 2
+    assert chunks[0].startswith("event: status\ndata: ")
+    assert json.loads(chunks[0].split("data: ")[1])["status"] == "BOOKED"
+    assert json.loads(chunks[1].split("data: ")[1])["status"] == "DEPARTED"
+    assert "ACB00001" not in broker._subscribers
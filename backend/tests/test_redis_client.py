@@ -0,0 +1,65 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core.redis_client import RedisClientFactory
+
+
+@pytest.mark.asyncio
+async def test_factory_shares_one_client():
+    """Test cache and locks receive the same client from one pool"""
+    factory = RedisClientFactory()
+    pool = MagicMock()
+    pool.disconnect = AsyncMock()
+    client = MagicMock()
+    client.ping = AsyncMock(return_value=True)
+    client.close = AsyncMock()
+    
+    with patch("app.core.redis_client.InstrumentedConnectionPool.from_url", return_value=pool) as from_url, \
+            patch("app.core.redis_client.InstrumentedRedis", return_value=client):
+        first = await factory.get_client()
+        second = await factory.get_client()
+    
+    assert first is second
+    from_url.assert_called_once()
+    client.ping.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_factory_closes_pool_after_last_release():
+    """Test the pool stays open until every user has released it"""
+    factory = RedisClientFactory()
+    pool = MagicMock()
+    pool.disconnect = AsyncMock()
+    client = MagicMock()
+    client.ping = AsyncMock(return_value=True)
+    client.close = AsyncMock()
+    
+    with patch("app.core.redis_client.InstrumentedConnectionPool.from_url", return_value=pool), \
+            patch("app.core.redis_client.InstrumentedRedis", return_value=client):
+        await factory.get_client()
+        await factory.get_client()
+    
+    await factory.release()
+    pool.disconnect.assert_not_called()
+    assert factory.client is client
+    
+    await factory.release()
+    pool.disconnect.assert_called_once()
+    assert factory.client is None
+
+
+@pytest.mark.asyncio
+async def test_factory_does_not_keep_unreachable_pool():
+    """Test a failed ping leaves no half-open pool behind"""
+    factory = RedisClientFactory()
+    pool = MagicMock()
+    pool.disconnect = AsyncMock()
+    client = MagicMock()
+    client.ping = AsyncMock(side_effect=ConnectionError("refused"))
+    
+    with patch("app.core.redis_client.InstrumentedConnectionPool.from_url", return_value=pool), \
+            patch("app.core.redis_client.InstrumentedRedis", return_value=client):
+        with pytest.raises(ConnectionError):
+            await factory.get_client()
+    
+    pool.disconnect.assert_called_once()
+    assert factory.client is None
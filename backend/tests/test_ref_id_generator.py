@@ -1,37 +1,74 @@
+import asyncio
 import pytest
-from app.utils.ref_id_generator import generate_ref_id, generate_unique_ref_id
+from app.utils.ref_id_generator import (
+    permute_ref_number,
+    ref_id_from_sequence,
+    RefIdAllocator,
+    REF_ID_SPACE,
+)
 
+TEST_KEY = b"test-ref-id-key"
 
-def test_generate_ref_id_format():
-    """Test ref_id format"""
-    ref_id = generate_ref_id()
+
+def test_ref_id_from_sequence_is_distinct_and_formatted():
+    """Test sequence values map to distinct, well-formed ref_ids"""
+    ref_ids = [ref_id_from_sequence(value, TEST_KEY) for value in range(20000)]
     
-    assert ref_id.startswith("ACB")
-    assert len(ref_id) == 8  # ACB + 5 characters
-    assert ref_id[3:].isalnum()
-    assert ref_id[3:].isupper()
+    assert len(set(ref_ids)) == len(ref_ids)
+    for ref_id in ref_ids[:100]:
+        assert ref_id.startswith("ACB")
+        assert len(ref_id) == 8
+        assert ref_id[3:].isalnum()
+        assert ref_id[3:] == ref_id[3:].upper()
 
 
-def test_generate_ref_id_uniqueness():
-    """Test that generated ref_ids are unique"""
-    ref_ids = {generate_ref_id() for _ in range(1000)}
+def test_permute_ref_number_stays_in_range_and_depends_on_key():
+    """Test the permutation stays below 36^5 and is keyed"""
+    for value in (0, 1, REF_ID_SPACE // 2, REF_ID_SPACE - 1):
+        assert 0 <= permute_ref_number(value, TEST_KEY) < REF_ID_SPACE
+    
+    assert [permute_ref_number(value, TEST_KEY) for value in range(10)] != \
+        [permute_ref_number(value, b"other-key") for value in range(10)]
     
-    # Should have high uniqueness (at least 99%)
-    assert len(ref_ids) >= 990
+    with pytest.raises(ValueError):
+        permute_ref_number(REF_ID_SPACE, TEST_KEY)
 
 
-def test_generate_unique_ref_id_avoids_collisions():
-    """Test that unique ref_id avoids existing IDs"""
-    existing_ids = {"ACBABC12", "ACBXYZ99", "ACB12345"}
+@pytest.mark.asyncio
+async def test_allocator_reserves_one_block_per_block_size():
+    """Test the allocator only queries the sequence when a block runs out"""
+    next_block = 0
+    reservations = 0
+    
+    async def reserve():
+        nonlocal next_block, reservations
+        reservations += 1
+        start, next_block = next_block, next_block + 100
+        return start
     
-    for _ in range(100):
-        ref_id = generate_unique_ref_id(existing_ids)
-        assert ref_id not in existing_ids
+    allocator = RefIdAllocator(TEST_KEY, block_size=100)
+    first = await allocator.allocate(1, reserve)
+    rest = await allocator.allocate(249, reserve)
+    
+    assert reservations == 3
+    assert len(set(first + rest)) == 250
+    assert first[0] == ref_id_from_sequence(0, TEST_KEY)
 
 
-def test_generate_unique_ref_id_empty_set():
-    """Test with empty existing IDs"""
-    ref_id = generate_unique_ref_id(set())
+@pytest.mark.asyncio
+async def test_concurrent_allocations_never_overlap():
+    """Test concurrent callers sharing an allocator get distinct ref_ids"""
+    next_block = 0
+    
+    async def reserve():
+        nonlocal next_block
+        await asyncio.sleep(0)
+        start, next_block = next_block, next_block + 10
+        return start
+    
+    allocator = RefIdAllocator(TEST_KEY, block_size=10)
+    batches = await asyncio.gather(*[allocator.allocate(7, reserve) for _ in range(50)])
+    ref_ids = [ref_id for batch in batches for ref_id in batch]
     
-    assert ref_id.startswith("ACB")
-    assert len(ref_id) == 8
\ No newline at end of file
+    assert len(ref_ids) == len(set(ref_ids)) == 350
+    assert set(ref_ids) == {ref_id_from_sequence(value, TEST_KEY) for value in range(350)}
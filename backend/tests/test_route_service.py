@@ -34,7 +34,7 @@ async def test_search_direct_routes(db_session):
     )
     
     with patch('app.core.cache.cache.get', return_value=None):
-        with patch('app.core.cache.cache.set', return_value=True):
+        with patch('app.core.cache.cache.set_many', return_value=True):
             result = await service.search_routes(route_request)
     
     assert len(result.direct_flights) == 1
@@ -80,7 +80,7 @@ async def test_search_transit_routes(db_session):
     )
     
     with patch('app.core.cache.cache.get', return_value=None):
-        with patch('app.core.cache.cache.set', return_value=True):
+        with patch('app.core.cache.cache.set_many', return_value=True):
             result = await service.search_routes(route_request)
     
     assert len(result.transit_routes) >= 1
@@ -146,7 +146,7 @@ async def test_transit_route_next_day_constraint(db_session):
     second_flight.arrival_datetime = datetime(2025, 12, 2, 11, 30)
     
     with patch('app.core.cache.cache.get', return_value=None), \
-         patch('app.core.cache.cache.set', return_value=True):
+         patch('app.core.cache.cache.set_many', return_value=True):
         
         service = RouteService(db_session)
         service.flight_repo.get_direct_flights = AsyncMock(return_value=[])
@@ -170,7 +170,7 @@ async def test_route_search_cache_miss(db_session):
     )
     
     with patch('app.core.cache.cache.get', return_value=None) as mock_get, \
-         patch('app.core.cache.cache.set', return_value=True) as mock_set:
+         patch('app.core.cache.cache.set_many', return_value=True) as mock_set:
         
         service = RouteService(db_session)
         service.flight_repo.get_direct_flights = AsyncMock(return_value=[])
@@ -178,6 +178,6 @@ async def test_route_search_cache_miss(db_session):
         
         result = await service.search_routes(route_request)
         
-        # Should call cache.get and cache.set
+        # Should call cache.get and cache.set_many (result + validators)
         mock_get.assert_called_once()
         mock_set.assert_called_once()
\ No newline at end of file
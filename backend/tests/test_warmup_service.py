@@ -0,0 +1,38 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services.booking_service import BookingService
+from app.services.warmup_service import CacheWarmupService
+from app.schemas.booking import BookingCreate
+
+
+@pytest.mark.asyncio
+async def test_warm_bookings_caches_active_bookings(db_session, sample_booking_data):
+    """Test warm-up caches active bookings and their histories, skipping closed ones"""
+    
+    service = BookingService(db_session)
+    active = await service.create_booking(BookingCreate(**sample_booking_data))
+    cancelled = await service.create_booking(BookingCreate(**sample_booking_data))
+    await service.cancel_booking(cancelled.ref_id)
+    
+    with patch('app.services.warmup_service.cache.set_many', new=AsyncMock(return_value=True)) as set_many:
+        warmed = await CacheWarmupService(db_session).warm_bookings()
+    
+    assert warmed == 1
+    entries = set_many.call_args[0][0]
+    assert f"booking:{active.ref_id}" in entries
+    assert entries[f"booking_history:{active.ref_id}"]["timeline"][0]["event_type"] == "BOOKED"
+    assert f"etag:booking:{active.ref_id}" in entries
+    assert f"booking:{cancelled.ref_id}" not in entries
+
+
+@pytest.mark.asyncio
+async def test_warm_routes_refreshes_popular_lanes(db_session):
+    """Test warm-up recomputes uncached searches for the most searched lanes"""
+    
+    with patch('app.services.warmup_service.cache.top_scored', new=AsyncMock(return_value=["DEL:BLR"])), \
+            patch('app.services.warmup_service.cache.exists', new=AsyncMock(return_value=False)), \
+            patch('app.services.route_service.cache.set_many', new=AsyncMock(return_value=True)) as cache_set:
+        warmed = await CacheWarmupService(db_session).warm_routes()
+    
+    assert warmed == 3
+    assert cache_set.call_count == 3
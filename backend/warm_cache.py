@@ -0,0 +1,45 @@
+"""
+Cache warm-up script - Preload active bookings and popular route searches
+"""
+import asyncio
+import sys
+from app.core.cache import cache
+from app.core.locks import lock_manager
+from app.core.db import close_db
+from app.core.logging import get_logger
+from app.services.warmup_service import CacheWarmupService
+
+logger = get_logger(__name__)
+
+
+async def warm_cache():
+    """Run the cache warm-up once"""
+    
+    try:
+        from app.core.db import AsyncSessionLocal
+        
+        await cache.connect()
+        await lock_manager.connect()
+        
+        async with AsyncSessionLocal() as db:
+            result = await CacheWarmupService(db).run()
+        
+        logger.info(
+            f"Cache warm-up complete: {result['bookings']} bookings, "
+            f"{result['routes']} route searches"
+        )
+        return True
+        
+    except Exception as e:
+        logger.error(f"Cache warm-up failed: {e}")
+        return False
+    
+    finally:
+        await cache.close()
+        await lock_manager.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    success = asyncio.run(warm_cache())
+    sys.exit(0 if success else 1)
@@ -13,6 +13,8 @@ export default function BookingsPage() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [page, setPage] = useState(0);
+  // cursors[n] is the cursor that loads page n (undefined for the first page)
+  const [cursors, setCursors] = useState<(string | undefined)[]>([undefined]);
   const [hasMore, setHasMore] = useState(true);
   const limit = 20;
 
@@ -24,13 +26,15 @@ export default function BookingsPage() {
     try {
       setLoading(true);
       setError('');
-      const response = await apiService.listBookings(limit, page * limit);
+      const response = await apiService.listBookings(limit, cursors[page]);
+      const nextCursor = response.next_cursor;
       
-      if (response.length < limit) {
-        setHasMore(false);
+      setHasMore(nextCursor !== null);
+      if (nextCursor !== null) {
+        setCursors((prev) => [...prev.slice(0, page + 1), nextCursor]);
       }
       
-      setBookings(response);
+      setBookings(response.items);
     } catch (err: any) {
       setError(err.message || 'Failed to load bookings');
     } finally {
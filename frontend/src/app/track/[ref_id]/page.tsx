@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useParams } from 'next/navigation';
 import { apiService } from '@/services/api';
 import { BookingHistory } from '@/types';
@@ -17,18 +17,38 @@ export default function TrackBookingPage() {
   const [data, setData] = useState<BookingHistory | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  // Status shown on the page, compared against streamed updates
+  const loadedStatus = useRef<string | null>(null);
+  // Latest event shown, so live updates only fetch newer events
+  const lastEventId = useRef<number | null>(null);
 
-  const fetchBookingHistory = async () => {
-    setLoading(true);
-    setError(null);
+  const fetchBookingHistory = async (silent: boolean = false) => {
+    if (!silent) {
+      setLoading(true);
+      setError(null);
+    }
 
     try {
-      const history = await apiService.getBookingHistory(refId);
-      setData(history);
+      const afterEventId = silent && lastEventId.current !== null ? lastEventId.current : undefined;
+      const history = await apiService.getBookingHistory(refId, afterEventId);
+      const events = history.timeline;
+      loadedStatus.current = history.booking.status;
+      if (events.length > 0) {
+        lastEventId.current = events[events.length - 1].id;
+      }
+      setData((previous) =>
+        afterEventId !== undefined && previous
+          ? { booking: history.booking, timeline: [...previous.timeline, ...events] }
+          : history
+      );
     } catch (err: any) {
-      setError(err.message || 'Failed to load booking history');
+      if (!silent) {
+        setError(err.message || 'Failed to load booking history');
+      }
     } finally {
-      setLoading(false);
+      if (!silent) {
+        setLoading(false);
+      }
     }
   };
 
@@ -38,6 +58,22 @@ export default function TrackBookingPage() {
     }
   }, [refId]);
 
+  // Live updates: refetch the timeline only when the status actually changes
+  useEffect(() => {
+    if (!refId || typeof EventSource === 'undefined') return;
+
+    const source = new EventSource(apiService.bookingEventsUrl(refId));
+
+    source.addEventListener('status', (event) => {
+      const { status } = JSON.parse((event as MessageEvent).data);
+      if (loadedStatus.current !== null && status !== loadedStatus.current) {
+        fetchBookingHistory(true);
+      }
+    });
+
+    return () => source.close();
+  }, [refId]);
+
   if (loading) {
     return (
       <div className="max-w-5xl mx-auto px-4 sm:px-6 lg:px-8 py-12">
@@ -52,7 +88,7 @@ export default function TrackBookingPage() {
   if (error) {
     return (
       <div className="max-w-5xl mx-auto px-4 sm:px-6 lg:px-8 py-12">
-        <ErrorMessage message={error} onRetry={fetchBookingHistory} />
+        <ErrorMessage message={error} onRetry={() => fetchBookingHistory()} />
       </div>
     );
   }
@@ -73,7 +109,7 @@ export default function TrackBookingPage() {
       <div className="flex items-center justify-between mb-8">
         <h1 className="text-3xl font-bold text-gray-900">Booking Tracking</h1>
         <button
-          onClick={fetchBookingHistory}
+          onClick={() => fetchBookingHistory()}
           className="flex items-center gap-2 px-4 py-2 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 transition-colors"
         >
           <RefreshCw className="w-4 h-4" />
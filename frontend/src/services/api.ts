@@ -2,6 +2,7 @@ import axios, { AxiosInstance, AxiosError } from 'axios';
 import {
   Booking,
   BookingHistory,
+  BookingListResponse,
   CreateBookingRequest,
   DepartBookingRequest,
   ArriveBookingRequest,
@@ -55,11 +56,19 @@ class ApiService {
     return response.data;
   }
 
-  async getBookingHistory(refId: string): Promise<BookingHistory> {
-    const response = await this.client.get<BookingHistory>(`/bookings/${refId}/history`);
+  // Pass afterEventId to receive only events newer than that one
+  async getBookingHistory(refId: string, afterEventId?: number): Promise<BookingHistory> {
+    const response = await this.client.get<BookingHistory>(`/bookings/${refId}/history`, {
+      params: afterEventId !== undefined ? { after_event_id: afterEventId } : undefined,
+    });
     return response.data;
   }
 
+  // Server-Sent Events stream of status changes (use with EventSource)
+  bookingEventsUrl(refId: string): string {
+    return `${API_BASE_URL}${API_VERSION}/bookings/${refId}/events/stream`;
+  }
+
   async departBooking(refId: string, data: DepartBookingRequest): Promise<Booking> {
     const response = await this.client.post<Booking>(`/bookings/${refId}/depart`, data);
     return response.data;
@@ -75,9 +84,9 @@ class ApiService {
     return response.data;
   }
 
-  async listBookings(limit: number = 20, offset: number = 0): Promise<Booking[]> {
-    const response = await this.client.get<Booking[]>('/bookings', {
-      params: { limit, offset }
+  async listBookings(limit: number = 20, cursor?: string): Promise<BookingListResponse> {
+    const response = await this.client.get<BookingListResponse>('/bookings', {
+      params: cursor ? { limit, cursor } : { limit }
     });
     return response.data;
   }
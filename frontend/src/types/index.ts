@@ -27,6 +27,11 @@ export interface Booking {
   updated_at: string;
 }
 
+export interface BookingListResponse {
+  items: Booking[];
+  next_cursor: string | null;
+}
+
 export interface BookingEvent {
   id: number;
   event_type: EventType;